@@ -1,6 +1,6 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
-from .models import User
+from .models import User, UserSession
 from django.utils.translation import gettext_lazy as _
 
 class UserAdmin(BaseUserAdmin):
@@ -31,3 +31,11 @@ class UserAdmin(BaseUserAdmin):
     )
 
 admin.site.register(User, UserAdmin)
+
+
+class UserSessionAdmin(admin.ModelAdmin):
+    list_display = ("user", "ip", "last_activity", "expire_date", "created_at")
+    search_fields = ("user__email", "ip", "session_key")
+    readonly_fields = ("user", "session_key", "ip", "user_agent", "last_activity", "expire_date", "created_at")
+
+admin.site.register(UserSession, UserSessionAdmin)
@@ -31,3 +31,25 @@ Hi {username},
 {message}
 """
 }
+
+# Optional HTML variants; they must use the same fields as the text template.
+# Templates without one get an HTML part generated from the text.
+EMAIL_HTML_TEMPLATES = {
+    "welcome": """\
+<p>Hi {username},</p>
+<p>Welcome to API Verse! Your account has been successfully created.</p>
+<p>Best regards,<br>API Verse Team</p>
+""",
+    "email_verification": """\
+<p>Hi {username},</p>
+<p>Please use the verification code below to verify your email:</p>
+<p><strong>Verification Code: {verification_code}</strong></p>
+<p>This code will expire in 10 minutes.</p>
+""",
+    "reset_password": """\
+<p>Hi {username},</p>
+<p>Click the link below to reset your password:</p>
+<p><a href="{reset_link}">{reset_link}</a></p>
+<p>If you did not request this, ignore this email.</p>
+""",
+}
@@ -167,6 +167,8 @@ class LogoutView(generics.GenericAPIView):
     def post(self, request):
         request.user.refresh_token = None
         request.user.save(update_fields=["refresh_token"])
+        if request.session.session_key:
+            revoke_session(request.session.session_key)
         request.session.flush()  
         return api_response(success=True, message="Logged out successfully")
 
@@ -546,7 +548,8 @@ class RevokeSessionView(APIView):
         if session_key == request.session.session_key:
             return api_response(False, "Cannot revoke current session", status_code=status.HTTP_400_BAD_REQUEST)
 
-        revoke_session(session_key)
+        if not revoke_session(session_key, user=request.user):
+            return api_response(False, "Session not found", status_code=status.HTTP_404_NOT_FOUND)
         return api_response(True, "Session revoked successfully")
 
 # ----------------------
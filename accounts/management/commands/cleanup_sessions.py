@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+from core.jobs import enqueue
+from accounts.utils import cleanup_expired_sessions
+
+
+class Command(BaseCommand):
+    help = "Delete expired rows from the user session registry (schedule it, e.g. hourly)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--queue",
+            action="store_true",
+            help="Enqueue the cleanup as a background job instead of running it now.",
+        )
+
+    def handle(self, *args, **options):
+        if options["queue"]:
+            job = enqueue("accounts.cleanup_sessions")
+            self.stdout.write(self.style.SUCCESS(f"Queued {job}"))
+            return
+        deleted = cleanup_expired_sessions()
+        self.stdout.write(self.style.SUCCESS(f"Removed {deleted} expired session(s)"))
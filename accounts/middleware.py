@@ -0,0 +1,19 @@
+from accounts.utils import touch_session
+
+
+class UserSessionActivityMiddleware:
+    """
+    Keeps UserSession.last_activity current for session-authenticated requests.
+    Writes at most once per SESSION_ACTIVITY_INTERVAL per session.
+    Must come after SessionMiddleware and AuthenticationMiddleware.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        user = getattr(request, "user", None)
+        if user is not None and user.is_authenticated and hasattr(request, "session"):
+            touch_session(request)
+        return response
@@ -0,0 +1,62 @@
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_sessions(apps, schema_editor):
+    # One-time decode of the existing sessions; afterwards the registry is maintained on login
+    from django.contrib.sessions.backends.db import SessionStore
+
+    Session = apps.get_model("sessions", "Session")
+    User = apps.get_model("accounts", "User")
+    UserSession = apps.get_model("accounts", "UserSession")
+    now = django.utils.timezone.now()
+    store = SessionStore()
+
+    rows = []
+    for session in Session.objects.filter(expire_date__gte=now).iterator(chunk_size=1000):
+        data = store.decode(session.session_data)
+        user_id = data.get("_auth_user_id")
+        if not user_id:
+            continue
+        rows.append(UserSession(
+            user_id=user_id,
+            session_key=session.session_key,
+            ip=data.get("ip") or None,
+            user_agent=data.get("user_agent", ""),
+            last_activity=now,
+            expire_date=session.expire_date,
+        ))
+    existing = {str(pk) for pk in User.objects.filter(id__in={row.user_id for row in rows}).values_list("id", flat=True)}
+    UserSession.objects.bulk_create([row for row in rows if str(row.user_id) in existing], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_alter_user_avatar'),
+        ('sessions', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserSession',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('session_key', models.CharField(max_length=40, unique=True)),
+                ('ip', models.GenericIPAddressField(blank=True, null=True)),
+                ('user_agent', models.TextField(blank=True)),
+                ('last_activity', models.DateTimeField(default=django.utils.timezone.now)),
+                ('expire_date', models.DateTimeField(db_index=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='sessions', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'accounts_user_sessions',
+                'ordering': ['-last_activity'],
+                'indexes': [models.Index(fields=['user', 'expire_date'], name='accounts_us_user_id_31ac5d_idx')],
+            },
+        ),
+        migrations.RunPython(backfill_sessions, migrations.RunPython.noop),
+    ]
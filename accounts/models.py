@@ -109,4 +109,31 @@ class User(BaseModel, AbstractBaseUser, PermissionsMixin):
             return False
         totp = pyotp.TOTP(self.totp_secret)
         return totp.verify(token, valid_window=1)
-    
\ No newline at end of file
+    
+
+# ----------------------
+# User Session Registry
+# ----------------------
+class UserSession(models.Model):
+    """
+    One row per logged-in Django session, so a user's sessions can be listed
+    and revoked without decoding every row of django_session.
+    Written on login and kept current by UserSessionActivityMiddleware.
+    """
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="sessions")
+    session_key = models.CharField(max_length=40, unique=True)
+    ip = models.GenericIPAddressField(blank=True, null=True)
+    user_agent = models.TextField(blank=True)
+    last_activity = models.DateTimeField(default=timezone.now)
+    expire_date = models.DateTimeField(db_index=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = "accounts_user_sessions"
+        ordering = ["-last_activity"]
+        indexes = [
+            models.Index(fields=["user", "expire_date"]),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} ({self.session_key[:8]}…)"
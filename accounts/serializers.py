@@ -1,6 +1,7 @@
 from .models import User
 from rest_framework import serializers
 from core.constants import ROLE_CHOICES
+from core.media import MediaStatusField
 from django.conf import settings
 
 # ----------------------------
@@ -62,6 +63,7 @@ class ChangePasswordSerializer(serializers.Serializer):
 # ----------------------------
 class UserSerializer(serializers.ModelSerializer):
     avatar_url = serializers.SerializerMethodField()
+    avatar_status = MediaStatusField(source="avatar")
 
     class Meta:
         model = User
@@ -72,6 +74,7 @@ class UserSerializer(serializers.ModelSerializer):
             "role",
             "is_verified",
             "avatar_url",
+            "avatar_status",
             "is_2fa_enabled"
         ]
 
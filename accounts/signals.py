@@ -1,10 +1,24 @@
+from django.contrib.auth.signals import user_logged_in, user_logged_out
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 from accounts.models import User
+from accounts.utils import record_session, revoke_session
 from social.models import Profile
 
 @receiver(post_save, sender=User)
 def create_user_profile(sender, instance, created, **kwargs):
     if created:
         Profile.objects.create(owner=instance)
-        
\ No newline at end of file
+
+
+# Every login() path (API, Django admin, social login) goes through these
+@receiver(user_logged_in)
+def register_user_session(sender, request, user, **kwargs):
+    if request is not None and hasattr(request, "session"):
+        record_session(request, user)
+
+
+@receiver(user_logged_out)
+def unregister_user_session(sender, request, user, **kwargs):
+    if request is not None and hasattr(request, "session") and request.session.session_key:
+        revoke_session(request.session.session_key)
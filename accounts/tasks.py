@@ -0,0 +1,7 @@
+from core.jobs import task
+from accounts.utils import cleanup_expired_sessions
+
+
+@task("accounts.cleanup_sessions")
+def cleanup_sessions_task():
+    cleanup_expired_sessions()
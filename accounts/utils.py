@@ -2,46 +2,99 @@ import qrcode
 import io
 import base64
 from django.contrib.sessions.models import Session
+from django.db import transaction
 from django.utils import timezone
 from datetime import timedelta
 from django.conf import settings
+from accounts.models import UserSession
+
+
+SESSION_ACTIVITY_INTERVAL = getattr(settings, "SESSION_ACTIVITY_INTERVAL", 60)
+
+
+def record_session(request, user):
+    """
+    Registers the request's session for `user`; runs on user_logged_in (accounts.signals).
+    """
+    if not request.session.session_key:
+        request.session.save()
+    now = timezone.now()
+    request.session["last_activity"] = now.timestamp()
+    UserSession.objects.update_or_create(
+        session_key=request.session.session_key,
+        defaults={
+            "user": user,
+            "ip": get_client_ip(request),
+            "user_agent": request.META.get("HTTP_USER_AGENT", ""),
+            "last_activity": now,
+            "expire_date": request.session.get_expiry_date(),
+        },
+    )
+
+
+def touch_session(request):
+    """
+    Refreshes last_activity / expire_date of the request's session,
+    at most once per SESSION_ACTIVITY_INTERVAL seconds.
+    """
+    session_key = request.session.session_key
+    if not session_key:
+        return
+    now = timezone.now()
+    if now.timestamp() - request.session.get("last_activity", 0) < SESSION_ACTIVITY_INTERVAL:
+        return
+    request.session["last_activity"] = now.timestamp()
+    UserSession.objects.filter(session_key=session_key).update(
+        last_activity=now, expire_date=request.session.get_expiry_date()
+    )
+
 
 def get_user_sessions(user):
     """
     Return all active sessions for the given user.
     """
-    sessions = []
-    all_sessions = Session.objects.filter(expire_date__gte=timezone.now())
-    for session in all_sessions:
-        data = session.get_decoded()
-        if str(user.id) == str(data.get("_auth_user_id")):
-            sessions.append({
-                "session_key": session.session_key,
-                "ip": data.get("ip", "Unknown"),
-                "user_agent": data.get("user_agent", ""),
-                "last_activity": session.expire_date - timezone.timedelta(seconds=1800),
-                "expire_date": session.expire_date,
-            })
-    return sessions
+    sessions = UserSession.objects.filter(user=user, expire_date__gte=timezone.now()).only(
+        "session_key", "ip", "user_agent", "last_activity", "expire_date"
+    )
+    return [
+        {
+            "session_key": session.session_key,
+            "ip": session.ip or "Unknown",
+            "user_agent": session.user_agent,
+            "last_activity": session.last_activity,
+            "expire_date": session.expire_date,
+        }
+        for session in sessions
+    ]
 
-def revoke_session(session_key):
+def revoke_session(session_key, user=None):
     """
     Revoke a single session by session_key.
+    When `user` is given, only a session belonging to that user is revoked.
     """
-    try:
-        Session.objects.get(session_key=session_key).delete()
-    except Session.DoesNotExist:
-        pass
+    if user is not None and not UserSession.objects.filter(session_key=session_key, user=user).exists():
+        return False
+    with transaction.atomic():
+        Session.objects.filter(session_key=session_key).delete()
+        UserSession.objects.filter(session_key=session_key).delete()
+    return True
 
 def revoke_all_sessions(user):
     """
     Revoke all sessions for the user.
     """
-    all_sessions = Session.objects.filter(expire_date__gte=timezone.now())
-    for session in all_sessions:
-        data = session.get_decoded()
-        if str(user.id) == str(data.get("_auth_user_id")):
-            session.delete()
+    with transaction.atomic():
+        session_keys = list(UserSession.objects.filter(user=user).values_list("session_key", flat=True))
+        Session.objects.filter(session_key__in=session_keys).delete()
+        UserSession.objects.filter(user=user).delete()
+    return len(session_keys)
+
+def cleanup_expired_sessions():
+    """
+    Deletes registry rows whose session has expired. Returns the number removed.
+    """
+    deleted, _ = UserSession.objects.filter(expire_date__lt=timezone.now()).delete()
+    return deleted
 
 
 def get_client_ip(request):
@@ -7,6 +7,7 @@ from django.shortcuts import redirect
 from django.contrib.auth import login, authenticate
 from django.utils import timezone
 from django.conf import settings
+from django.db import transaction
 from rest_framework import generics, status, permissions
 from rest_framework.views import APIView
 from rest_framework.response import Response
@@ -32,9 +33,9 @@ from accounts.serializers import (
 )
 from core.utils import send_email, api_response
 from core.constants import LOGIN_GOOGLE, LOGIN_GITHUB
-from core.cloudinary import upload_to_cloudinary
+from core.media import MEDIA_READY, media_status, queue_upload
 from core.permissions import IsSuperAdmin
-from accounts.utils import get_client_ip, generate_totp_qr_code
+from accounts.utils import get_client_ip, generate_totp_qr_code, revoke_session
 
 # ----------------------
 # Helper function for generating JWT tokens
@@ -157,10 +158,8 @@ class LoginView(generics.GenericAPIView):
             if not token or not user.verify_totp(token):
                 return api_response(False, "Invalid or missing 2FA token", status_code=status.HTTP_400_BAD_REQUEST)
 
-        # Login user and store session info
+        # Login user; the session is registered for listing / revocation by the user_logged_in receiver
         login(request, user)
-        request.session['ip'] = get_client_ip(request)
-        request.session['user_agent'] = request.META.get("HTTP_USER_AGENT", "")
 
         # Generate JWT tokens
         access_token, refresh_token = generate_jwt_tokens(user)
@@ -193,6 +192,8 @@ class LogoutView(generics.GenericAPIView):
     def post(self, request):
         request.user.refresh_token = None
         request.user.save(update_fields=["refresh_token"])
+        if request.session.session_key:
+            revoke_session(request.session.session_key)
         request.session.flush()
         return api_response(True, "Logged out successfully")
 
@@ -368,7 +369,7 @@ class CurrentUserView(generics.RetrieveAPIView):
 class UpdateAvatarView(generics.UpdateAPIView):
     """
     Updates the authenticated user's avatar.
-    Uploads the file to Cloudinary.
+    Stages the file and uploads it to Cloudinary in the background.
     """
     serializer_class = UpdateAvatarSerializer
     permission_classes = [permissions.IsAuthenticated]
@@ -381,16 +382,16 @@ class UpdateAvatarView(generics.UpdateAPIView):
         if not file:
             return api_response(False, "No file provided", status_code=status.HTTP_400_BAD_REQUEST)
 
-        try:
-            avatar_url = upload_to_cloudinary(file, folder="avatars")
-        except Exception as e:
-            return api_response(False, str(e), status_code=status.HTTP_500_INTERNAL_SERVER_ERROR)
-
         user = request.user
-        user.avatar = avatar_url 
-        user.save(update_fields=["avatar"])
-
-        return api_response(True, "Avatar updated successfully", data={"avatar": avatar_url})
+        with transaction.atomic():
+            user.avatar = queue_upload(user, "avatar", file, folder="avatars")
+            user.save(update_fields=["avatar"])
+
+        data = {"avatar": user.avatar, "avatar_status": media_status(user.avatar)}
+        if data["avatar_status"] == MEDIA_READY:
+            return api_response(True, "Avatar updated successfully", data=data)
+        # Uploaded to Cloudinary in the background; the staged copy is served until the URL is swapped in
+        return api_response(True, "Avatar upload in progress", data=data, status_code=status.HTTP_202_ACCEPTED)
 
 
 # ----------------------
@@ -1,7 +1,11 @@
 import json
+import uuid
+from django.utils import timezone
+from django.core.exceptions import ValidationError
 from channels.generic.websocket import AsyncJsonWebsocketConsumer
 from channels.db import database_sync_to_async
 from .models import Chat, Message, ChatParticipant
+from .writer import message_writer
 from accounts.models import User
 
 class ChatConsumer(AsyncJsonWebsocketConsumer):
@@ -31,6 +35,8 @@ class ChatConsumer(AsyncJsonWebsocketConsumer):
 
     async def disconnect(self, code):
         await self.channel_layer.group_discard(self.group_name, self.channel_name)
+        # Don't acknowledge a close before this client's messages are stored
+        await message_writer.flush()
         user = self.scope.get("user")
         if user and getattr(user, "is_authenticated", False):
             await self.channel_layer.group_send(self.group_name, {
@@ -42,9 +48,9 @@ class ChatConsumer(AsyncJsonWebsocketConsumer):
     async def receive_json(self, content, **kwargs):
         """
         Expected actions:
-        { type: "send_message", content: "hello" }
+        { type: "send_message", content: "hello", client_id: "<uuid>" }
         { type: "typing", active: true }
-        { type: "mark_read", message_id: "<uuid>" }
+        { type: "mark_read_up_to", message_id: "<uuid>" }  ("mark_read" is accepted as an alias)
         """
         event_type = content.get("type")
         user = self.scope["user"]
@@ -53,11 +59,13 @@ class ChatConsumer(AsyncJsonWebsocketConsumer):
             text = content.get("content", "").strip()
             if not text and not content.get("attachment"):
                 return
-            msg = await self.create_message(self.chat_id, user.id, text, content.get("attachment"))
+            msg = self.build_message(self.chat_id, user.id, text)
+            await message_writer.enqueue(msg)
             payload = {
                 "type": "new_message",
                 "message": {
                     "id": str(msg.id),
+                    "client_id": content.get("client_id"),
                     "chat": str(self.chat_id),
                     "sender": {"id": str(user.id), "username": user.username},
                     "content": msg.content,
@@ -75,10 +83,17 @@ class ChatConsumer(AsyncJsonWebsocketConsumer):
                 "payload": {"type":"typing","user_id": str(user.id), "active": content.get("active", True)}
             })
 
-        elif event_type == "mark_read":
+        elif event_type in ("mark_read_up_to", "mark_read"):
             message_id = content.get("message_id")
-            await self.mark_read(message_id, user.id)
-            # optionally broadcast read receipt
+            if not message_id:
+                return
+            # The message may still be sitting in the write-behind buffer
+            await message_writer.flush()
+            if await self.mark_read_up_to(self.chat_id, user.id, message_id):
+                await self.channel_layer.group_send(self.group_name, {
+                    "type": "broadcast",
+                    "payload": {"type": "read_receipt", "user_id": str(user.id), "message_id": str(message_id)}
+                })
 
     async def broadcast(self, event):
         payload = event.get("payload")
@@ -91,17 +106,20 @@ class ChatConsumer(AsyncJsonWebsocketConsumer):
     def user_in_chat(self, user_id, chat_id):
         return ChatParticipant.objects.filter(chat_id=chat_id, user_id=user_id, is_active=True).exists()
 
-    @database_sync_to_async
-    def create_message(self, chat_id, sender_id, content, attachment=None):
-        chat = Chat.objects.get(id=chat_id)
-        msg = Message.objects.create(chat=chat, sender_id=sender_id, content=content)
-        return msg
+    def build_message(self, chat_id, sender_id, content):
+        """
+        Unsaved message for the write-behind writer. The primary key is always
+        generated here; a client's `client_id` is only echoed back in the broadcast.
+        """
+        now = timezone.now()
+        return Message(
+            id=uuid.uuid4(), chat_id=chat_id, sender_id=sender_id,
+            content=content, created_at=now, updated_at=now
+        )
 
     @database_sync_to_async
-    def mark_read(self, message_id, user_id):
+    def mark_read_up_to(self, chat_id, user_id, message_id):
         try:
-            msg = Message.objects.get(id=message_id)
-            msg.read_by.add(user_id)
-            return True
-        except Message.DoesNotExist:
+            return ChatParticipant.mark_read_up_to(chat_id, user_id, message_id) > 0
+        except ValidationError:
             return False
@@ -0,0 +1,89 @@
+import time
+import uuid
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Exists, OuterRef
+from django.test.utils import CaptureQueriesContext
+from accounts.models import User
+from chat.models import Chat, ChatParticipant, Message
+from chat.serializers import ChatInboxSerializer, ChatListSerializer
+from chat.views import annotate_inbox
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the annotated chat inbox with the previous per-chat list (N+1) on synthetic chats. "
+        "The data is created in a transaction that is rolled back afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chats", type=int, default=500, help="Chats the benchmark user belongs to.")
+        parser.add_argument("--members", type=int, default=4, help="Participants per chat, including the user.")
+        parser.add_argument("--messages-per-chat", type=int, default=20)
+        parser.add_argument("--repeat", type=int, default=5, help="Runs per variant; the best time is reported.")
+
+    def create_data(self, chats, members, messages_per_chat):
+        tag = uuid.uuid4().hex[:8]
+        users = [
+            User(email=f"bench.{tag}.{n}@example.com", username=f"bench_{tag}_{n}", is_verified=True)
+            for n in range(max(2, members))
+        ]
+        User.objects.bulk_create(users)
+        me, others = users[0], users[1:]
+
+        chat_rows, participants, messages = [], [], []
+        for n in range(chats):
+            chat = Chat(id=uuid.uuid4(), chat_type="group", name=f"Bench {n}", owner=me)
+            chat_rows.append(chat)
+            participants.append(ChatParticipant(chat=chat, user=me, role="admin"))
+            participants.extend(ChatParticipant(chat=chat, user=other) for other in others)
+            messages.extend(
+                Message(id=uuid.uuid4(), chat=chat, sender=others[index % len(others)], content=f"Message {index}")
+                for index in range(messages_per_chat)
+            )
+        Chat.objects.bulk_create(chat_rows, batch_size=2000)
+        ChatParticipant.objects.bulk_create(participants, batch_size=2000)
+        Message.objects.bulk_create(messages, batch_size=2000)
+        # Point every chat at its last message, as Message.save() would have
+        last_messages = {message.chat_id: message.id for message in messages}
+        for chat in chat_rows:
+            chat.last_message_id = last_messages.get(chat.id)
+        Chat.objects.bulk_update(chat_rows, ["last_message"], batch_size=2000)
+        return me
+
+    @staticmethod
+    def legacy_inbox(user):
+        # The chat list before the inbox endpoint: JOIN + DISTINCT, then per-chat lookups
+        rows = []
+        for chat in Chat.objects.filter(participants__user=user, participants__is_active=True).distinct():
+            data = ChatListSerializer(chat).data
+            data["unread_count"] = ChatParticipant.objects.get(chat=chat, user=user).unread_count
+            rows.append(data)
+        return rows
+
+    @staticmethod
+    def annotated_inbox(user):
+        membership = ChatParticipant.objects.filter(chat=OuterRef("pk"), user=user, is_active=True)
+        queryset = annotate_inbox(Chat.objects.filter(Exists(membership)), user)
+        return ChatInboxSerializer(queryset, many=True).data
+
+    def measure(self, label, run, user, repeat):
+        best = None
+        for _ in range(repeat):
+            with CaptureQueriesContext(connection) as queries:
+                started = time.perf_counter()
+                rows = run(user)
+                elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        self.stdout.write(f"{label:<28} rows={len(rows):<8} queries={len(queries):<8} time={best * 1000:.1f}ms")
+
+    def handle(self, *args, **options):
+        repeat = max(1, options["repeat"])
+        with transaction.atomic():
+            user = self.create_data(options["chats"], options["members"], options["messages_per_chat"])
+            self.stdout.write(
+                f"{options['chats']} chats x {options['members']} members x {options['messages_per_chat']} messages"
+            )
+            self.measure("legacy list (N+1)", self.legacy_inbox, user, repeat)
+            self.measure("annotated inbox", self.annotated_inbox, user, repeat)
+            transaction.set_rollback(True)
@@ -1,25 +1,200 @@
+import asyncio
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
 from urllib.parse import parse_qs
+from asgiref.sync import sync_to_async
 from channels.middleware import BaseMiddleware
 from channels.db import database_sync_to_async
 from rest_framework_simplejwt.tokens import UntypedToken
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
 from django.conf import settings
 from accounts.models import User
-import jwt
+from core.cache import get_cache_backend
 
+logger = logging.getLogger(__name__)
+
+# =============================================================
+# USER CACHE
+# =============================================================
+class UserCache:
+    """
+    Size-bounded LRU of authenticated users keyed by (user_id, jti), with a short TTL.
+
+    Each entry remembers the user's version token from the shared cache
+    (see user_version); a change to the user row rotates the token, so other
+    processes miss on their next lookup instead of serving the stale user.
+    The process that saved the row also drops its entries directly.
+    """
+
+    def __init__(self, max_size=10000, ttl=60):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()
+        self.keys_by_user = {}
+
+    def get(self, user_id, jti, version=None):
+        key = (user_id, jti)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            expires_at, entry_version, user = entry
+            if expires_at < time.monotonic() or entry_version != version:
+                self._discard(key)
+                return None
+            self.entries.move_to_end(key)
+            return user
+
+    def set(self, user_id, jti, user, version=None):
+        key = (user_id, jti)
+        with self.lock:
+            self.entries[key] = (time.monotonic() + self.ttl, version, user)
+            self.entries.move_to_end(key)
+            self.keys_by_user.setdefault(user_id, set()).add(key)
+            while len(self.entries) > self.max_size:
+                self._discard(next(iter(self.entries)))
+
+    def invalidate_user(self, user_id):
+        with self.lock:
+            for key in list(self.keys_by_user.get(str(user_id), ())):
+                self._discard(key)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.keys_by_user.clear()
+
+    def _discard(self, key):
+        self.entries.pop(key, None)
+        keys = self.keys_by_user.get(key[0])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self.keys_by_user[key[0]]
+
+
+# =============================================================
+# BATCHED USER LOADER
+# =============================================================
 @database_sync_to_async
-def get_user_from_payload(payload):
-    uid = payload.get("user_id") or payload.get("user_id") or payload.get("user") or payload.get("id")
-    if not uid:
-        return None
+def fetch_users(user_ids):
+    return {str(user.id): user for user in User.objects.filter(id__in=user_ids, is_active=True)}
+
+
+class UserLoader:
+    """
+    Coalesces concurrent user lookups into one `id__in` query per batch window,
+    so a reconnect storm costs a handful of queries instead of one per socket.
+    """
+
+    def __init__(self, window=0.005, max_batch=500):
+        self.window = window
+        self.max_batch = max_batch
+        self.pending = {}
+        self.flush_handle = None
+
+    async def load(self, user_id):
+        future = self.pending.get(user_id)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            self.pending[user_id] = future
+            if len(self.pending) >= self.max_batch:
+                self._schedule_flush(loop, delay=0)
+            elif self.flush_handle is None:
+                self._schedule_flush(loop, delay=self.window)
+        return await asyncio.shield(future)
+
+    def _schedule_flush(self, loop, delay):
+        if self.flush_handle is not None:
+            self.flush_handle.cancel()
+        self.flush_handle = loop.call_later(delay, lambda: loop.create_task(self.flush()))
+
+    async def flush(self):
+        batch, self.pending = self.pending, {}
+        self.flush_handle = None
+        if not batch:
+            return
+        try:
+            users = await fetch_users(list(batch))
+        except Exception as exc:
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        for user_id, future in batch.items():
+            if not future.done():
+                future.set_result(users.get(user_id))
+
+
+CHAT_AUTH_CACHE = getattr(settings, "CHAT_AUTH_CACHE", {})
+user_cache = UserCache(
+    max_size=CHAT_AUTH_CACHE.get("MAX_SIZE", 10000),
+    ttl=CHAT_AUTH_CACHE.get("TTL", 60),
+)
+user_loader = UserLoader()
+
+
+def user_version_key(user_id):
+    return f"chat:socket-user:{user_id}"
+
+
+def rotate_user_version(user_id):
+    """
+    Invalidates the user's cached sockets in every process. The token only has
+    to outlive the entries cached before it, so it expires with the cache TTL.
+    """
+    user_cache.invalidate_user(user_id)
     try:
-        return User.objects.get(id=uid)
-    except User.DoesNotExist:
+        get_cache_backend().set(user_version_key(user_id), uuid.uuid4().hex[:12], user_cache.ttl)
+    except Exception:
+        # Other processes still drop the user when their entries expire
+        logger.exception(f"Could not rotate socket user version for {user_id}")
+
+
+@sync_to_async(thread_sensitive=False)
+def user_version(user_id):
+    return get_cache_backend().get(user_version_key(user_id))
+
+
+async def get_user_from_token(token):
+    """
+    Validates the JWT once and resolves its user through the cache and batched loader.
+    """
+    try:
+        payload = UntypedToken(token).payload
+    except TokenError:
+        return None
+
+    user_id = payload.get(jwt_settings.USER_ID_CLAIM)
+    if not user_id:
         return None
+    user_id = str(user_id)
+    jti = payload.get(jwt_settings.JTI_CLAIM, "")
+
+    try:
+        version = await user_version(user_id)
+    except Exception:
+        logger.exception("Socket user version lookup failed")
+        return await user_loader.load(user_id)
+
+    user = user_cache.get(user_id, jti, version)
+    if user is None:
+        user = await user_loader.load(user_id)
+        if user is not None:
+            user_cache.set(user_id, jti, user, version)
+    return user
+
 
 class JwtAuthMiddleware(BaseMiddleware):
     """
     Expect token in query string: ?token=<jwt>
-    Sets scope['user'] to authenticated user or AnonymousUser
+    Sets scope['user'] to authenticated user or None
     """
     async def __call__(self, scope, receive, send):
         query_string = scope.get("query_string", b"").decode()
@@ -32,10 +207,7 @@ class JwtAuthMiddleware(BaseMiddleware):
 
         if token:
             try:
-                UntypedToken(token)
-                payload = jwt.decode(token, settings.SECRET_KEY, algorithms=["HS256"])
-                user = await get_user_from_payload(payload)
-                scope['user'] = user
+                scope['user'] = await get_user_from_token(token)
             except Exception:
                 scope['user'] = None
         else:
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.7 on 2025-10-27 09:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chat', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='message',
+            index=models.Index(fields=['chat', 'created_at'], name='chat_messag_chat_id_012ed9_idx'),
+        ),
+    ]
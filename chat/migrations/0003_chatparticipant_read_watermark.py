@@ -0,0 +1,44 @@
+# Generated by Django 5.2.7 on 2025-10-27 14:20
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Exists, OuterRef, Subquery
+
+
+def backfill_read_watermarks(apps, schema_editor):
+    """
+    Starts each participant's watermark at the newest message they had already
+    marked read through Message.read_by, so existing reads don't become unread.
+    """
+    ChatParticipant = apps.get_model('chat', 'ChatParticipant')
+    Message = apps.get_model('chat', 'Message')
+
+    newest_read = (
+        Message.objects.filter(chat_id=OuterRef('chat_id'), read_by=OuterRef('user_id'))
+        .order_by('-created_at', '-id')
+    )
+    ChatParticipant.objects.filter(Exists(newest_read)).update(
+        last_read_at=Subquery(newest_read.values('created_at')[:1]),
+        last_read_message_id=Subquery(newest_read.values('id')[:1]),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chat', '0002_message_chat_created_at_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='chatparticipant',
+            name='last_read_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='chatparticipant',
+            name='last_read_message',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='chat.message'),
+        ),
+        migrations.RunPython(backfill_read_watermarks, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.7 on 2025-10-28 08:10
+
+from django.db import migrations, models
+
+
+def backfill_direct_keys(apps, schema_editor):
+    Chat = apps.get_model('chat', 'Chat')
+    ChatParticipant = apps.get_model('chat', 'ChatParticipant')
+
+    members = {}
+    for chat_id, user_id in ChatParticipant.objects.filter(chat__chat_type='private').values_list('chat_id', 'user_id'):
+        members.setdefault(chat_id, set()).add(str(user_id))
+
+    # Oldest chat wins when duplicates already exist for the same pair
+    seen = set()
+    for chat in Chat.objects.filter(id__in=members).order_by('created_at'):
+        user_ids = members[chat.id]
+        if len(user_ids) != 2:
+            continue
+        key = ":".join(sorted(user_ids))
+        if key in seen:
+            continue
+        seen.add(key)
+        chat.direct_key = key
+        chat.save(update_fields=['direct_key'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chat', '0003_chatparticipant_read_watermark'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='chat',
+            name='direct_key',
+            field=models.CharField(blank=True, editable=False, max_length=80, null=True, unique=True),
+        ),
+        migrations.RunPython(backfill_direct_keys, migrations.RunPython.noop),
+    ]
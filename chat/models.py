@@ -1,5 +1,6 @@
 import uuid
 from django.db import models
+from django.db.models import Q, Exists, Subquery
 from django.utils import timezone
 from django.conf import settings
 from accounts.models import User  
@@ -14,6 +15,8 @@ class Chat(BaseModel):
     chat_type = models.CharField(max_length=10, choices=CHAT_TYPES, default='private')
     owner = models.ForeignKey(User, null=True, blank=True, on_delete=models.SET_NULL, related_name='owned_chats')
     last_message = models.ForeignKey('Message', null=True, blank=True, on_delete=models.SET_NULL, related_name='+')
+    # Sorted "<user_id>:<user_id>" pair, only set on one-on-one chats
+    direct_key = models.CharField(max_length=80, unique=True, null=True, blank=True, editable=False)
 
     class Meta:
         db_table = 'chat_chats'
@@ -22,6 +25,10 @@ class Chat(BaseModel):
     def __str__(self):
         return f"{self.chat_type.title()} Chat: {self.name or self.id}"
 
+    @staticmethod
+    def direct_key_for(user_id, other_user_id):
+        return ":".join(sorted([str(user_id), str(other_user_id)]))
+
     @property
     def participant_count(self):
         return self.participants.count()
@@ -35,6 +42,9 @@ class ChatParticipant(BaseModel):
     user = models.ForeignKey(User, related_name='chat_participations', on_delete=models.CASCADE)
     role = models.CharField(max_length=20, choices=CHAT_ROLE_CHOICES, default='member')
     joined_at = models.DateTimeField(default=timezone.now)
+    # Read watermark: everything up to last_read_at counts as read
+    last_read_message = models.ForeignKey('Message', null=True, blank=True, on_delete=models.SET_NULL, related_name='+')
+    last_read_at = models.DateTimeField(null=True, blank=True)
 
     class Meta:
         db_table = 'chat_participants'
@@ -46,6 +56,31 @@ class ChatParticipant(BaseModel):
     def is_admin(self):
         return self.role == 'admin'
 
+    @classmethod
+    def mark_read_up_to(cls, chat_id, user_id, message_id):
+        """
+        Advances the user's read watermark in `chat_id` to `message_id` with a single UPDATE.
+        The watermark never moves backwards. Returns the number of rows updated (0 or 1).
+        """
+        message = Message.objects.filter(id=message_id, chat_id=chat_id)
+        read_at = Subquery(message.values('created_at')[:1])
+        return (
+            cls.objects.filter(chat_id=chat_id, user_id=user_id)
+            .filter(Exists(message))
+            .filter(Q(last_read_at__isnull=True) | Q(last_read_at__lt=read_at))
+            .update(last_read_message_id=message_id, last_read_at=read_at)
+        )
+
+    def unread_messages(self):
+        messages = Message.objects.filter(chat_id=self.chat_id).exclude(sender_id=self.user_id)
+        if self.last_read_at:
+            messages = messages.filter(created_at__gt=self.last_read_at)
+        return messages
+
+    @property
+    def unread_count(self):
+        return self.unread_messages().count()
+
 
 # =============================================================
 # MESSAGE MODEL
@@ -61,6 +96,9 @@ class Message(BaseModel):
     class Meta:
         db_table = 'chat_messages'
         ordering = ('created_at',)
+        indexes = [
+            models.Index(fields=['chat', 'created_at']),
+        ]
 
     def __str__(self):
         return f"Message from {self.sender} in {self.chat}"
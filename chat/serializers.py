@@ -26,11 +26,46 @@ class ChatListSerializer(serializers.ModelSerializer):
             return {
                 "id": str(obj.last_message.id),
                 "content": obj.last_message.content,
-                "sender_id": getattr(obj.last_message.sender, "id", None),
+                "sender_id": obj.last_message.sender_id,
                 "created_at": obj.last_message.created_at.isoformat()
             }
         return None
 
+class InboxParticipantSerializer(serializers.ModelSerializer):
+    id = serializers.UUIDField(source="user.id", read_only=True)
+    username = serializers.CharField(source="user.username", read_only=True)
+    avatar = serializers.URLField(source="user.avatar", read_only=True)
+
+    class Meta:
+        model = ChatParticipant
+        fields = ("id","username","avatar","role")
+
+class ChatInboxSerializer(serializers.ModelSerializer):
+    """
+    Inbox row; expects the queryset built by chat.views.annotate_inbox.
+    """
+    PREVIEW_LENGTH = 100
+
+    participants = InboxParticipantSerializer(source="active_participants", many=True, read_only=True)
+    last_message = serializers.SerializerMethodField()
+    unread_count = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = Chat
+        fields = ("id","name","chat_type","participants","last_message","unread_count","updated_at")
+
+    def get_last_message(self, obj):
+        message = obj.last_message
+        if not message:
+            return None
+        return {
+            "id": str(message.id),
+            "preview": message.content[:self.PREVIEW_LENGTH],
+            "sender_id": message.sender_id,
+            "sender_username": getattr(message.sender, "username", None),
+            "created_at": message.created_at.isoformat()
+        }
+
 class ChatCreateSerializer(serializers.ModelSerializer):
     member_ids = serializers.ListField(child=serializers.UUIDField(), required=False)
 
@@ -0,0 +1,10 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from accounts.models import User
+from chat.middleware import rotate_user_version
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_cached_socket_user(sender, instance, **kwargs):
+    # Logout, role changes and deactivation all save the user row
+    rotate_user_version(instance.id)
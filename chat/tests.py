@@ -1,3 +1,92 @@
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from accounts.models import User
+from chat.models import Chat, ChatParticipant, Message
 
-# Create your tests here.
+INBOX_URL = "/api/v1/chat/chats/inbox/"
+ONE_ON_ONE_URL = "/api/v1/chat/chats/one_on_one/"
+
+
+# ===============================
+# INBOX QUERY COUNT
+# ===============================
+class InboxQueryCountTests(TestCase):
+    """
+    The inbox is built by annotate_inbox: a fixed number of queries whatever
+    the number of chats, participants and messages.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email="me@example.com", username="me", password="pass12345")
+        cls.others = [
+            User.objects.create_user(email=f"friend{n}@example.com", username=f"friend{n}", password="pass12345")
+            for n in range(3)
+        ]
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def create_chats(self, count):
+        for n in range(count):
+            chat = Chat.objects.create(chat_type="group", name=f"Group {n}", owner=self.user)
+            ChatParticipant.objects.create(chat=chat, user=self.user, role="admin")
+            for other in self.others:
+                ChatParticipant.objects.create(chat=chat, user=other)
+                Message.objects.create(chat=chat, sender=other, content=f"Hello from {other.username}")
+
+    def test_inbox_query_count_does_not_grow_with_chats(self):
+        self.create_chats(1)
+        with CaptureQueriesContext(connection) as baseline:
+            response = self.client.get(INBOX_URL)
+        self.assertEqual(response.status_code, 200)
+
+        self.create_chats(5)
+        with self.assertNumQueries(len(baseline)):
+            response = self.client.get(INBOX_URL)
+        rows = response.data["results"]
+        self.assertEqual(len(rows), 6)
+        self.assertTrue(all(row["unread_count"] == len(self.others) for row in rows))
+        self.assertTrue(all(len(row["participants"]) == len(self.others) + 1 for row in rows))
+
+
+# ===============================
+# DIRECT CHATS
+# ===============================
+class OneOnOneTests(TestCase):
+    """
+    Reopening a direct chat brings the caller back, never the other member.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.alice = User.objects.create_user(email="alice@example.com", username="alice", password="pass12345")
+        cls.bob = User.objects.create_user(email="bob@example.com", username="bob", password="pass12345")
+
+    def open_chat(self, user, target):
+        client = APIClient()
+        client.force_authenticate(user)
+        return client.post(ONE_ON_ONE_URL, {"target_user_id": str(target.id)}, format="json")
+
+    def participant(self, chat_id, user):
+        return ChatParticipant.all_objects.get(chat_id=chat_id, user=user)
+
+    def test_first_call_creates_both_participants(self):
+        response = self.open_chat(self.alice, self.bob)
+        self.assertEqual(response.status_code, 201, response.content)
+        self.assertTrue(self.participant(response.data["id"], self.alice).is_active)
+        self.assertTrue(self.participant(response.data["id"], self.bob).is_active)
+
+    def test_target_who_left_is_not_added_back(self):
+        chat_id = self.open_chat(self.alice, self.bob).data["id"]
+        self.participant(chat_id, self.bob).soft_delete()
+
+        response = self.open_chat(self.alice, self.bob)
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertFalse(self.participant(chat_id, self.bob).is_active)
+
+        self.open_chat(self.bob, self.alice)
+        self.assertTrue(self.participant(chat_id, self.bob).is_active)
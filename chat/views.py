@@ -6,13 +6,67 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django.shortcuts import get_object_or_404
+from datetime import datetime, timezone as dt_timezone
 from django.db import transaction
+from django.utils import timezone
+from django.core.exceptions import ValidationError
 
 from .models import Chat, ChatParticipant, Message
-from .serializers import ChatListSerializer, ChatCreateSerializer, MessageSerializer, UserBriefSerializer
+from core.pagination import KeysetPagination
+from .serializers import ChatListSerializer, ChatInboxSerializer, ChatCreateSerializer, MessageSerializer, UserBriefSerializer
 from django.contrib.auth import get_user_model
+from django.db.models import Count, Exists, OuterRef, Prefetch, Subquery, Value
+from django.db.models.functions import Coalesce
 
 User = get_user_model()
+EPOCH = timezone.make_aware(datetime(1970, 1, 1), dt_timezone.utc)
+
+
+def annotate_inbox(queryset, user):
+    """
+    Adds everything an inbox row needs in two queries total: the chats with
+    last message/sender joined and `unread_count` computed against the
+    user's read watermark, plus one prefetch of active participants.
+    """
+    my_watermark = ChatParticipant.objects.filter(chat=OuterRef("pk"), user=user).values("last_read_at")[:1]
+    unread = (
+        Message.objects.filter(chat=OuterRef("pk"), created_at__gt=Coalesce(OuterRef("my_last_read_at"), Value(EPOCH)))
+        .exclude(sender=user)
+        .order_by()
+        .values("chat")
+        .annotate(total=Count("pk"))
+        .values("total")
+    )
+    return (
+        queryset.select_related("last_message__sender")
+        .annotate(my_last_read_at=Subquery(my_watermark))
+        .annotate(unread_count=Coalesce(Subquery(unread[:1]), 0))
+        .prefetch_related(
+            Prefetch(
+                "participants",
+                queryset=ChatParticipant.objects.filter(is_active=True).select_related("user"),
+                to_attr="active_participants",
+            )
+        )
+    )
+
+
+def ensure_direct_participants(chat, user, target):
+    """
+    Makes `user` an active participant of the direct chat and makes sure
+    `target` has a participant row, in at most three queries. Only the caller
+    is reactivated: a target who left the chat stays out until they reopen it.
+    """
+    ChatParticipant.all_objects.filter(chat=chat, user=user, is_active=False).update(
+        is_active=True, deleted_at=None, updated_at=timezone.now()
+    )
+    existing = set(ChatParticipant.all_objects.filter(chat=chat).values_list("user_id", flat=True))
+    ChatParticipant.objects.bulk_create([
+        ChatParticipant(chat=chat, user=member, role=role)
+        for member, role in ((user, "admin"), (target, "member"))
+        if member.id not in existing
+    ])
+
 
 class ChatViewSet(viewsets.GenericViewSet,
                   mixins.ListModelMixin,
@@ -23,12 +77,32 @@ class ChatViewSet(viewsets.GenericViewSet,
     queryset = Chat.objects.all()
 
     def get_serializer_class(self):
+        if self.action == "inbox":
+            return ChatInboxSerializer
         if self.action in ("list","retrieve"):
             return ChatListSerializer
         return ChatCreateSerializer
 
     def get_queryset(self):
-        return Chat.objects.filter(participants__user=self.request.user, participants__is_active=True).distinct()
+        user = self.request.user
+        membership = ChatParticipant.objects.filter(chat=OuterRef("pk"), user=user, is_active=True)
+        queryset = Chat.objects.filter(Exists(membership))
+        if self.action == "inbox":
+            queryset = annotate_inbox(queryset, user)
+        elif self.action in ("list","retrieve"):
+            queryset = queryset.select_related("last_message").prefetch_related(
+                Prefetch("participants", queryset=ChatParticipant.objects.select_related("user"))
+            )
+        return queryset
+
+    @action(detail=False, methods=["get"])
+    def inbox(self, request):
+        queryset = self.get_queryset()
+        page = self.paginate_queryset(queryset)
+        serializer = self.get_serializer(page if page is not None else queryset, many=True)
+        if page is not None:
+            return self.get_paginated_response(serializer.data)
+        return Response(serializer.data)
 
     def perform_create(self, serializer):
         with transaction.atomic():
@@ -51,18 +125,23 @@ class ChatViewSet(viewsets.GenericViewSet,
         target_id = request.data.get("target_user_id")
         if not target_id:
             return Response({"detail":"target_user_id required"}, status=400)
-        # search existing private chat with exactly these 2 participants
-        chats = Chat.objects.filter(chat_type="private", participants__user=request.user).distinct()
-        for c in chats:
-            ids = set(c.participants.values_list("user_id", flat=True))
-            if ids == {request.user.id, int(target_id)}:
-                return Response(ChatListSerializer(c).data)
-        # create private chat
+        try:
+            target = User.objects.filter(id=target_id, is_active=True).first()
+        except ValidationError:
+            target = None
+        if not target or target.id == request.user.id:
+            return Response({"detail":"invalid target_user_id"}, status=400)
+
+        # single unique-index lookup; get_or_create re-fetches if a concurrent request wins the insert
         with transaction.atomic():
-            chat = Chat.objects.create(chat_type="private")
-            ChatParticipant.objects.create(chat=chat, user=request.user, role="admin")
-            ChatParticipant.objects.create(chat=chat, user_id=target_id)
-        return Response(ChatListSerializer(chat).data, status=201)
+            chat, created = Chat.all_objects.get_or_create(
+                direct_key=Chat.direct_key_for(request.user.id, target.id),
+                defaults={"chat_type": "private"},
+            )
+            if not created and not chat.is_active:
+                chat.restore()
+            ensure_direct_participants(chat, request.user, target)
+        return Response(ChatListSerializer(chat).data, status=201 if created else 200)
 
     @action(detail=True, methods=["post"])
     def add_participant(self, request, pk=None):
@@ -71,6 +150,28 @@ class ChatViewSet(viewsets.GenericViewSet,
         ChatParticipant.objects.update_or_create(chat=chat, user_id=uid, defaults={"is_active": True})
         return Response(ChatListSerializer(chat).data)
 
+    @action(detail=True, methods=["post"])
+    def mark_read_up_to(self, request, pk=None):
+        message_id = request.data.get("message_id")
+        if not message_id:
+            return Response({"detail":"message_id required"}, status=400)
+        participant = get_object_or_404(ChatParticipant, chat_id=pk, user=request.user, is_active=True)
+        try:
+            ChatParticipant.mark_read_up_to(pk, request.user.id, message_id)
+        except ValidationError:
+            return Response({"detail":"invalid message_id"}, status=400)
+        participant.refresh_from_db(fields=["last_read_message", "last_read_at"])
+        return Response({
+            "last_read_message": participant.last_read_message_id,
+            "last_read_at": participant.last_read_at,
+            "unread_count": participant.unread_count,
+        })
+
+    @action(detail=True, methods=["get"])
+    def unread_count(self, request, pk=None):
+        participant = get_object_or_404(ChatParticipant, chat_id=pk, user=request.user, is_active=True)
+        return Response({"unread_count": participant.unread_count})
+
     @action(detail=True, methods=["delete"])
     def leave(self, request, pk=None):
         chat = get_object_or_404(Chat, pk=pk)
@@ -81,6 +182,7 @@ class ChatViewSet(viewsets.GenericViewSet,
 class MessageViewSet(viewsets.ModelViewSet):
     serializer_class = MessageSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
 
     def get_queryset(self):
         chat_id = self.request.query_params.get("chat")
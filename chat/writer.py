@@ -0,0 +1,147 @@
+import asyncio
+import atexit
+import logging
+import threading
+from django.conf import settings
+from django.db import DatabaseError, transaction
+from django.utils import timezone
+from channels.db import database_sync_to_async
+from .models import Chat, Message
+
+logger = logging.getLogger(__name__)
+
+# =============================================================
+# WRITE-BEHIND MESSAGE WRITER
+# =============================================================
+class MessageWriter:
+    """
+    Buffers chat messages in memory and persists them in batches.
+
+    Consumers broadcast a message as soon as it is enqueued; every
+    `flush_interval` seconds (or once `batch_size` messages are waiting) the
+    buffer is written with one bulk_create (plus a bulk_update restoring the
+    broadcast timestamps) and one `last_message` UPDATE per chat. At most
+    `max_pending` messages can be buffered: further enqueues wait for a
+    flush (back-pressure). Whatever is still buffered at interpreter exit
+    is written synchronously.
+    """
+
+    def __init__(self, flush_interval=0.05, batch_size=200, max_pending=5000):
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.max_pending = max_pending
+        self.lock = threading.Lock()
+        self.buffer = []
+        self.slots = None
+        self.wakeup = None
+        self.flush_lock = None
+        self.task = None
+        atexit.register(self.flush_sync)
+
+    # ----------------------------
+    # Producer side
+    # ----------------------------
+    async def enqueue(self, message):
+        self._ensure_started()
+        await self.slots.acquire()
+        with self.lock:
+            self.buffer.append(message)
+            full = len(self.buffer) >= self.batch_size
+        if full:
+            self.wakeup.set()
+        return message
+
+    def _ensure_started(self):
+        if self.task is not None and not self.task.done():
+            return
+        if self.slots is None:
+            self.slots = asyncio.Semaphore(self.max_pending)
+            self.wakeup = asyncio.Event()
+            self.flush_lock = asyncio.Lock()
+        self.task = asyncio.get_running_loop().create_task(self.run())
+
+    # ----------------------------
+    # Flushing
+    # ----------------------------
+    async def run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self.wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self.wakeup.clear()
+            try:
+                await self.flush()
+            except Exception:
+                logger.exception("Chat message flush failed")
+
+    async def flush(self):
+        if self.flush_lock is None:
+            return
+        # Serialized so an older batch can never overwrite a newer last_message
+        async with self.flush_lock:
+            with self.lock:
+                batch, self.buffer = self.buffer, []
+            if not batch:
+                return
+            try:
+                await database_sync_to_async(self.write)(batch)
+            finally:
+                for _ in batch:
+                    self.slots.release()
+
+    def flush_sync(self):
+        with self.lock:
+            batch, self.buffer = self.buffer, []
+        if batch:
+            self.write(batch)
+
+    def write(self, batch):
+        try:
+            with transaction.atomic():
+                self.insert(batch)
+                self.update_last_messages(batch)
+            return
+        except DatabaseError:
+            logger.exception(f"Bulk insert of {len(batch)} chat messages failed, retrying one by one")
+
+        written = []
+        for message in batch:
+            try:
+                with transaction.atomic():
+                    self.insert([message])
+                written.append(message)
+            except DatabaseError as e:
+                logger.error(f"Dropping chat message {message.id} for chat {message.chat_id}: {e}")
+        self.update_last_messages(written)
+
+    @staticmethod
+    def insert(messages):
+        """
+        Inserts `messages` keeping the timestamps they were broadcast with:
+        auto_now_add replaces created_at during bulk_create, so the original
+        values are written back with one bulk_update.
+        """
+        stamps = [(message.created_at, message.updated_at) for message in messages]
+        Message.objects.bulk_create(messages)
+        for message, (created_at, updated_at) in zip(messages, stamps):
+            message.created_at, message.updated_at = created_at, updated_at
+        Message.objects.bulk_update(messages, ["created_at", "updated_at"])
+
+    @staticmethod
+    def update_last_messages(batch):
+        """
+        Points each chat at its newest message; `batch` holds only rows that were inserted.
+        """
+        latest = {message.chat_id: message for message in batch}
+        now = timezone.now()
+        for chat_id, message in latest.items():
+            Chat.objects.filter(id=chat_id).update(last_message_id=message.id, updated_at=now)
+
+
+CHAT_MESSAGE_WRITER = getattr(settings, "CHAT_MESSAGE_WRITER", {})
+message_writer = MessageWriter(
+    flush_interval=CHAT_MESSAGE_WRITER.get("FLUSH_INTERVAL", 0.05),
+    batch_size=CHAT_MESSAGE_WRITER.get("BATCH_SIZE", 200),
+    max_pending=CHAT_MESSAGE_WRITER.get("MAX_PENDING", 5000),
+)
@@ -1,3 +1,39 @@
 from django.contrib import admin
+from core.jobs import requeue
+from core.models import Job, MediaAsset, MediaUpload
 
-# Register your models here.
+
+# ===============================
+# JOB QUEUE
+# ===============================
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'task', 'status', 'attempts', 'max_attempts', 'run_at', 'locked_by', 'created_at')
+    list_filter = ('status', 'task')
+    search_fields = ('task', 'last_error')
+    readonly_fields = ('locked_by', 'locked_at', 'created_at', 'updated_at', 'finished_at', 'last_error')
+    actions = ['requeue_jobs']
+
+    @admin.action(description="Requeue selected dead jobs")
+    def requeue_jobs(self, request, queryset):
+        count = requeue(queryset)
+        self.message_user(request, f"{count} job(s) requeued.")
+
+
+# ===============================
+# MEDIA UPLOADS
+# ===============================
+@admin.register(MediaAsset)
+class MediaAssetAdmin(admin.ModelAdmin):
+    list_display = ('id', 'folder', 'checksum', 'size', 'status', 'created_at')
+    list_filter = ('status', 'folder')
+    search_fields = ('checksum', 'url')
+    readonly_fields = ('checksum', 'file', 'size', 'url', 'created_at', 'updated_at')
+
+
+@admin.register(MediaUpload)
+class MediaUploadAdmin(admin.ModelAdmin):
+    list_display = ('id', 'target_model', 'target_id', 'target_field', 'status', 'created_at')
+    list_filter = ('status', 'target_model')
+    search_fields = ('target_id',)
+    readonly_fields = ('asset', 'created_at', 'updated_at')
@@ -1,6 +1,13 @@
 from django.apps import AppConfig
+from django.utils.module_loading import autodiscover_modules
 
 
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'core'
+
+    def ready(self):
+        # Register queue tasks: core.jobs itself plus any <app>.tasks module
+        import core.jobs  # noqa: F401
+        import core.media  # noqa: F401
+        autodiscover_modules('tasks')
@@ -0,0 +1,348 @@
+import hashlib
+import logging
+import os
+import pickle
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict
+from functools import lru_cache, wraps
+from urllib.parse import urlencode
+from django.conf import settings
+from django.utils.module_loading import import_string
+from rest_framework.response import Response
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RESPONSE_CACHE = {
+    # None picks a shared backend when one is configured (see resolve_backend)
+    "BACKEND": None,
+    "OPTIONS": {},
+    "REDIS_URL": None,
+    "TIMEOUT": 300,
+    "KEY_PREFIX": "rc",
+}
+
+
+def response_cache_setting(name):
+    return getattr(settings, "RESPONSE_CACHE", {}).get(name, DEFAULT_RESPONSE_CACHE[name])
+
+
+# =============================================================
+# BACKENDS
+# =============================================================
+class BaseCacheBackend:
+    """
+    Minimal key/value store used by the response cache. Values are arbitrary
+    picklable objects; `timeout=None` means no expiry.
+    """
+
+    def get(self, key):
+        raise NotImplementedError
+
+    def get_many(self, keys):
+        return {key: value for key in keys if (value := self.get(key)) is not None}
+
+    def set(self, key, value, timeout=None):
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+
+class LocMemLRUBackend(BaseCacheBackend):
+    """
+    Process-local LRU bounded by entry count.
+
+    Single-process only: tag versions live in each worker's memory, so an
+    invalidation in one worker leaves the others serving stale responses.
+    """
+
+    def __init__(self, max_entries=2000):
+        self.max_entries = max_entries
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at is not None and expires_at < time.monotonic():
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, timeout=None):
+        expires_at = None if timeout is None else time.monotonic() + timeout
+        with self.lock:
+            self.entries[key] = (expires_at, value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+class FileBackend(BaseCacheBackend):
+    """
+    One pickle file per key under `location`; shared by every process on the host.
+    """
+
+    def __init__(self, location="/tmp/freeapi-response-cache"):
+        self.location = location
+        os.makedirs(location, exist_ok=True)
+
+    def path(self, key):
+        return os.path.join(self.location, hashlib.sha1(key.encode()).hexdigest() + ".cache")
+
+    def get(self, key):
+        try:
+            with open(self.path(key), "rb") as f:
+                expires_at, value = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return None
+        if expires_at is not None and expires_at < time.time():
+            return None
+        return value
+
+    def set(self, key, value, timeout=None):
+        expires_at = None if timeout is None else time.time() + timeout
+        path = self.path(key)
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump((expires_at, value), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+
+    def clear(self):
+        for name in os.listdir(self.location):
+            if name.endswith(".cache"):
+                os.remove(os.path.join(self.location, name))
+
+
+class RedisBackend(BaseCacheBackend):
+    """
+    Shared cache in Redis; values are pickled.
+    """
+
+    def __init__(self, url="redis://localhost:6379/2"):
+        import redis
+
+        self.client = redis.Redis.from_url(url)
+
+    def get(self, key):
+        value = self.client.get(key)
+        return None if value is None else pickle.loads(value)
+
+    def get_many(self, keys):
+        values = self.client.mget(keys)
+        return {key: pickle.loads(value) for key, value in zip(keys, values) if value is not None}
+
+    def set(self, key, value, timeout=None):
+        self.client.set(key, pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL), ex=timeout)
+
+    def clear(self):
+        prefix = response_cache_setting("KEY_PREFIX")
+        for key in self.client.scan_iter(f"{prefix}:*"):
+            self.client.delete(key)
+
+
+class DjangoCacheBackend(BaseCacheBackend):
+    """
+    Delegates to one of Django's CACHES aliases (Redis, Memcached, database, ...).
+    """
+
+    def __init__(self, alias="default"):
+        from django.core.cache import caches
+
+        self.cache = caches[alias]
+
+    def get(self, key):
+        return self.cache.get(key)
+
+    def get_many(self, keys):
+        return self.cache.get_many(keys)
+
+    def set(self, key, value, timeout=None):
+        self.cache.set(key, value, timeout)
+
+    def clear(self):
+        self.cache.clear()
+
+
+PROCESS_LOCAL_CACHES = {
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+}
+
+
+def resolve_backend():
+    """
+    (backend path, options) for the response cache. An explicit BACKEND wins;
+    otherwise RESPONSE_CACHE["REDIS_URL"], then a shared Django "default"
+    cache, and only then the process-local LRU.
+    """
+    if response_cache_setting("BACKEND"):
+        return response_cache_setting("BACKEND"), response_cache_setting("OPTIONS")
+    if response_cache_setting("REDIS_URL"):
+        return "core.cache.RedisBackend", {"url": response_cache_setting("REDIS_URL")}
+    default_cache = getattr(settings, "CACHES", {}).get("default", {})
+    if default_cache.get("BACKEND", "django.core.cache.backends.locmem.LocMemCache") not in PROCESS_LOCAL_CACHES:
+        return "core.cache.DjangoCacheBackend", {"alias": "default"}
+    return "core.cache.LocMemLRUBackend", response_cache_setting("OPTIONS")
+
+
+@lru_cache(maxsize=None)
+def get_cache_backend():
+    path, options = resolve_backend()
+    return import_string(path)(**options)
+
+
+# =============================================================
+# METRICS
+# =============================================================
+class CacheMetrics:
+    """
+    In-process hit/miss counters per cached view.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.hits = Counter()
+        self.misses = Counter()
+
+    def record(self, name, hit):
+        with self.lock:
+            (self.hits if hit else self.misses)[name] += 1
+
+    def snapshot(self):
+        with self.lock:
+            names = set(self.hits) | set(self.misses)
+            return {
+                name: {
+                    "hits": self.hits[name],
+                    "misses": self.misses[name],
+                    "hit_ratio": round(self.hits[name] / ((self.hits[name] + self.misses[name]) or 1), 4),
+                }
+                for name in sorted(names)
+            }
+
+    def reset(self):
+        with self.lock:
+            self.hits.clear()
+            self.misses.clear()
+
+
+metrics = CacheMetrics()
+
+
+# =============================================================
+# TAGS
+# =============================================================
+def model_tag(model):
+    return model._meta.label_lower
+
+
+def tag_key(tag):
+    return f"{response_cache_setting('KEY_PREFIX')}:tag:{tag}"
+
+
+def tag_versions(tags):
+    """
+    Current version token of each tag. A missing tag gets a fresh random token,
+    so an evicted tag can never bring back entries cached under an older one.
+    """
+    backend = get_cache_backend()
+    keys = [tag_key(tag) for tag in tags]
+    versions = backend.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            versions[key] = uuid.uuid4().hex[:12]
+            backend.set(key, versions[key])
+    return [versions[key] for key in keys]
+
+
+def invalidate_tags(*tags):
+    """
+    Drops every cached response tagged with any of `tags` by rotating their version tokens.
+    """
+    backend = get_cache_backend()
+    for tag in tags:
+        backend.set(tag_key(tag), uuid.uuid4().hex[:12])
+
+
+def invalidate_model(model):
+    try:
+        invalidate_tags(model_tag(model))
+    except Exception:
+        # Cache outages must never fail a write; entries still expire with their TTL
+        logger.exception(f"Could not invalidate response cache for {model_tag(model)}")
+
+
+# =============================================================
+# DECORATOR
+# =============================================================
+def cache_response(models=(), tags=(), timeout=None, scope="public"):
+    """
+    Caches a DRF view method's successful GET responses.
+
+    The key covers the full URL (path and query string), the tag versions of
+    `models` / `tags`, and for `scope="user"` the requesting user, so responses
+    that depend on who is asking are never shared. Any save, soft delete or
+    restore of a BaseModel subclass listed in `models` invalidates the entry.
+
+    Permission checks still run on every request: DRF calls the method only
+    after authentication and permissions have passed.
+    """
+    all_tags = [model_tag(model) for model in models] + list(tags)
+
+    def decorator(view_method):
+        name = view_method.__qualname__
+
+        @wraps(view_method)
+        def wrapper(self, request, *args, **kwargs):
+            if request.method != "GET":
+                return view_method(self, request, *args, **kwargs)
+
+            try:
+                backend = get_cache_backend()
+                key = response_key(request, name, all_tags, scope)
+                cached = backend.get(key)
+            except Exception:
+                logger.exception(f"Response cache lookup failed for {name}")
+                return view_method(self, request, *args, **kwargs)
+
+            if cached is not None:
+                metrics.record(name, hit=True)
+                status_code, data = cached
+                response = Response(data, status=status_code)
+                response["X-Cache"] = "HIT"
+                return response
+
+            metrics.record(name, hit=False)
+            response = view_method(self, request, *args, **kwargs)
+            if response.status_code == 200 and isinstance(response, Response):
+                try:
+                    backend.set(key, (response.status_code, response.data), timeout or response_cache_setting("TIMEOUT"))
+                except Exception:
+                    logger.exception(f"Response cache store failed for {name}")
+            response["X-Cache"] = "MISS"
+            return response
+
+        return wrapper
+
+    return decorator
+
+
+def response_key(request, name, tags, scope):
+    user = getattr(request, "user", None)
+    user_part = ""
+    if scope == "user":
+        user_part = str(user.pk) if user is not None and user.is_authenticated else "anon"
+    query = urlencode(sorted(request.query_params.lists()), doseq=True)
+    raw = "|".join([name, request.build_absolute_uri(request.path), query, user_part, *tag_versions(tags)])
+    return f"{response_cache_setting('KEY_PREFIX')}:resp:{hashlib.sha1(raw.encode()).hexdigest()}"
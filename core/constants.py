@@ -117,6 +117,15 @@ SIZE_CHOICES = [
     ("XXL", "XXL"),
 ]
 
+# (label, lower bound inclusive, upper bound exclusive or None)
+PRICE_BUCKETS = [
+    ("0-500", 0, 500),
+    ("500-1000", 500, 1000),
+    ("1000-2500", 1000, 2500),
+    ("2500-5000", 2500, 5000),
+    ("5000+", 5000, None),
+]
+
 # ===============================
 # Coupon
 # ===============================
@@ -1,12 +1,160 @@
-import sendgrid
-from sendgrid.helpers.mail import Mail, Email
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from django.core.mail.backends.base import BaseEmailBackend
 from django.conf import settings
-from decouple import config
-import logging
+from django.utils.module_loading import import_string
 
 logger = logging.getLogger(__name__)
 
+SENDGRID_SEND_URL = "https://api.sendgrid.com/v3/mail/send"
+
+DEFAULT_SENDGRID_SETTINGS = {
+    "TRANSPORT": "core.email.SendGridHTTPTransport",
+    "MAX_WORKERS": 8,
+    # SendGrid accepts at most 1000 personalizations per request
+    "BATCH_SIZE": 1000,
+    "TIMEOUT": 10,
+}
+
+
+def sendgrid_setting(name):
+    return getattr(settings, "SENDGRID", {}).get(name, DEFAULT_SENDGRID_SETTINGS[name])
+
+
+class SendGridError(Exception):
+    """
+    SendGrid answered with a non-2xx status (e.g. 429 rate limit, 5xx).
+    """
+
+    def __init__(self, status_code, body):
+        super().__init__(f"SendGrid API failed with status {status_code}, body={body}")
+        self.status_code = status_code
+
+
+# ----------------------------
+# Transports
+# ----------------------------
+class SendGridHTTPTransport:
+    """
+    Posts v3 mail/send payloads over one keep-alive connection pool shared by the process.
+    """
+
+    def __init__(self):
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        api_key = getattr(settings, "SENDGRID_API_KEY", None)
+        if not api_key:
+            raise ValueError("SENDGRID_API_KEY is not set in environment variables.")
+
+        pool_size = sendgrid_setting("MAX_WORKERS")
+        self.session = requests.Session()
+        self.session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=pool_size))
+        self.session.headers.update({
+            "Authorization": f"Bearer {api_key}",
+            "Content-Type": "application/json",
+        })
+        self.timeout = sendgrid_setting("TIMEOUT")
+
+    def send(self, payload):
+        response = self.session.post(SENDGRID_SEND_URL, json=payload, timeout=self.timeout)
+        return response.status_code, response.text
+
+
+class FakeTransport:
+    """
+    In-memory stand-in for tests, local development and benchmarks.
+    Records every payload; `latency` simulates the API round trip.
+    """
+
+    def __init__(self, latency=0.0, status_code=202):
+        self.latency = latency
+        self.status_code = status_code
+        self.lock = threading.Lock()
+        self.payloads = []
+
+    def send(self, payload):
+        if self.latency:
+            time.sleep(self.latency)
+        with self.lock:
+            self.payloads.append(payload)
+        return self.status_code, ""
+
+    @property
+    def recipients(self):
+        with self.lock:
+            return [
+                recipient["email"]
+                for payload in self.payloads
+                for personalization in payload["personalizations"]
+                for recipient in personalization["to"]
+            ]
+
+    def reset(self):
+        with self.lock:
+            self.payloads.clear()
+
+
+@lru_cache(maxsize=None)
+def get_transport():
+    return import_string(sendgrid_setting("TRANSPORT"))()
+
+
+@lru_cache(maxsize=None)
+def get_executor():
+    return ThreadPoolExecutor(max_workers=sendgrid_setting("MAX_WORKERS"), thread_name_prefix="sendgrid")
+
+
+# ----------------------------
+# Payload building
+# ----------------------------
+def message_content(message):
+    content = [{"type": "text/plain", "value": message.body}]
+    for alternative, mimetype in getattr(message, "alternatives", []):
+        if mimetype == "text/html":
+            content.append({"type": "text/html", "value": alternative})
+    return content
+
+
+def build_batches(email_messages, from_email, batch_size):
+    """
+    Groups messages sharing subject and content into payloads with one
+    personalization per message (recipients never see each other).
+    Returns [(payload, messages_in_payload), ...].
+    """
+    groups = {}
+    for message in email_messages:
+        recipients = message.recipients()
+        if not recipients:
+            continue
+        content = message_content(message)
+        key = (message.subject, tuple((part["type"], part["value"]) for part in content))
+        group = groups.setdefault(key, {"content": content, "messages": []})
+        group["messages"].append(message)
+
+    batches = []
+    for (subject, _), group in groups.items():
+        messages = group["messages"]
+        for start in range(0, len(messages), batch_size):
+            chunk = messages[start:start + batch_size]
+            payload = {
+                "personalizations": [
+                    {"to": [{"email": address} for address in message.to]}
+                    | ({"cc": [{"email": address} for address in message.cc]} if message.cc else {})
+                    | ({"bcc": [{"email": address} for address in message.bcc]} if message.bcc else {})
+                    for message in chunk
+                ],
+                "from": {"email": from_email},
+                "subject": subject,
+                "content": group["content"],
+            }
+            batches.append((payload, chunk))
+    return batches
+
+
 # ----------------------------
 # SendGrid Email Backend
 # ----------------------------
@@ -14,6 +162,13 @@ class SendGridBackend(BaseEmailBackend):
     """
     Django email backend for SendGrid API.
 
+    Messages with the same subject and body are sent as one API request with a
+    personalization per message, and requests run concurrently on a bounded,
+    process-wide worker pool over a shared keep-alive HTTP connection pool.
+    Set SENDGRID["TRANSPORT"] to "core.email.FakeTransport" to send nothing.
+    After send_messages(), `failed_messages` lists the messages whose request
+    failed, so callers can retry just those.
+
     Usage:
         send_mail(
             "Subject",
@@ -26,14 +181,11 @@ class SendGridBackend(BaseEmailBackend):
     # ----------------------------
     # Initialization
     # ----------------------------
-    def __init__(self, **kwargs):
+    def __init__(self, transport=None, **kwargs):
         super().__init__(**kwargs)
-
-        # Load SendGrid API key from environment
-        api_key = config("SENDGRID_API_KEY", default=None)
-        if not api_key:
-            raise ValueError("SENDGRID_API_KEY is not set in environment variables.")
-        self.sg = sendgrid.SendGridAPIClient(api_key=api_key)
+        # Explicit transport, e.g. get_connection(transport=FakeTransport()); defaults to the shared one
+        self.transport = transport
+        self.failed_messages = []
 
         # Validate default sender
         self.from_email = getattr(settings, "EMAIL_FROM", None)
@@ -47,29 +199,35 @@ class SendGridBackend(BaseEmailBackend):
         """
         Sends one or more EmailMessage objects and returns the number of emails sent.
         """
-        num_sent = 0
+        self.failed_messages = []
+        batches = build_batches(email_messages, self.from_email, sendgrid_setting("BATCH_SIZE"))
+        if not batches:
+            return 0
 
-        for message in email_messages:
-            try:
-                mail = Mail(
-                    from_email=Email(self.from_email),
-                    to_emails=message.to,
-                    subject=message.subject,
-                    plain_text_content=message.body
-                )
-
-                response = self.sg.send(mail)
-
-                if 200 <= response.status_code < 300:
-                    num_sent += 1
-                else:
-                    logger.error(
-                        f"SendGrid API failed with status {response.status_code}, body={response.body}"
-                    )
+        transport = self.transport or get_transport()
+        futures = [(get_executor().submit(transport.send, payload), chunk) for payload, chunk in batches]
 
+        num_sent = 0
+        first_error = None
+        for future, chunk in futures:
+            recipients = [address for message in chunk for address in message.to]
+            try:
+                status_code, body = future.result()
             except Exception as e:
-                logger.error(f"Failed to send email to {message.to}: {str(e)}")
-                if not self.fail_silently:
-                    raise e
+                logger.error(f"Failed to send email to {recipients}: {str(e)}")
+                self.failed_messages.extend(chunk)
+                first_error = first_error or e
+                continue
+
+            if 200 <= status_code < 300:
+                num_sent += len(chunk)
+            else:
+                # Raised below unless fail_silently, so queued sends are retried
+                error = SendGridError(status_code, body)
+                logger.error(f"Failed to send email to {recipients}: {error}")
+                self.failed_messages.extend(chunk)
+                first_error = first_error or error
 
+        if first_error is not None and not self.fail_silently:
+            raise first_error
         return num_sent
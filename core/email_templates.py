@@ -0,0 +1,115 @@
+from string import Formatter
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.html import escape, linebreaks
+
+from accounts.emails import EMAIL_TEMPLATES, EMAIL_HTML_TEMPLATES
+
+
+# ----------------------------
+# Compiled Template
+# ----------------------------
+class CompiledTemplate:
+    """
+    A `str.format`-style template parsed once into literal / field segments.
+
+    `fields` is the set of context keys the template needs (see missing()).
+    Plain templates are rendered by str.format_map, at str.format speed;
+    autoescaped ones join the precomputed (literal, field) pairs, escaping each
+    value. A missing key raises ValueError naming every missing key.
+    """
+    formatter = Formatter()
+
+    def __init__(self, name, source, autoescape=False):
+        self.name = name
+        self.source = source
+        self.autoescape = autoescape
+        self.segments = []
+        self.fields = set()
+        for literal, field, format_spec, conversion in self.formatter.parse(source):
+            if field is not None and not field.isidentifier():
+                raise ImproperlyConfigured(
+                    f"Email template '{name}' uses unsupported field '{{{field}}}'; only plain names are allowed."
+                )
+            if field is not None:
+                self.fields.add(field)
+            self.segments.append((literal, field, conversion, format_spec))
+
+    def missing(self, context):
+        return self.fields - context.keys()
+
+    def render(self, context):
+        try:
+            if not self.autoescape:
+                return self.source.format_map(context)
+            convert, format_field = self.formatter.convert_field, self.formatter.format_field
+            return "".join(
+                literal if field is None
+                else literal + escape(format_field(convert(context[field], conversion), format_spec))
+                for literal, field, conversion, format_spec in self.segments
+            )
+        except KeyError:
+            missing = ", ".join(sorted(self.missing(context)))
+            raise ValueError(f"Missing context key for email template '{self.name}': {missing}") from None
+
+
+class EmailTemplate:
+    """
+    Plain-text and HTML variants of one email, compiled together.
+    Without an explicit HTML source, the HTML part is the escaped text with <p>/<br> line breaks.
+    """
+
+    def __init__(self, name, text_source, html_source=None):
+        self.name = name
+        self.text = CompiledTemplate(name, text_source)
+        self.html = CompiledTemplate(name, html_source, autoescape=True) if html_source else None
+        if self.html and self.html.fields != self.text.fields:
+            raise ImproperlyConfigured(
+                f"Email template '{name}': HTML variant fields {sorted(self.html.fields)} "
+                f"don't match the text variant fields {sorted(self.text.fields)}."
+            )
+
+    @property
+    def fields(self):
+        return self.text.fields
+
+    def render(self, context):
+        """
+        Returns (text, html) for one context.
+        """
+        text = self.text.render(context)
+        html = self.html.render(context) if self.html else linebreaks(text, autoescape=True)
+        return text, html
+
+    def render_many(self, contexts):
+        """
+        Renders one (text, html) pair per context; every context is validated
+        before anything is rendered, so a bad row fails the batch up front.
+        """
+        for index, context in enumerate(contexts):
+            missing = self.text.missing(context)
+            if missing:
+                raise ValueError(
+                    f"Missing context key for email template '{self.name}' "
+                    f"in context #{index}: {', '.join(sorted(missing))}"
+                )
+        return [self.render(context) for context in contexts]
+
+
+# ----------------------------
+# Registry (compiled at import)
+# ----------------------------
+def compile_templates(text_templates, html_templates):
+    unknown = set(html_templates) - set(text_templates)
+    if unknown:
+        raise ImproperlyConfigured(f"HTML email templates without a text variant: {', '.join(sorted(unknown))}")
+    return {
+        name: EmailTemplate(name, source, html_templates.get(name))
+        for name, source in text_templates.items()
+    }
+
+
+COMPILED_TEMPLATES = compile_templates(EMAIL_TEMPLATES, EMAIL_HTML_TEMPLATES)
+
+
+def get_email_template(name):
+    return COMPILED_TEMPLATES.get(name, COMPILED_TEMPLATES["generic"])
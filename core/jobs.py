@@ -0,0 +1,225 @@
+import logging
+import random
+import traceback
+from datetime import timedelta
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import F
+from django.utils import timezone
+from core.models import Job
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_JOB_QUEUE = {
+    "CONCURRENCY": 4,
+    "BATCH_SIZE": 20,
+    "POLL_INTERVAL": 1.0,
+    "MAX_ATTEMPTS": 5,
+    "BACKOFF_BASE": 10,
+    "BACKOFF_MAX": 60 * 60,
+    "LOCK_TIMEOUT": 10 * 60,
+    "HEARTBEAT_INTERVAL": 60,
+}
+
+
+def job_setting(name):
+    return getattr(settings, "JOB_QUEUE", {}).get(name, DEFAULT_JOB_QUEUE[name])
+
+
+class PermanentJobFailure(Exception):
+    """
+    Raised by a task when retrying can't help; the job goes straight to the dead-letter state.
+    """
+
+
+class PartialJobFailure(Exception):
+    """
+    Raised by a task that finished part of its work: retries (and the
+    dead-letter entry) run with `payload`, which describes only what is left.
+    """
+
+    def __init__(self, message, payload):
+        super().__init__(message)
+        self.payload = payload
+
+
+# ===============================
+# TASK REGISTRY
+# ===============================
+TASKS = {}
+
+
+def task(name):
+    """
+    Registers a function as a queue task. Its keyword arguments must be JSON-serializable.
+
+    Usage:
+        @task("core.send_email")
+        def send_email_task(to_email, subject, ...): ...
+    """
+    def decorator(func):
+        TASKS[name] = func
+        return func
+    return decorator
+
+
+def enqueue(name, run_at=None, max_attempts=None, **payload):
+    """
+    Adds a job to the queue. Inside a transaction the job only becomes visible
+    to workers if that transaction commits.
+    """
+    if name not in TASKS:
+        raise ValueError(f"Unknown task: {name}")
+    return Job.objects.create(
+        task=name,
+        payload=payload,
+        run_at=run_at or timezone.now(),
+        max_attempts=max_attempts or job_setting("MAX_ATTEMPTS"),
+    )
+
+
+# ===============================
+# WORKER SIDE
+# ===============================
+def heartbeat(worker_id):
+    """
+    Refreshes the lock of every job `worker_id` is running, so long jobs aren't
+    mistaken for jobs of a dead worker. Called by the worker loop every HEARTBEAT_INTERVAL.
+    """
+    return Job.objects.filter(status=Job.RUNNING, locked_by=worker_id).update(locked_at=timezone.now())
+
+
+def release_stale_jobs():
+    """
+    Handles jobs whose worker stopped heartbeating (locked longer than LOCK_TIMEOUT).
+
+    The interrupted run counts as an attempt: jobs with attempts left go back to
+    the queue, the others are moved to the dead-letter state.
+    """
+    now = timezone.now()
+    cutoff = now - timedelta(seconds=job_setting("LOCK_TIMEOUT"))
+    stale = Job.objects.filter(status=Job.RUNNING, locked_at__lt=cutoff)
+    released = {
+        "attempts": F("attempts") + 1,
+        "locked_by": "",
+        "locked_at": None,
+        "last_error": "Worker lock expired before the job finished",
+        "updated_at": now,
+    }
+    dead = stale.filter(attempts__gte=F("max_attempts") - 1).update(status=Job.DEAD, finished_at=now, **released)
+    requeued = stale.update(status=Job.PENDING, run_at=now, **released)
+    if dead:
+        logger.error(f"{dead} stale job(s) moved to dead-letter")
+    return dead + requeued
+
+
+def claim_jobs(worker_id, limit):
+    """
+    Atomically claims up to `limit` due jobs for `worker_id`.
+
+    The claim is a conditional UPDATE (status still pending), so concurrent
+    workers never get the same job, on any database backend.
+    """
+    now = timezone.now()
+    candidate_ids = list(
+        Job.objects.filter(status=Job.PENDING, run_at__lte=now)
+        .order_by("run_at")
+        .values_list("id", flat=True)[:limit]
+    )
+    if not candidate_ids:
+        return []
+    Job.objects.filter(id__in=candidate_ids, status=Job.PENDING).update(
+        status=Job.RUNNING, locked_by=worker_id, locked_at=now, updated_at=now
+    )
+    return list(Job.objects.filter(id__in=candidate_ids, status=Job.RUNNING, locked_by=worker_id, locked_at=now))
+
+
+def backoff_delay(attempts):
+    """
+    Exponential backoff with jitter: BACKOFF_BASE * 2^(attempts-1), capped at BACKOFF_MAX.
+    """
+    delay = min(job_setting("BACKOFF_BASE") * 2 ** (attempts - 1), job_setting("BACKOFF_MAX"))
+    return delay * random.uniform(0.8, 1.2)
+
+
+def run_job(job):
+    """
+    Executes one claimed job and records the outcome: succeeded, retried later or dead.
+
+    The outcome is only written while the job is still locked by this worker;
+    if the lock expired and the job was released, the result is discarded.
+    """
+    func = TASKS.get(job.task)
+    worker_id = job.locked_by
+    job.attempts += 1
+    try:
+        if func is None:
+            raise PermanentJobFailure(f"Unknown task: {job.task}")
+        func(**job.payload)
+    except Exception as e:
+        job.last_error = "".join(traceback.format_exception(e))[-4000:]
+        if isinstance(e, PartialJobFailure):
+            job.payload = e.payload
+        if isinstance(e, PermanentJobFailure) or job.attempts >= job.max_attempts:
+            job.status = Job.DEAD
+            job.finished_at = timezone.now()
+            logger.error(f"Job {job} moved to dead-letter after {job.attempts} attempt(s): {e}")
+        else:
+            job.status = Job.PENDING
+            job.run_at = timezone.now() + timedelta(seconds=backoff_delay(job.attempts))
+            logger.warning(f"Job {job} failed (attempt {job.attempts}), retrying at {job.run_at}: {e}")
+    else:
+        job.status = Job.SUCCEEDED
+        job.finished_at = timezone.now()
+        job.last_error = ""
+    finally:
+        job.locked_by = ""
+        job.locked_at = None
+        job.updated_at = timezone.now()
+        fields = ["status", "attempts", "payload", "run_at", "locked_by", "locked_at", "last_error", "finished_at", "updated_at"]
+        written = Job.objects.filter(id=job.id, status=Job.RUNNING, locked_by=worker_id).update(
+            **{field: getattr(job, field) for field in fields}
+        )
+        if not written:
+            logger.warning(f"Job {job} lost its lock before finishing; its outcome was not recorded")
+        close_old_connections()
+    return job
+
+
+def requeue(jobs):
+    """
+    Sends dead jobs back to the queue with a fresh attempt budget.
+    """
+    return jobs.filter(status=Job.DEAD).update(
+        status=Job.PENDING, attempts=0, run_at=timezone.now(), finished_at=None, updated_at=timezone.now()
+    )
+
+
+# ===============================
+# TASKS
+# ===============================
+@task("core.send_email")
+def send_email_task(to_email, subject, template_name="generic", context=None):
+    from core.utils import _send_email_sync
+
+    try:
+        _send_email_sync(to_email, subject, template_name, context)
+    except ValueError as e:
+        # Missing settings or template context won't fix themselves on retry
+        raise PermanentJobFailure(str(e))
+
+
+@task("core.send_bulk_email")
+def send_bulk_email_task(subject, template_name, recipients):
+    from core.utils import _send_bulk_email_sync
+
+    try:
+        failed = _send_bulk_email_sync(subject, template_name, [tuple(recipient) for recipient in recipients])
+    except ValueError as e:
+        raise PermanentJobFailure(str(e))
+    if failed:
+        # Only the undelivered recipients are retried, so nobody gets the email twice
+        raise PartialJobFailure(
+            f"{len(failed)}/{len(recipients)} bulk email(s) failed",
+            {"subject": subject, "template_name": template_name, "recipients": [list(recipient) for recipient in failed]},
+        )
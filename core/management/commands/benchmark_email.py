@@ -0,0 +1,44 @@
+import time
+from django.core.mail import EmailMessage
+from django.core.management.base import BaseCommand
+from django.test.utils import override_settings
+from core.email import FakeTransport, SendGridBackend, get_executor
+
+
+class Command(BaseCommand):
+    help = "Measure SendGrid backend throughput against a fake transport with simulated latency."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--messages", type=int, default=500, help="Number of messages to send.")
+        parser.add_argument("--latency", type=float, default=0.02, help="Simulated seconds per API request.")
+        parser.add_argument("--variants", type=int, default=1, help="Number of distinct subject/body pairs.")
+
+    def handle(self, *args, **options):
+        messages = [
+            EmailMessage(
+                subject=f"Benchmark {index % options['variants']}",
+                body=f"Hello from variant {index % options['variants']}",
+                to=[f"user{index}@example.com"],
+            )
+            for index in range(options["messages"])
+        ]
+
+        scenarios = [
+            ("sequential, one request per message", {"MAX_WORKERS": 1, "BATCH_SIZE": 1}),
+            ("concurrent, one request per message", {"MAX_WORKERS": 8, "BATCH_SIZE": 1}),
+            ("concurrent, batched personalizations", {"MAX_WORKERS": 8, "BATCH_SIZE": 1000}),
+        ]
+        for label, sendgrid_settings in scenarios:
+            transport = FakeTransport(latency=options["latency"])
+            with override_settings(SENDGRID={"TRANSPORT": "core.email.FakeTransport", **sendgrid_settings}):
+                get_executor.cache_clear()
+                backend = SendGridBackend(transport=transport, fail_silently=False)
+                started = time.perf_counter()
+                sent = backend.send_messages(messages)
+                elapsed = time.perf_counter() - started
+            get_executor.cache_clear()
+
+            self.stdout.write(
+                f"{label:<40} sent={sent:<6} requests={len(transport.payloads):<6} "
+                f"time={elapsed:.3f}s rate={sent / elapsed:.0f} msg/s"
+            )
@@ -0,0 +1,81 @@
+import json
+import time
+import tracemalloc
+import uuid
+from decimal import Decimal
+from django.core.management.base import BaseCommand
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from accounts.models import User
+from core.exports import ENCODERS, stream_export
+from shop.models import Address, Order
+from shop.views import ORDER_EXPORT_FIELDS
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare building an order export in memory with stream_export(), end to end, on synthetic orders "
+        "inserted into the database. The rows are created in a transaction that is rolled back afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=1_000_000, help="Number of synthetic orders.")
+        parser.add_argument("--batch-size", type=int, default=10_000, help="Rows per bulk_create batch.")
+        parser.add_argument("--file-format", default="ndjson", choices=sorted(ENCODERS), help="Streamed format.")
+        parser.add_argument("--skip-baseline", action="store_true", help="Only run the streamed export.")
+
+    def create_orders(self, count, batch_size):
+        tag = uuid.uuid4().hex[:6]
+        user = User.objects.create(email=f"bench.{tag}@example.com", username=f"bench_{tag}", is_verified=True)
+        address = Address.objects.create(
+            user=user, full_name="Bench User", phone="9000000000", address_line1="1 Main Street",
+            city="Delhi", state="Delhi", postal_code="110001",
+        )
+        for start in range(0, count, batch_size):
+            orders = []
+            for index in range(start, min(start + batch_size, count)):
+                subtotal = Decimal(index % 5000) + Decimal("0.99")
+                tax = (subtotal * Decimal("0.18")).quantize(Decimal("0.01"))
+                orders.append(Order(
+                    user=user, address=address, order_number=f"BM{tag}-{index}", status="PENDING",
+                    subtotal=subtotal, tax_amount=tax, shipping_cost=Decimal("50.00"),
+                    total_amount=subtotal + tax + Decimal("50.00"),
+                ))
+            Order.objects.bulk_create(orders)
+        return Order.objects.filter(user=user).order_by("created_at", "id")
+
+    def measure(self, label, run):
+        tracemalloc.start()
+        started = time.perf_counter()
+        size = run()
+        elapsed = time.perf_counter() - started
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        self.stdout.write(
+            f"{label:<34} bytes={size:<12} time={elapsed:.2f}s peak_memory={peak / 1024 / 1024:.1f} MiB"
+        )
+
+    def handle(self, *args, **options):
+        rows = options["rows"]
+        columns = [column for column, _ in ORDER_EXPORT_FIELDS]
+        lookups = [lookup for _, lookup in ORDER_EXPORT_FIELDS]
+
+        with transaction.atomic():
+            started = time.perf_counter()
+            queryset = self.create_orders(rows, options["batch_size"])
+            self.stdout.write(f"Inserted {rows} synthetic orders in {time.perf_counter() - started:.1f}s")
+
+            def in_memory():
+                # What a non-paginated response does: every row in a list, then one dump
+                data = [dict(zip(columns, row)) for row in queryset.values_list(*lookups)]
+                return len(json.dumps(data, cls=DjangoJSONEncoder).encode())
+
+            def streamed():
+                # The response body is consumed as the WSGI server would; bytes are counted and dropped
+                response = stream_export(queryset, ORDER_EXPORT_FIELDS, options["file_format"], "orders")
+                return sum(len(chunk) for chunk in response.streaming_content)
+
+            if not options["skip_baseline"]:
+                self.measure("in-memory list + json.dumps", in_memory)
+            self.measure(f"stream_export {options['file_format']}", streamed)
+            transaction.set_rollback(True)
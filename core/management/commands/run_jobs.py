@@ -0,0 +1,72 @@
+import signal
+import socket
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from django.core.management.base import BaseCommand
+from core.jobs import claim_jobs, heartbeat, job_setting, release_stale_jobs, run_job
+
+
+class Command(BaseCommand):
+    help = "Run background jobs from the database queue."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=job_setting("CONCURRENCY"),
+            help="Number of jobs executed in parallel.",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=job_setting("POLL_INTERVAL"),
+            help="Seconds to wait when the queue is empty.",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Drain the jobs that are due now, then exit.",
+        )
+
+    def handle(self, *args, **options):
+        concurrency = max(1, options["concurrency"])
+        worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self.stopping = False
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+
+        self.stdout.write(f"Worker {worker_id} started with concurrency {concurrency}")
+        processed = 0
+        running = set()
+        last_heartbeat = time.monotonic()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            while not self.stopping:
+                if time.monotonic() - last_heartbeat >= job_setting("HEARTBEAT_INTERVAL"):
+                    heartbeat(worker_id)
+                    last_heartbeat = time.monotonic()
+                release_stale_jobs()
+                free_slots = concurrency - len(running)
+                jobs = claim_jobs(worker_id, min(free_slots, job_setting("BATCH_SIZE"))) if free_slots else []
+                running.update(pool.submit(run_job, job) for job in jobs)
+
+                if not running:
+                    if options["once"]:
+                        break
+                    time.sleep(options["poll_interval"])
+                    continue
+
+                done, running = wait(running, timeout=options["poll_interval"], return_when=FIRST_COMPLETED)
+                processed += len(done)
+                running = set(running)
+
+            # Let in-flight jobs finish so none is left locked, heartbeating meanwhile
+            while running:
+                done, running = wait(running, timeout=job_setting("HEARTBEAT_INTERVAL"))
+                processed += len(done)
+                heartbeat(worker_id)
+
+        self.stdout.write(self.style.SUCCESS(f"Worker {worker_id} stopped after {processed} job(s)"))
+
+    def stop(self, signum, frame):
+        self.stopping = True
@@ -0,0 +1,245 @@
+import hashlib
+import os
+import logging
+from datetime import timedelta
+from functools import lru_cache
+from django.apps import apps
+from django.conf import settings
+from django.core.files.base import File
+from django.core.files.storage import default_storage
+from django.db import IntegrityError, router, transaction
+from django.db.models import Q
+from django.db.models.signals import post_save
+from django.utils import timezone
+from django.utils.module_loading import import_string
+from rest_framework import serializers
+from core.cache import invalidate_model
+from core.jobs import enqueue, job_setting, task
+from core.models import MediaAsset, MediaUpload
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MEDIA_UPLOADS = {
+    "UPLOADER": "core.media.CloudinaryUploader",
+    # Local staging area (inside default_storage) for files waiting to be uploaded
+    "STAGING_DIR": "uploads/pending",
+}
+
+
+def media_setting(name):
+    return getattr(settings, "MEDIA_UPLOADS", {}).get(name, DEFAULT_MEDIA_UPLOADS[name])
+
+
+class MediaNotReady(Exception):
+    """
+    The asset is being uploaded by another worker, or the target row isn't
+    visible yet; the job retries later.
+    """
+
+
+# ----------------------------
+# Uploaders
+# ----------------------------
+class CloudinaryUploader:
+    def upload(self, file, folder):
+        from core.cloudinary import upload_to_cloudinary
+        return upload_to_cloudinary(file, folder=folder)
+
+
+class LocalUploader:
+    """
+    Stand-in for tests and local development: copies the file to
+    `uploaded/<folder>/` in default_storage and returns its storage URL.
+    """
+
+    def upload(self, file, folder):
+        name = default_storage.save(f"uploaded/{folder}/{os.path.basename(file.name)}", file)
+        return default_storage.url(name)
+
+
+@lru_cache(maxsize=None)
+def get_uploader():
+    return import_string(media_setting("UPLOADER"))()
+
+
+# ----------------------------
+# Staging
+# ----------------------------
+def file_checksum(file):
+    digest = hashlib.sha256()
+    for chunk in file.chunks():
+        digest.update(chunk)
+    file.seek(0)
+    return digest.hexdigest()
+
+
+def stage_file(file, folder):
+    """
+    Returns the MediaAsset for `file`'s content, saving a local copy only the
+    first time that content is seen in `folder`.
+    """
+    file = file if isinstance(file, File) else File(file)
+    checksum = file_checksum(file)
+    asset = MediaAsset.objects.filter(checksum=checksum, folder=folder).first()
+    if asset is not None:
+        return asset
+
+    extension = os.path.splitext(file.name or "")[1].lower()
+    name = default_storage.save(f"{media_setting('STAGING_DIR')}/{checksum}{extension}", file)
+    try:
+        with transaction.atomic():
+            return MediaAsset.objects.create(checksum=checksum, folder=folder, file=name, size=file.size or 0)
+    except IntegrityError:
+        # Same content staged concurrently; keep the other copy
+        default_storage.delete(name)
+        return MediaAsset.objects.get(checksum=checksum, folder=folder)
+
+
+def queue_upload(instance, field, file, folder):
+    """
+    Schedules `file` to become the URL in `instance.<field>` and returns the
+    value to keep on the instance for now: the final URL when identical content
+    was uploaded before, otherwise the URL of the locally staged copy. That
+    placeholder keeps required URL fields filled and marks the row as pending
+    (see media_status()) until a worker swaps in the final URL.
+
+    Call from save() before the row is written; the job is only queued once
+    the surrounding transaction commits.
+    """
+    asset = stage_file(file, folder)
+    ready = asset.status == MediaAsset.UPLOADED
+    upload = MediaUpload.objects.create(
+        asset=asset,
+        target_model=instance._meta.label_lower,
+        target_id=str(instance.pk),
+        target_field=field,
+        status=MediaUpload.APPLIED if ready else MediaUpload.PENDING,
+    )
+    if ready:
+        return asset.url
+    transaction.on_commit(lambda: enqueue("core.upload_media", upload_id=upload.id))
+    return default_storage.url(asset.file)
+
+
+# ----------------------------
+# Status
+# ----------------------------
+MEDIA_PENDING = "pending"
+MEDIA_READY = "ready"
+
+
+@lru_cache(maxsize=None)
+def staging_url_prefix():
+    return default_storage.url(f"{media_setting('STAGING_DIR')}/")
+
+
+def media_status(value):
+    """
+    "pending" while a field still holds queue_upload()'s staged placeholder,
+    "ready" once it holds a final URL, None when it's empty.
+    """
+    if not value:
+        return None
+    return MEDIA_PENDING if value.startswith(staging_url_prefix()) else MEDIA_READY
+
+
+def pending_media_fields(instance, *fields):
+    """
+    The `fields` of `instance` that still hold a staged placeholder. Those are
+    relative storage URLs, so pass them as full_clean(exclude=...) until the
+    worker swaps in the final URL.
+    """
+    return [field for field in fields if media_status(getattr(instance, field)) == MEDIA_PENDING]
+
+
+class MediaStatusField(serializers.Field):
+    """
+    Read-only upload status of a URL field filled through queue_upload(), e.g.
+    `image_status = MediaStatusField(source="image")`. Needs no query.
+    """
+
+    def __init__(self, **kwargs):
+        kwargs["read_only"] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        return media_status(value)
+
+
+# ----------------------------
+# Worker side
+# ----------------------------
+def upload_asset(asset):
+    """
+    Pushes a staged asset to the remote store once, however many rows wait on it.
+    """
+    if asset.status == MediaAsset.UPLOADED:
+        return asset
+
+    now = timezone.now()
+    stale = now - timedelta(seconds=job_setting("LOCK_TIMEOUT"))
+    claimed = MediaAsset.objects.filter(
+        Q(status=MediaAsset.PENDING) | Q(status=MediaAsset.UPLOADING, updated_at__lt=stale),
+        id=asset.id,
+    ).update(status=MediaAsset.UPLOADING, updated_at=now)
+    if not claimed:
+        asset.refresh_from_db()
+        if asset.status == MediaAsset.UPLOADED:
+            return asset
+        raise MediaNotReady(f"Media asset {asset.id} is being uploaded by another worker")
+
+    try:
+        with default_storage.open(asset.file) as file:
+            url = get_uploader().upload(file, asset.folder)
+    except Exception:
+        MediaAsset.objects.filter(id=asset.id).update(status=MediaAsset.PENDING, updated_at=timezone.now())
+        raise
+
+    staged = asset.file
+    asset.url, asset.status, asset.file = url, MediaAsset.UPLOADED, ""
+    asset.save(update_fields=["url", "status", "file", "updated_at"])
+    default_storage.delete(staged)
+    return asset
+
+
+def apply_upload(upload):
+    """
+    Writes the asset URL into the target row unless a newer upload for the same field exists.
+    """
+    pending = MediaUpload.objects.filter(
+        target_model=upload.target_model,
+        target_id=upload.target_id,
+        target_field=upload.target_field,
+    )
+    if pending.filter(created_at__gt=upload.created_at).exclude(id=upload.id).exists():
+        upload.status = MediaUpload.SUPERSEDED
+    else:
+        model = apps.get_model(upload.target_model)
+        # Queryset update, so save() doesn't queue a second upload
+        updated = model._base_manager.filter(pk=upload.target_id).update(
+            **{upload.target_field: upload.asset.url}, updated_at=timezone.now()
+        )
+        if not updated:
+            # Queued outside a transaction and the row isn't written yet (or was deleted); retry later
+            raise MediaNotReady(f"{upload.target_model} {upload.target_id} does not exist")
+        # The update skipped save(); post_save receivers (e.g. cached socket users) still need to hear of it
+        instance = model._base_manager.get(pk=upload.target_id)
+        post_save.send(
+            sender=model, instance=instance, created=False, raw=False,
+            using=router.db_for_write(model), update_fields=frozenset([upload.target_field, "updated_at"]),
+        )
+        transaction.on_commit(lambda: invalidate_model(model))
+        upload.status = MediaUpload.APPLIED
+    upload.save(update_fields=["status", "updated_at"])
+    return upload
+
+
+@task("core.upload_media")
+def upload_media_task(upload_id):
+    upload = MediaUpload.objects.select_related("asset").filter(id=upload_id).first()
+    if upload is None or upload.status != MediaUpload.PENDING:
+        return
+    upload_asset(upload.asset)
+    with transaction.atomic():
+        apply_upload(upload)
+    logger.info(f"Media upload {upload} applied")
@@ -0,0 +1,47 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MediaAsset',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('checksum', models.CharField(max_length=64)),
+                ('folder', models.CharField(max_length=255)),
+                ('file', models.CharField(blank=True, max_length=500)),
+                ('size', models.PositiveBigIntegerField(default=0)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('uploading', 'Uploading'), ('uploaded', 'Uploaded')], default='pending', max_length=20)),
+                ('url', models.URLField(blank=True, max_length=500)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'core_media_assets',
+                'constraints': [models.UniqueConstraint(fields=('checksum', 'folder'), name='unique_media_asset')],
+            },
+        ),
+        migrations.CreateModel(
+            name='MediaUpload',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('target_model', models.CharField(max_length=100)),
+                ('target_id', models.CharField(max_length=64)),
+                ('target_field', models.CharField(max_length=100)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('applied', 'Applied'), ('superseded', 'Superseded')], default='pending', max_length=20)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('asset', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='uploads', to='core.mediaasset')),
+            ],
+            options={
+                'db_table': 'core_media_uploads',
+                'indexes': [models.Index(fields=['target_model', 'target_id', 'target_field'], name='core_media__target__ac6edf_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,121 @@
+import hashlib
+from django.db.models import Count, Max
+from django.utils.http import http_date, parse_etags, parse_http_date_safe, quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+
+
+class NotModified(Exception):
+    """
+    Raised from ConditionalGetMixin.initial() to short-circuit the handler with a 304.
+    """
+
+
+# ===============================
+# CONDITIONAL GET
+# ===============================
+class ConditionalGetMixin:
+    """
+    Weak ETag / Last-Modified validators for DRF viewsets, driven by BaseModel.updated_at.
+
+    For `retrieve` the validators come from the object's `updated_at`; for `list`
+    from one `MAX(updated_at), COUNT(*)` aggregate over the filtered queryset, so
+    additions, edits and removals all change them. `conditional_related` names
+    relations (e.g. "variants") whose rows are part of the representation; their
+    newest `updated_at` and count are folded in as well.
+
+    A removal changes a count but not any timestamp, so validators that include
+    counts come with no Last-Modified: those responses are only validated by
+    their ETag, and If-Modified-Since is ignored for them.
+
+    Matching If-None-Match / If-Modified-Since requests are answered with
+    304 Not Modified after authentication and permission checks but before any
+    serialization happens.
+    """
+    conditional_actions = ("list", "retrieve")
+    conditional_related = ()
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self.conditional_validators = None
+        if request.method in ("GET", "HEAD") and getattr(self, "action", None) in self.conditional_actions:
+            self.conditional_validators = self.get_conditional_validators(request)
+            if self.is_not_modified(request, *self.conditional_validators):
+                raise NotModified()
+
+    def handle_exception(self, exc):
+        if isinstance(exc, NotModified):
+            return Response(status=status.HTTP_304_NOT_MODIFIED)
+        return super().handle_exception(exc)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        validators = getattr(self, "conditional_validators", None)
+        if validators and response.status_code in (status.HTTP_200_OK, status.HTTP_304_NOT_MODIFIED):
+            etag, last_modified = validators
+            response["ETag"] = etag
+            if last_modified is not None:
+                response["Last-Modified"] = http_date(last_modified.timestamp())
+        return response
+
+    def get_object(self, *args, **kwargs):
+        # retrieve() reuses the object already loaded for the validators
+        obj = getattr(self, "conditional_object", None)
+        if obj is not None and not args and not kwargs:
+            return obj
+        return super().get_object(*args, **kwargs)
+
+    # ----------------------------
+    # Validators
+    # ----------------------------
+    def get_conditional_validators(self, request):
+        """
+        Returns (etag, last_modified); override for views without a regular queryset.
+        last_modified must be None unless the ETag is derived from timestamps only.
+        """
+        if self.action == "retrieve":
+            self.conditional_object = self.get_object()
+            return self.object_validators(self.conditional_object)
+        return self.queryset_validators(self.filter_queryset(self.get_queryset()))
+
+    def object_validators(self, obj):
+        parts = [obj._meta.label_lower, obj.pk, obj.updated_at]
+        if not self.conditional_related:
+            return self.make_etag(*parts), obj.updated_at
+        related = type(obj)._base_manager.filter(pk=obj.pk).aggregate(**self.related_aggregates())
+        return self.make_etag(*parts, *related.values()), None
+
+    def queryset_validators(self, queryset):
+        aggregates = {"last_modified": Max("updated_at"), "count": Count("pk", distinct=True)}
+        aggregates.update(self.related_aggregates())
+        values = queryset.order_by().aggregate(**aggregates)
+        return self.make_etag(queryset.model._meta.label_lower, *values.values()), None
+
+    def related_aggregates(self):
+        aggregates = {}
+        for relation in self.conditional_related:
+            aggregates[f"{relation}_last_modified"] = Max(f"{relation}__updated_at")
+            aggregates[f"{relation}_count"] = Count(f"{relation}__pk", distinct=True)
+        return aggregates
+
+    def make_etag(self, *parts):
+        # Representations can differ per user (filters, ownership), so the user is part of the tag
+        user = getattr(self.request, "user", None)
+        scope = str(user.pk) if user is not None and user.is_authenticated else "anon"
+        raw = "|".join(str(part) for part in (self.request.get_full_path(), scope, *parts))
+        return f'W/{quote_etag(hashlib.sha1(raw.encode()).hexdigest())}'
+
+    @staticmethod
+    def is_not_modified(request, etag, last_modified):
+        if_none_match = request.headers.get("If-None-Match")
+        if if_none_match:
+            if if_none_match.strip() == "*":
+                return True
+            # Weak comparison: W/"x" and "x" match
+            candidates = {tag.removeprefix("W/") for tag in parse_etags(if_none_match)}
+            return etag.removeprefix("W/") in candidates
+
+        if_modified_since = parse_http_date_safe(request.headers.get("If-Modified-Since", ""))
+        if if_modified_since is not None and last_modified is not None:
+            return int(last_modified.timestamp()) <= if_modified_since
+        return False
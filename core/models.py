@@ -1,6 +1,7 @@
 import uuid
-from django.db import models
+from django.db import models, transaction
 from django.utils import timezone
+from core.cache import invalidate_model
 
 # ===============================
 # SOFT DELETE MANAGER
@@ -28,6 +29,15 @@ class BaseModel(models.Model):
     # ----------------------------
     # Methods
     # ----------------------------
+    def save(self, *args, **kwargs):
+        # Partial saves still bump updated_at, which conditional GETs (core.mixins) rely on
+        if kwargs.get('update_fields') is not None:
+            kwargs['update_fields'] = {*kwargs['update_fields'], 'updated_at'}
+        super().save(*args, **kwargs)
+        # Cached responses tagged with this model (core.cache) go stale once the write commits
+        model = type(self)
+        transaction.on_commit(lambda: invalidate_model(model))
+
     def soft_delete(self):
         self.is_active = False
         self.deleted_at = timezone.now()
@@ -41,5 +51,114 @@ class BaseModel(models.Model):
     def delete(self, hard=False, *args, **kwargs):
         if hard:
             super().delete(*args, **kwargs)
+            model = type(self)
+            transaction.on_commit(lambda: invalidate_model(model))
         else:
             self.soft_delete()
+
+
+# ===============================
+# BACKGROUND JOB
+# ===============================
+class Job(models.Model):
+    """
+    Row in the durable background queue (see core.jobs). Claimed by `run_jobs` workers.
+    """
+    PENDING = "pending"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    DEAD = "dead"
+    STATUS_CHOICES = [
+        (PENDING, "Pending"),
+        (RUNNING, "Running"),
+        (SUCCEEDED, "Succeeded"),
+        (DEAD, "Dead"),
+    ]
+
+    task = models.CharField(max_length=100)
+    payload = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=5)
+    run_at = models.DateTimeField(default=timezone.now)
+    locked_by = models.CharField(max_length=100, blank=True)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'core_jobs'
+        ordering = ['run_at']
+        indexes = [
+            models.Index(fields=['status', 'run_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.task} #{self.pk} ({self.status})"
+
+
+class MediaAsset(models.Model):
+    """
+    One uploaded file, deduplicated by content hash per folder (see core.media).
+    Kept in local storage until a worker has pushed it to the remote store.
+    """
+    PENDING = "pending"
+    UPLOADING = "uploading"
+    UPLOADED = "uploaded"
+    STATUS_CHOICES = [
+        (PENDING, "Pending"),
+        (UPLOADING, "Uploading"),
+        (UPLOADED, "Uploaded"),
+    ]
+
+    checksum = models.CharField(max_length=64)
+    folder = models.CharField(max_length=255)
+    file = models.CharField(max_length=500, blank=True)
+    size = models.PositiveBigIntegerField(default=0)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=PENDING)
+    url = models.URLField(max_length=500, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'core_media_assets'
+        constraints = [
+            models.UniqueConstraint(fields=['checksum', 'folder'], name='unique_media_asset'),
+        ]
+
+    def __str__(self):
+        return f"{self.folder}/{self.checksum[:12]} ({self.status})"
+
+
+class MediaUpload(models.Model):
+    """
+    A request to put an asset's URL into `target_field` of one model row.
+    The newest upload per target wins; older ones are marked superseded.
+    """
+    PENDING = "pending"
+    APPLIED = "applied"
+    SUPERSEDED = "superseded"
+    STATUS_CHOICES = [
+        (PENDING, "Pending"),
+        (APPLIED, "Applied"),
+        (SUPERSEDED, "Superseded"),
+    ]
+
+    asset = models.ForeignKey(MediaAsset, on_delete=models.CASCADE, related_name="uploads")
+    target_model = models.CharField(max_length=100)
+    target_id = models.CharField(max_length=64)
+    target_field = models.CharField(max_length=100)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=PENDING)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'core_media_uploads'
+        indexes = [
+            models.Index(fields=['target_model', 'target_id', 'target_field']),
+        ]
+
+    def __str__(self):
+        return f"{self.target_model}:{self.target_id}.{self.target_field} ({self.status})"
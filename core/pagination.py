@@ -0,0 +1,175 @@
+import base64
+import binascii
+import json
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param, remove_query_param
+
+# ===============================
+# KEYSET (CURSOR) PAGINATION
+# ===============================
+class KeysetPagination(BasePagination):
+    """
+    Keyset pagination over (created_at, id), newest first.
+
+    Pages are fetched with `WHERE (created_at, id) < (cursor)` instead of
+    OFFSET, and the total COUNT(*) is only issued when the client asks for it
+    with `?count=true`, so deep pages cost the same as the first one.
+    Cursors are opaque base64 tokens; clients should only follow the
+    `next` / `previous` links.
+
+    A client-supplied `?ordering=` can't be served by the keyset, so those
+    requests fall back to page-number pagination.
+    """
+    page_size = api_settings.PAGE_SIZE or 10
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    cursor_query_param = "cursor"
+    count_query_param = "count"
+    keyset_fields = ("created_at", "id")
+    descending = True
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.fallback = None
+        if request.query_params.get(api_settings.ORDERING_PARAM):
+            self.fallback = PageNumberPagination()
+            return self.fallback.paginate_queryset(queryset, request, view)
+
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        cursor = self.decode_cursor(request, queryset.model)
+        self.count = queryset.count() if self.wants_count(request) else None
+
+        reverse = bool(cursor and cursor["reverse"])
+        # Walking backwards flips both the comparison and the sort direction
+        descending = self.descending != reverse
+        prefix = "-" if descending else ""
+        queryset = queryset.order_by(*[f"{prefix}{field}" for field in self.keyset_fields])
+        if cursor:
+            queryset = queryset.filter(self.keyset_filter(cursor["position"], descending))
+
+        return self.build_page(list(queryset[:self.page_size + 1]), cursor)
+
+    def build_page(self, rows, cursor):
+        """
+        Trims the up to page_size + 1 rows read past `cursor` to one page in
+        display order and records which links the page gets.
+        """
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if cursor and cursor["reverse"]:
+            rows.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, cursor is not None
+
+        self.page = rows
+        return rows
+
+    def get_paginated_response(self, data):
+        if self.fallback is not None:
+            return self.fallback.get_paginated_response(data)
+
+        response = {
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+            "results": data,
+        }
+        if self.count is not None:
+            response = {"count": self.count, **response}
+        return Response(response)
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "count": {"type": "integer", "example": 123},
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    # ----------------------------
+    # Helpers
+    # ----------------------------
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def wants_count(self, request):
+        return request.query_params.get(self.count_query_param, "").lower() in ("1", "true", "yes")
+
+    def keyset_filter(self, position, descending):
+        """
+        Builds (a < x) OR (a = x AND b < y) ... for the keyset fields.
+        """
+        lookup = "lt" if descending else "gt"
+        condition = Q()
+        for index, field in enumerate(self.keyset_fields):
+            clause = Q(**{f"{field}__{lookup}": position[index]})
+            for previous_field, value in zip(self.keyset_fields[:index], position[:index]):
+                clause &= Q(**{previous_field: value})
+            condition |= clause
+        return condition
+
+    def get_position(self, instance):
+        values = []
+        for field in self.keyset_fields:
+            value = getattr(instance, field)
+            values.append(value.isoformat() if hasattr(value, "isoformat") else str(value))
+        return values
+
+    def encode_cursor(self, instance, reverse):
+        payload = json.dumps({"p": self.get_position(instance), "r": reverse}, separators=(",", ":"))
+        token = base64.urlsafe_b64encode(payload.encode()).decode()
+        return replace_query_param(self.base_url, self.cursor_query_param, token)
+
+    def decode_cursor(self, request, model):
+        """
+        Returns {"position": [...], "reverse": bool} with each position value
+        parsed by its keyset field, or None without a cursor. Anything that
+        isn't a cursor this paginator issued raises NotFound.
+        """
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(token.encode()).decode())
+            position = payload["p"]
+            reverse = bool(payload.get("r", False))
+        except (binascii.Error, UnicodeDecodeError, ValueError, KeyError, TypeError):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(position, list) or len(position) != len(self.keyset_fields):
+            raise NotFound(self.invalid_cursor_message)
+        try:
+            position = [
+                model._meta.get_field(field).to_python(value)
+                for field, value in zip(self.keyset_fields, position)
+            ]
+        except (ValidationError, ValueError, TypeError, AttributeError):
+            raise NotFound(self.invalid_cursor_message)
+        if any(value is None or isinstance(value, (list, dict)) for value in position):
+            raise NotFound(self.invalid_cursor_message)
+        return {"position": position, "reverse": reverse}
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.page[0], reverse=True)
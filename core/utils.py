@@ -1,12 +1,11 @@
 import secrets
 import hashlib
 from datetime import timedelta
-from threading import Thread
 import logging
 from smtplib import SMTPException
 
 from django.utils import timezone
-from django.core.mail import send_mail
+from django.core.mail import EmailMultiAlternatives, get_connection
 from django.conf import settings
 
 from rest_framework import status
@@ -15,7 +14,7 @@ from rest_framework import serializers
 
 from typing import Optional, Union
 
-from accounts.emails import EMAIL_TEMPLATES
+from core.email_templates import get_email_template
 
 logger = logging.getLogger(__name__)
 
@@ -75,40 +74,109 @@ def _send_email_sync(to_email: str, subject: str, template_name: str = "generic"
     if not from_email:
         raise ValueError("EMAIL_FROM is not configured in settings.")
 
-    template = EMAIL_TEMPLATES.get(template_name, EMAIL_TEMPLATES["generic"])
-    context = context or {}
-    
-    try:
-        message = template.format(**context)
-    except KeyError as e:
-        raise ValueError(f"Missing context key for email template: {e}")
+    text, html = get_email_template(template_name).render(context or {})
+    message = EmailMultiAlternatives(subject, text, from_email, [to_email])
+    message.attach_alternative(html, "text/html")
 
     try:
-        send_mail(subject, message, from_email, [to_email], fail_silently=False)
+        message.send(fail_silently=False)
         logger.info(f"Email sent to {to_email}")
     except SMTPException as e:
         logger.error(f"Failed to send email to {to_email}: {e}")
         raise Exception("Failed to send email.")
 
 # ----------------------------
-# Asynchronous Template-based Email Sender
+# Synchronous Bulk Email Sender
+# ----------------------------
+def _send_bulk_email_sync(subject: str, template_name: str, recipients: list):
+    """
+    Renders one message per (email, context) pair with the precompiled template
+    and sends them over a single backend connection. Returns the (email, context)
+    pairs that weren't delivered, when the backend reports them (failed_messages);
+    otherwise a failure is raised for the whole list.
+    """
+    from_email = getattr(settings, "EMAIL_FROM", None)
+    if not from_email:
+        raise ValueError("EMAIL_FROM is not configured in settings.")
+
+    rendered = get_email_template(template_name).render_many([context for _, context in recipients])
+    messages = []
+    for (to_email, _), (text, html) in zip(recipients, rendered):
+        message = EmailMultiAlternatives(subject, text, from_email, [to_email])
+        message.attach_alternative(html, "text/html")
+        messages.append(message)
+
+    connection = get_connection(fail_silently=False)
+    try:
+        sent = connection.send_messages(messages)
+    except Exception:
+        failed_messages = getattr(connection, "failed_messages", None)
+        if not failed_messages:
+            raise
+        failed_ids = {id(message) for message in failed_messages}
+        failed = [recipient for recipient, message in zip(recipients, messages) if id(message) in failed_ids]
+        logger.warning(
+            f"Bulk email '{template_name}' sent to {len(messages) - len(failed)}/{len(messages)} recipients"
+        )
+        return failed
+
+    logger.info(f"Bulk email '{template_name}' sent to {sent}/{len(messages)} recipients")
+    return []
+
+# ----------------------------
+# Queued Template-based Email Sender
 # ----------------------------
 def send_email(to_email: str, subject: str, template_name: str = "generic", context: dict = None):
     """
-    Public function to send an email asynchronously using a thread.
+    Public function to send an email in the background through the job queue
+    (core.jobs); delivered by `manage.py run_jobs` with retries.
     Usage examples:
         send_email("user@example.com", "Welcome!", "welcome", {"username": "John"})
         send_email("user@example.com", "Reset Password", "reset_password", {"username": "John", "reset_link": "link"})
     """
-    Thread(
-        target=_send_email_sync,
-        args=(to_email, subject, template_name, context),
-        daemon=True
-    ).start()
+    from core.jobs import enqueue
+
+    return enqueue(
+        "core.send_email",
+        to_email=to_email,
+        subject=subject,
+        template_name=template_name,
+        context=context or {},
+    )
+
+
+def send_bulk_email(subject: str, template_name: str, recipients: list, chunk_size: int = 500):
+    """
+    Queues a campaign-style send: `recipients` is a list of (email, context) pairs.
+    Contexts are validated against the template now; delivery happens in
+    background jobs of `chunk_size` recipients each.
+    Usage:
+        send_bulk_email("News", "generic", [("a@example.com", {"username": "A", "message": "Hi"})])
+    """
+    from core.jobs import enqueue
+
+    template = get_email_template(template_name)
+    for index, (_, context) in enumerate(recipients):
+        missing = template.text.missing(context)
+        if missing:
+            raise ValueError(f"Missing context key for email template in recipient #{index}: {', '.join(sorted(missing))}")
+
+    return [
+        enqueue(
+            "core.send_bulk_email",
+            subject=subject,
+            template_name=template_name,
+            recipients=[[to_email, context] for to_email, context in recipients[start:start + chunk_size]],
+        )
+        for start in range(0, len(recipients), chunk_size)
+    ]
 
 import uuid
 from django.utils.text import slugify
-from django.db.models import Model
+from django.db.models import Model, F
+from django.db.models.functions import Greatest
+from django.db import transaction
+from core.cache import invalidate_model
 
 def generate_unique_slug(instance: Model, field: str, slug_field: str = "slug", length: int = 8) -> str:
     """
@@ -131,3 +199,26 @@ def generate_unique_slug(instance: Model, field: str, slug_field: str = "slug",
         new_slug = f"{base_slug}-{str(uuid.uuid4())[:length]}"
 
     return new_slug
+
+def adjust_counters(model: type[Model], pk, **deltas: int) -> None:
+    """
+    Atomically adjusts denormalized counter columns on a single row using F() expressions.
+
+    Decrements are clamped at zero so a drifted counter never goes negative.
+    The row's updated_at is bumped too, so ETags and cached responses follow.
+    Loaded instances are not refreshed; call refresh_from_db() if the new
+    values are needed.
+
+    Usage:
+        adjust_counters(Post, post.id, likes_count=1)
+        adjust_counters(Comment, comment.id, likes_count=-1, replies_count=-1)
+    """
+    updates = {
+        field: Greatest(F(field) + delta, 0) if delta < 0 else F(field) + delta
+        for field, delta in deltas.items()
+        if delta
+    }
+    if updates:
+        model._base_manager.filter(pk=pk).update(**updates, updated_at=timezone.now())
+        transaction.on_commit(lambda: invalidate_model(model))
+
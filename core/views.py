@@ -1,6 +1,10 @@
 # core/views.py
 from django.shortcuts import render
 from django.urls import get_resolver
+from rest_framework.views import APIView
+from core.cache import metrics
+from core.permissions import IsAdminOrSuperAdmin
+from core.utils import api_response
 
 def api_root(request):
     """
@@ -20,3 +24,13 @@ def api_root(request):
         "apps": api_namespaces
     }
     return render(request, "core/api_root.html", context)
+
+
+class ResponseCacheMetricsView(APIView):
+    """
+    Hit/miss counters of the response cache for this process.
+    """
+    permission_classes = [IsAdminOrSuperAdmin]
+
+    def get(self, request):
+        return api_response(True, "Response cache metrics fetched successfully.", metrics.snapshot())
@@ -40,11 +40,14 @@ INSTALLED_APPS = [
     "channels",
 
     # Local apps
+    "core",
     "accounts",
     "todo",
     "social",
     "shop",
-    "chat"
+    "chat",
+    "public",
+    "seed",
 ]
 
 # ----------------------------
@@ -76,6 +79,7 @@ MIDDLEWARE = [
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "accounts.middleware.UserSessionActivityMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
@@ -163,9 +167,15 @@ TEMPLATES = [
 # ----------------------------
 # EMAIL SETTINGS (SENDGRID)
 # ----------------------------
-EMAIL_BACKEND = config("EMAIL_BACKEND", default="core.emails.SendGridBackend")
+EMAIL_BACKEND = config("EMAIL_BACKEND", default="core.email.SendGridBackend")
 SENDGRID_API_KEY = config("SENDGRID_API_KEY")
 EMAIL_FROM = config("EMAIL_FROM")
+SENDGRID = {
+    "TRANSPORT": config("SENDGRID_TRANSPORT", default="core.email.SendGridHTTPTransport"),
+    "MAX_WORKERS": 8,
+    "BATCH_SIZE": 1000,
+    "TIMEOUT": 10,
+}
 
 # ----------------------------
 # FRONTEND URL
@@ -198,6 +208,13 @@ CLOUDINARY_CLOUD_NAME = config("CLOUDINARY_CLOUD_NAME")
 CLOUDINARY_API_KEY = config("CLOUDINARY_API_KEY")
 CLOUDINARY_API_SECRET = config("CLOUDINARY_API_SECRET")
 
+# Uploads are staged in MEDIA_ROOT and pushed by `run_jobs` (core.media);
+# set MEDIA_UPLOADER=core.media.LocalUploader to keep everything local
+MEDIA_UPLOADS = {
+    "UPLOADER": config("MEDIA_UPLOADER", default="core.media.CloudinaryUploader"),
+    "STAGING_DIR": "uploads/pending",
+}
+
 # ----------------------------
 # PAYMENT SECRETS
 # ----------------------------
@@ -240,6 +257,80 @@ CHANNEL_LAYERS = {
     },
 }
 
+# WebSocket JWT user cache (chat.middleware); user changes are broadcast
+# through the response cache backend (core.cache), so share it between workers
+CHAT_AUTH_CACHE = {
+    "TTL": 60,
+    "MAX_SIZE": 10000,
+}
+
+# Write-behind chat message persistence (chat.writer)
+CHAT_MESSAGE_WRITER = {
+    "FLUSH_INTERVAL": 0.05,
+    "BATCH_SIZE": 200,
+    "MAX_PENDING": 5000,
+}
+
+# ----------------------------
+# SOCIAL TIMELINE (FEED FAN-OUT)
+# ----------------------------
+SOCIAL_TIMELINE = {
+    "BACKEND": config("SOCIAL_TIMELINE_BACKEND", default="social.timeline.DatabaseTimelineBackend"),
+    "FANOUT_FOLLOWER_LIMIT": config("SOCIAL_TIMELINE_FANOUT_FOLLOWER_LIMIT", default=5000, cast=int),
+    "MAX_LENGTH": 800,
+    "REDIS_URL": config("SOCIAL_TIMELINE_REDIS_URL", default="redis://localhost:6379/1"),
+}
+
+# ----------------------------
+# RESPONSE CACHE
+# ----------------------------
+# Shared by every worker through the Redis instance that already backs CHANNEL_LAYERS
+# (its own database number). Without RESPONSE_CACHE_BACKEND the cache uses
+# RESPONSE_CACHE_REDIS_URL, then a shared CACHES["default"], and only then
+# core.cache.LocMemLRUBackend; set RESPONSE_CACHE_REDIS_URL= (empty) to get there.
+# LocMem is single-process only: invalidations would not reach other workers.
+RESPONSE_CACHE = {
+    "BACKEND": config("RESPONSE_CACHE_BACKEND", default=None),
+    "OPTIONS": {},
+    "REDIS_URL": config("RESPONSE_CACHE_REDIS_URL", default="redis://localhost:6379/2"),
+    "TIMEOUT": config("RESPONSE_CACHE_TIMEOUT", default=300, cast=int),
+    "KEY_PREFIX": "rc",
+}
+
+# ----------------------------
+# BACKGROUND JOB QUEUE
+# ----------------------------
+# Jobs (e.g. emails) are stored in core_jobs and executed by `manage.py run_jobs`
+JOB_QUEUE = {
+    "CONCURRENCY": config("JOB_QUEUE_CONCURRENCY", default=4, cast=int),
+    "BATCH_SIZE": 20,
+    "POLL_INTERVAL": 1.0,
+    "MAX_ATTEMPTS": 5,
+    "BACKOFF_BASE": 10,
+    "BACKOFF_MAX": 60 * 60,
+    # Running jobs refresh their lock every HEARTBEAT_INTERVAL; a lock older than
+    # LOCK_TIMEOUT means the worker died and the job is released
+    "LOCK_TIMEOUT": 10 * 60,
+    "HEARTBEAT_INTERVAL": 60,
+}
+
+# ----------------------------
+# PUBLIC DATASETS
+# ----------------------------
+# data/*.json served read-only from memory by the public app
+PUBLIC_DATASETS = {
+    "DIR": os.path.join(BASE_DIR, "data"),
+    "PRELOAD": config("PUBLIC_DATASETS_PRELOAD", default=True, cast=bool),
+    "AUTO_RELOAD": DEBUG,
+}
+
+# ----------------------------
+# USER SESSIONS
+# ----------------------------
+# UserSession.last_activity is refreshed at most this often (seconds);
+# expired registry rows are removed by `manage.py cleanup_sessions`
+SESSION_ACTIVITY_INTERVAL = 60
+
 # ----------------------------
 # PASSWORD VALIDATORS
 # ----------------------------
@@ -7,6 +7,7 @@ from drf_spectacular.views import (
 )
 from django.conf import settings
 from django.conf.urls.static import static
+from core.views import ResponseCacheMetricsView
 
 urlpatterns = [
     path("admin/", admin.site.urls),
@@ -22,6 +23,11 @@ urlpatterns = [
     path("api/v1/social/", include(("social.urls", "social"), namespace="social")),
     path("api/v1/shop/", include(("shop.urls", "shop"), namespace="shop")),
     path("api/v1/chat/", include(("chat.urls", "chat"), namespace="chat")),
+    path("api/v1/public/", include(("public.urls", "public"), namespace="public")),
+    path("api/v1/seed/", include(("seed.urls", "seed"), namespace="seed")),
+
+    # Ops
+    path("api/v1/cache/metrics/", ResponseCacheMetricsView.as_view(), name="response-cache-metrics"),
 ]
 
 urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
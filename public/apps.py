@@ -0,0 +1,12 @@
+from django.apps import AppConfig
+
+
+class PublicConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'public'
+
+    def ready(self):
+        # Parse and index every dataset once per process instead of on the first request
+        from public.datasets import dataset_setting, load_datasets
+        if dataset_setting("PRELOAD"):
+            load_datasets()
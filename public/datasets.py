@@ -0,0 +1,256 @@
+import json
+import os
+import random
+import re
+import threading
+from array import array
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Callable, Optional
+from django.conf import settings
+
+DEFAULT_PUBLIC_DATASETS = {
+    "DIR": os.path.join(settings.BASE_DIR, "data"),
+    # Parse every dataset in AppConfig.ready() instead of on first access
+    "PRELOAD": True,
+    # Re-read a dataset whose file changed on disk (one os.stat per access)
+    "AUTO_RELOAD": False,
+}
+
+
+def dataset_setting(name):
+    return getattr(settings, "PUBLIC_DATASETS", {}).get(name, DEFAULT_PUBLIC_DATASETS[name])
+
+
+TOKEN_RE = re.compile(r"\w+")
+
+# Same output as DRF's JSONRenderer defaults (compact, UTF-8)
+encode_json = partial(json.dumps, ensure_ascii=False, separators=(",", ":"))
+
+
+def tokenize(text):
+    return TOKEN_RE.findall(text.lower())
+
+
+def resolve(record, path):
+    """
+    Values at a dotted path; lists along the way are flattened ("items.snippet.title").
+    """
+    values = [record]
+    for key in path.split("."):
+        found = []
+        for value in values:
+            if isinstance(value, list):
+                found.extend(item.get(key) for item in value if isinstance(item, dict))
+            elif isinstance(value, dict):
+                found.append(value.get(key))
+        values = [value for value in found if value is not None]
+    flat = []
+    for value in values:
+        flat.extend(value if isinstance(value, list) else [value])
+    return flat
+
+
+# ----------------------------
+# Dataset specs
+# ----------------------------
+@dataclass(frozen=True)
+class DatasetSpec:
+    file: str
+    id_field: str = "id"
+    search_fields: tuple = ()
+    # Turns the parsed JSON file into a list of records; defaults to the file itself
+    extract: Optional[Callable] = None
+
+
+DATASETS = {
+    "books": DatasetSpec(
+        "randombook.json",
+        search_fields=("volumeInfo.title", "volumeInfo.subtitle", "volumeInfo.authors", "volumeInfo.publisher", "volumeInfo.categories"),
+    ),
+    "cats": DatasetSpec("randomcat.json", search_fields=("name", "origin", "temperament")),
+    "dogs": DatasetSpec("randomdog.json", search_fields=("name", "breed_group", "bred_for", "temperament", "origin")),
+    "jokes": DatasetSpec("randomjoke.json", search_fields=("content", "categories")),
+    "meals": DatasetSpec("randommeal.json", id_field="idMeal", search_fields=("strMeal", "strCategory", "strArea", "strTags")),
+    "products": DatasetSpec("randomproduct.json", search_fields=("title", "description", "brand", "category")),
+    "quotes": DatasetSpec("randomquotes.json", search_fields=("content", "author", "tags")),
+    "stocks": DatasetSpec("randomstock.json", id_field="Symbol", search_fields=("Name", "Symbol", "ISIN")),
+    "users": DatasetSpec(
+        "randomuser.json",
+        search_fields=("name.first", "name.last", "email", "login.username", "location.city", "location.country"),
+    ),
+    "status-codes": DatasetSpec(
+        "status-codes.json",
+        id_field="status_code",
+        search_fields=("phrase", "description", "category"),
+        extract=lambda raw: [entry for group in raw.values() for entry in group.values()],
+    ),
+    "youtube-channel": DatasetSpec(
+        "randomchannel.json",
+        id_field="info.id",
+        search_fields=("info.snippet.title",),
+        extract=lambda raw: [raw["channel"]],
+    ),
+    "youtube-playlists": DatasetSpec("randomplaylist.json", search_fields=("snippet.title", "snippet.description")),
+    "youtube-playlist-items": DatasetSpec("randomplaylistitem.json", search_fields=("snippet.title", "snippet.description")),
+    "youtube-videos": DatasetSpec(
+        "randomvideo.json",
+        search_fields=("snippet.title", "snippet.tags"),
+        extract=lambda raw: [entry["items"] for entry in raw["channelVideos"]],
+    ),
+    "youtube-comments": DatasetSpec(
+        "randomcomments.json",
+        id_field="videoId",
+        search_fields=("items.snippet.topLevelComment.snippet.textOriginal",),
+        extract=lambda raw: [{"videoId": video_id, **thread} for video_id, thread in raw.items()],
+    ),
+}
+
+
+# ----------------------------
+# In-memory dataset
+# ----------------------------
+@dataclass
+class Dataset:
+    """
+    One dataset held in memory, in file order: an id -> position map, an
+    inverted index (token -> sorted positions) over `search_fields`, and the
+    records JSON-encoded once into `blob` (joined by ",") with `offsets[i]` the
+    byte where record i starts, so any run of consecutive records is a single
+    slice of already-encoded JSON. The parsed records are not kept.
+    `bodies` caches finished response bodies (see public.responses).
+    """
+    name: str
+    size: int
+    ids: dict = field(default_factory=dict)
+    postings: dict = field(default_factory=dict)
+    vocabulary: list = field(default_factory=list)
+    signature: tuple = ()
+    blob: bytes = b""
+    offsets: array = field(default_factory=lambda: array("Q"))
+    bodies: dict = field(default_factory=dict)
+
+    @classmethod
+    def build(cls, name, spec, records, signature=()):
+        dataset = cls(name=name, size=len(records), signature=signature)
+        encoded = [encode_json(record).encode() for record in records]
+        offset = 0
+        for chunk in encoded:
+            dataset.offsets.append(offset)
+            offset += len(chunk) + 1
+        dataset.blob = b",".join(encoded)
+
+        postings = {}
+        for position, record in enumerate(records):
+            key = resolve(record, spec.id_field)
+            if key:
+                # Duplicate ids: the first record wins, as with a lookup by scan
+                dataset.ids.setdefault(str(key[0]), position)
+            tokens = set()
+            for path in spec.search_fields:
+                for value in resolve(record, path):
+                    tokens.update(tokenize(str(value)))
+            for token in tokens:
+                postings.setdefault(token, array("I")).append(position)
+        dataset.postings = postings
+        dataset.vocabulary = sorted(postings)
+        return dataset
+
+    def __len__(self):
+        return self.size
+
+    def random_position(self):
+        return random.randrange(self.size) if self.size else None
+
+    def position_of(self, record_id):
+        return self.ids.get(str(record_id))
+
+    def encoded_span(self, start, stop):
+        """
+        Encoded records [start, stop) as one comma-separated byte slice.
+        """
+        stop = min(stop, len(self.offsets))
+        if start >= stop:
+            return b""
+        end = self.offsets[stop] - 1 if stop < len(self.offsets) else len(self.blob)
+        return memoryview(self.blob)[self.offsets[start]:end]
+
+    def encoded_records(self, positions):
+        return b",".join(self.encoded_span(position, position + 1) for position in positions)
+
+    def prefix_positions(self, term):
+        matched = set()
+        index = bisect_left(self.vocabulary, term)
+        while index < len(self.vocabulary) and self.vocabulary[index].startswith(term):
+            matched.update(self.postings[self.vocabulary[index]])
+            index += 1
+        return matched
+
+    def search(self, query):
+        """
+        Positions of records matching every query term (as a word prefix), in file order.
+        """
+        terms = tokenize(query)
+        if not terms:
+            return []
+        # Rarest-looking (longest) term first keeps the intersections small
+        terms.sort(key=len, reverse=True)
+        positions = self.prefix_positions(terms[0])
+        for term in terms[1:]:
+            if not positions:
+                break
+            positions &= self.prefix_positions(term)
+        return sorted(positions)
+
+
+# ----------------------------
+# Registry
+# ----------------------------
+_datasets = {}
+_lock = threading.Lock()
+
+
+def file_signature(path):
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def read_records(name):
+    """
+    The parsed records of dataset `name`, straight from its file (not cached).
+    """
+    spec = DATASETS[name]
+    with open(os.path.join(dataset_setting("DIR"), spec.file), encoding="utf-8") as file:
+        raw = json.load(file)
+    return spec.extract(raw) if spec.extract else raw
+
+
+def load_dataset(name):
+    spec = DATASETS[name]
+    signature = file_signature(os.path.join(dataset_setting("DIR"), spec.file))
+    return Dataset.build(name, spec, read_records(name), signature)
+
+
+def load_datasets():
+    for name in DATASETS:
+        get_dataset(name)
+
+
+def get_dataset(name):
+    """
+    The loaded dataset `name`, or None for an unknown name.
+    """
+    if name not in DATASETS:
+        return None
+    dataset = _datasets.get(name)
+    if dataset is not None and not dataset_setting("AUTO_RELOAD"):
+        return dataset
+    path = os.path.join(dataset_setting("DIR"), DATASETS[name].file)
+    if dataset is not None and dataset.signature == file_signature(path):
+        return dataset
+    with _lock:
+        dataset = _datasets.get(name)
+        if dataset is None or dataset.signature != file_signature(path):
+            dataset = _datasets[name] = load_dataset(name)
+    return dataset
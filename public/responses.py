@@ -0,0 +1,135 @@
+import gzip
+import hashlib
+import re
+from math import ceil
+from django.http import HttpResponse
+from django.utils.http import parse_etags, quote_etag
+from public.datasets import encode_json
+
+# Pages of these sizes (unfiltered lists) are built once and kept per dataset
+COMMON_PAGE_SIZES = (10, 20, 50, 100)
+# Smaller bodies aren't worth compressing
+GZIP_MIN_LENGTH = 200
+
+ACCEPTS_GZIP_RE = re.compile(r"\bgzip\b")
+
+
+class EncodedBody:
+    """
+    A finished JSON response body with its ETag; the gzip variant is
+    compressed on first use and kept alongside.
+    """
+    __slots__ = ("raw", "etag", "_gzipped")
+
+    def __init__(self, raw):
+        self.raw = bytes(raw)
+        self.etag = quote_etag(hashlib.blake2b(self.raw, digest_size=16).hexdigest())
+        self._gzipped = None
+
+    @property
+    def gzipped(self):
+        if self._gzipped is None:
+            # mtime=0 keeps the compressed bytes (and so the ETag) stable
+            self._gzipped = gzip.compress(self.raw, compresslevel=6, mtime=0)
+        return self._gzipped
+
+    @property
+    def gzip_etag(self):
+        return f'{self.etag[:-1]}-gzip"'
+
+
+def envelope(message, data, success=True):
+    """
+    The api_response() envelope around already-encoded `data` bytes.
+    """
+    return b"".join((
+        b'{"success":', b"true" if success else b"false",
+        b',"message":', encode_json(message).encode(),
+        b',"data":', data,
+        b"}",
+    ))
+
+
+def cached_body(dataset, key, build):
+    body = dataset.bodies.get(key)
+    if body is None:
+        # Concurrent first hits may both build; they produce identical bytes
+        body = dataset.bodies[key] = EncodedBody(build())
+    return body
+
+
+# ----------------------------
+# Bodies
+# ----------------------------
+def page_data(dataset, positions, page, limit):
+    """
+    Encoded pagination object for `positions` (all records when None).
+    """
+    total = len(dataset) if positions is None else len(positions)
+    total_pages = ceil(total / limit) if total else 0
+    start = (page - 1) * limit
+    if positions is None:
+        records = dataset.encoded_span(start, start + limit)
+    else:
+        records = dataset.encoded_records(positions[start:start + limit])
+    meta = encode_json({
+        "page": page,
+        "limit": limit,
+        "total_items": total,
+        "total_pages": total_pages,
+        "previous_page": page > 1,
+        "next_page": page < total_pages,
+    }).encode()
+    return b"".join((meta[:-1], b',"data":[', records, b"]}"))
+
+
+def list_body(dataset, page, limit, positions=None, message=None):
+    message = message or f"{dataset.name} retrieved successfully"
+    build = lambda: envelope(message, page_data(dataset, positions, page, limit))
+    if positions is None and limit in COMMON_PAGE_SIZES and (page - 1) * limit < len(dataset):
+        return cached_body(dataset, ("page", limit, page), build)
+    return EncodedBody(build())
+
+
+def record_body(dataset, position, message="Record retrieved successfully"):
+    return cached_body(
+        dataset,
+        ("record", position, message),
+        lambda: envelope(message, dataset.encoded_span(position, position + 1)),
+    )
+
+
+def error_body(message):
+    return EncodedBody(envelope(message, b"{}", success=False))
+
+
+# ----------------------------
+# HTTP
+# ----------------------------
+def bytes_response(request, body, status=200, cache_control="public, max-age=60"):
+    """
+    Sends pre-encoded bytes as-is: Content-Length, ETag / If-None-Match and
+    a gzip variant for clients that accept it. No serializer or renderer runs.
+    """
+    use_gzip = len(body.raw) >= GZIP_MIN_LENGTH and ACCEPTS_GZIP_RE.search(request.headers.get("Accept-Encoding", ""))
+    etag = body.gzip_etag if use_gzip else body.etag
+
+    if status == 200:
+        if_none_match = request.headers.get("If-None-Match")
+        if if_none_match and (if_none_match.strip() == "*" or {body.etag, body.gzip_etag} & set(parse_etags(if_none_match))):
+            response = HttpResponse(status=304)
+            response["ETag"] = etag
+            response["Vary"] = "Accept-Encoding"
+            response["Cache-Control"] = cache_control
+            return response
+
+    content = body.gzipped if use_gzip else body.raw
+    response = HttpResponse(content, status=status, content_type="application/json")
+    response["Content-Length"] = str(len(content))
+    response["Vary"] = "Accept-Encoding"
+    if use_gzip:
+        response["Content-Encoding"] = "gzip"
+    if status == 200:
+        response["ETag"] = etag
+        response["Cache-Control"] = cache_control
+    return response
@@ -0,0 +1,16 @@
+from django.urls import path
+from public.views import (
+    DatasetIndexView,
+    DatasetListView,
+    DatasetSearchView,
+    DatasetRandomView,
+    DatasetDetailView,
+)
+
+urlpatterns = [
+    path("", DatasetIndexView.as_view(), name="dataset-index"),
+    path("<str:dataset>/", DatasetListView.as_view(), name="dataset-list"),
+    path("<str:dataset>/search/", DatasetSearchView.as_view(), name="dataset-search"),
+    path("<str:dataset>/random/", DatasetRandomView.as_view(), name="dataset-random"),
+    path("<str:dataset>/<str:record_id>/", DatasetDetailView.as_view(), name="dataset-detail"),
+]
@@ -0,0 +1,105 @@
+from django.views import View
+from public.datasets import DATASETS, get_dataset, encode_json
+from public.responses import (
+    EncodedBody,
+    bytes_response,
+    envelope,
+    error_body,
+    list_body,
+    record_body,
+)
+
+DEFAULT_LIMIT = 10
+MAX_LIMIT = 100
+
+
+def query_int(request, name, default, maximum=None):
+    try:
+        value = int(request.GET.get(name, default))
+    except (TypeError, ValueError):
+        return default
+    value = max(1, value)
+    return min(value, maximum) if maximum else value
+
+
+# ----------------------------
+# Base View
+# ----------------------------
+class PublicDatasetView(View):
+    """
+    Read-only views over the in-memory datasets in public.datasets.
+
+    Plain Django views: responses are pre-encoded bytes from public.responses,
+    so there is no authentication, no database access and no DRF
+    serializer/renderer pass on these endpoints.
+    """
+    http_method_names = ["get", "head", "options"]
+
+    def dispatch(self, request, *args, **kwargs):
+        name = kwargs.get("dataset")
+        if name is not None:
+            dataset = get_dataset(name)
+            if dataset is None:
+                return bytes_response(request, error_body(f"Unknown dataset '{name}'"), status=404)
+            kwargs["dataset"] = dataset
+        return super().dispatch(request, *args, **kwargs)
+
+    def page_params(self, request):
+        return query_int(request, "page", 1), query_int(request, "limit", DEFAULT_LIMIT, MAX_LIMIT)
+
+
+# ----------------------------
+# Dataset Index
+# ----------------------------
+class DatasetIndexView(PublicDatasetView):
+    def get(self, request):
+        data = [{"name": name, "total_items": len(get_dataset(name))} for name in DATASETS]
+        body = EncodedBody(envelope("Datasets retrieved successfully", encode_json(data).encode()))
+        return bytes_response(request, body)
+
+
+# ----------------------------
+# List (paginated, optional ?query=)
+# ----------------------------
+class DatasetListView(PublicDatasetView):
+    def get(self, request, dataset):
+        page, limit = self.page_params(request)
+        query = request.GET.get("query", "").strip()
+        positions = dataset.search(query) if query else None
+        return bytes_response(request, list_body(dataset, page, limit, positions))
+
+
+# ----------------------------
+# Search (paginated, ?q= required)
+# ----------------------------
+class DatasetSearchView(PublicDatasetView):
+    def get(self, request, dataset):
+        query = request.GET.get("q", "").strip()
+        if not query:
+            return bytes_response(request, error_body("Query parameter 'q' is required"), status=400)
+        page, limit = self.page_params(request)
+        body = list_body(dataset, page, limit, dataset.search(query), message="Search results retrieved successfully")
+        return bytes_response(request, body)
+
+
+# ----------------------------
+# Random Record
+# ----------------------------
+class DatasetRandomView(PublicDatasetView):
+    def get(self, request, dataset):
+        position = dataset.random_position()
+        if position is None:
+            return bytes_response(request, error_body("Dataset is empty"), status=404)
+        body = record_body(dataset, position, message="Random record retrieved successfully")
+        return bytes_response(request, body, cache_control="no-store")
+
+
+# ----------------------------
+# Detail
+# ----------------------------
+class DatasetDetailView(PublicDatasetView):
+    def get(self, request, dataset, record_id):
+        position = dataset.position_of(record_id)
+        if position is None:
+            return bytes_response(request, error_body("Record not found"), status=404)
+        return bytes_response(request, record_body(dataset, position))
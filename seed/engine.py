@@ -0,0 +1,469 @@
+import random
+import time
+import uuid
+from datetime import timedelta
+from decimal import Decimal
+from itertools import islice
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from django.utils.text import slugify
+from accounts.models import User
+from chat.models import Chat, ChatParticipant, Message
+from core.cache import invalidate_model
+from core.constants import COLOR_CHOICES, SIZE_CHOICES, PRIORITY_CHOICES, ORDER_STATUS, PAYMENT_METHODS
+from seed.sources import SourceMaterial
+from shop.checkout import SHIPPING_COST, TAX_RATE
+from shop.models import (
+    Address, Cart, CartItem, Category, Order, OrderItem,
+    Payment, Product, ProductVariant,
+)
+from social.models import Comment, Follow, Like, Post, Profile
+from social.timeline import rebuild_timelines
+from todo.models import Todo
+
+# Volumes for one run; per-parent values are exact counts per user / post / product / ...
+DEFAULT_VOLUMES = {
+    "users": 100,
+    "follows_per_user": 5,
+    "posts_per_user": 3,
+    "comments_per_post": 2,
+    "likes_per_post": 5,
+    "todos_per_user": 5,
+    "categories": 8,
+    "products": 200,
+    "variants_per_product": 3,
+    "carts": 50,
+    "items_per_cart": 2,
+    "orders_per_user": 1,
+    "items_per_order": 3,
+    "chats": 50,
+    "messages_per_chat": 10,
+}
+DEFAULT_BATCH_SIZE = 5000
+# Every seeded user gets this password
+SEED_PASSWORD = "password123"
+SEED_EMAIL_DOMAIN = "seed.freeapi.dev"
+ORDER_NUMBER_LENGTH = Order._meta.get_field("order_number").max_length
+
+
+class SeedError(Exception):
+    pass
+
+
+def batched(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+# ===============================
+# SEED ENGINE
+# ===============================
+class SeedEngine:
+    """
+    Generates related rows with bulk_create in batches.
+
+    Everything random (ids, texts, relations) comes from one RNG seeded with
+    `seed`, so a seed always produces the same data; seeded usernames carry the
+    seed (`s<seed>_user<n>`), and a seed can only be applied once per database.
+
+    bulk_create skips save() and signals, so whatever those would do is done
+    here in bulk: profiles are created with their users, slugs / SKUs / order
+    numbers / category paths are filled in, counters are recomputed with one
+    UPDATE per table, the seeded users' home timelines are rebuilt after the
+    commit, and cached responses are invalidated at the end.
+    The product search index is only rebuilt when asked for.
+    """
+
+    def __init__(self, seed=0, batch_size=DEFAULT_BATCH_SIZE, use_datasets=False, log=None):
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.batch_size = batch_size
+        self.source = SourceMaterial(self.rng, use_datasets)
+        self.log = log or (lambda message: None)
+        self.prefix = f"s{seed}"
+        self.now = timezone.now()
+        self.counts = {}
+        self.user_ids = []
+        self.post_ids = []
+        self.product_ids = []
+        self.variants = []
+
+    # ----------------------------
+    # Helpers
+    # ----------------------------
+    def uuid(self):
+        return uuid.UUID(int=self.rng.getrandbits(128), version=4)
+
+    def save(self, model, objects):
+        if objects:
+            model.objects.bulk_create(objects, batch_size=self.batch_size)
+            self.counts[model.__name__] = self.counts.get(model.__name__, 0) + len(objects)
+
+    def section(self, name, func, *args):
+        # Steps that don't insert through save() report their own row count
+        started = time.perf_counter()
+        before = sum(self.counts.values())
+        written = func(*args)
+        rows = sum(self.counts.values()) - before if written is None else written
+        elapsed = time.perf_counter() - started
+        self.log(f"{name:<10} {rows:>10} rows in {elapsed:6.2f}s ({rows / elapsed if elapsed else 0:,.0f} rows/s)")
+
+    def order_number(self, sequence):
+        # The full seed keeps numbers unique across seeds
+        return f"S{self.seed}-{sequence}"
+
+    def pick_user(self):
+        return self.rng.choice(self.user_ids)
+
+    def distinct_users(self, count, exclude=None):
+        """
+        Up to `count` distinct user ids, never `exclude`.
+        """
+        population = len(self.user_ids)
+        picks = self.rng.sample(range(population), min(count + 1, population))
+        ids = [self.user_ids[index] for index in picks if self.user_ids[index] != exclude]
+        return ids[:count]
+
+    # ----------------------------
+    # Run
+    # ----------------------------
+    def run(self, volumes=None, search_index=False):
+        volumes = {**DEFAULT_VOLUMES, **(volumes or {})}
+        if volumes["users"] < 1:
+            raise SeedError("At least one user is required: every other row belongs to a user.")
+        if User.all_objects.filter(username=f"{self.prefix}_user0").exists():
+            raise SeedError(f"Seed {self.seed} was already applied to this database; use another seed.")
+        if len(self.order_number(volumes["users"] * volumes["orders_per_user"])) > ORDER_NUMBER_LENGTH:
+            raise SeedError("Seed and order volume don't fit in an order number; use a smaller seed or fewer orders.")
+
+        # One transaction: a failed run leaves nothing behind and can simply be retried
+        with transaction.atomic():
+            self.section("users", self.seed_users, volumes["users"])
+            self.section("follows", self.seed_follows, volumes["follows_per_user"])
+            self.section("posts", self.seed_posts, volumes["posts_per_user"])
+            self.section("comments", self.seed_comments, volumes["comments_per_post"])
+            self.section("likes", self.seed_likes, volumes["likes_per_post"])
+            self.section("todos", self.seed_todos, self.user_ids, volumes["todos_per_user"])
+            self.section("catalog", self.seed_catalog, volumes["categories"], volumes["products"], volumes["variants_per_product"])
+            self.section("carts", self.seed_carts, volumes["carts"], volumes["items_per_cart"])
+            self.section("orders", self.seed_orders, volumes["orders_per_user"], volumes["items_per_order"])
+            self.section("chats", self.seed_chats, volumes["chats"], volumes["messages_per_chat"])
+            self.refresh_denormalized()
+            if search_index and self.product_ids:
+                from shop.search import index_products
+                for batch in batched(self.product_ids, 500):
+                    index_products(batch)
+
+        # Fan-out happens on save(), which bulk_create skipped; rows are the follows rebuilt
+        self.section("timelines", rebuild_timelines, Follow.objects.filter(follower__username__startswith=f"{self.prefix}_"))
+
+        for model in (User, Profile, Follow, Post, Comment, Like, Todo, Category, Product, ProductVariant,
+                      Cart, CartItem, Address, Order, OrderItem, Payment, Chat, ChatParticipant, Message):
+            invalidate_model(model)
+        return self.counts
+
+    # ----------------------------
+    # Users & social graph
+    # ----------------------------
+    def seed_users(self, count):
+        password = make_password(SEED_PASSWORD)
+        for batch in batched(range(count), self.batch_size):
+            users, profiles = [], []
+            for n in batch:
+                user_id = self.uuid()
+                self.user_ids.append(user_id)
+                users.append(User(
+                    id=user_id,
+                    email=f"{self.prefix}.user{n}@{SEED_EMAIL_DOMAIN}",
+                    username=f"{self.prefix}_user{n}",
+                    password=password,
+                    is_verified=True,
+                ))
+                profiles.append(Profile(
+                    id=self.uuid(),
+                    owner_id=user_id,
+                    first_name=self.source.pick("first_names")[:30],
+                    last_name=self.source.pick("last_names")[:30],
+                    location=self.source.pick("cities")[:100],
+                    bio=self.source.pick("post_texts")[:300],
+                ))
+            self.save(User, users)
+            self.save(Profile, profiles)
+
+    def seed_follows(self, per_user):
+        def follows():
+            for follower_id in self.user_ids:
+                for followee_id in self.distinct_users(per_user, exclude=follower_id):
+                    yield Follow(id=self.uuid(), follower_id=follower_id, followee_id=followee_id)
+
+        for batch in batched(follows(), self.batch_size):
+            self.save(Follow, batch)
+
+    def seed_posts(self, per_user):
+        def posts():
+            for _ in range(len(self.user_ids) * per_user):
+                post_id = self.uuid()
+                self.post_ids.append(post_id)
+                content = self.source.pick("post_texts")
+                yield Post(
+                    id=post_id,
+                    author_id=self.pick_user(),
+                    title=content[:60],
+                    content=content,
+                    tags=self.source.sample("tags", self.rng.randint(0, 3)),
+                    is_public=self.rng.random() < 0.9,
+                )
+
+        for batch in batched(posts(), self.batch_size):
+            self.save(Post, batch)
+
+    def seed_comments(self, per_post):
+        def comments():
+            for post_id in self.post_ids:
+                for _ in range(per_post):
+                    yield Comment(
+                        id=self.uuid(),
+                        post_id=post_id,
+                        author_id=self.pick_user(),
+                        content=self.source.pick("comment_texts"),
+                    )
+
+        for batch in batched(comments(), self.batch_size):
+            self.save(Comment, batch)
+
+    def seed_likes(self, per_post):
+        def likes():
+            for post_id in self.post_ids:
+                for user_id in self.distinct_users(per_post):
+                    yield Like(id=self.uuid(), post_id=post_id, liked_by_id=user_id)
+
+        for batch in batched(likes(), self.batch_size):
+            self.save(Like, batch)
+
+    def seed_todos(self, owner_ids, per_owner):
+        """
+        `per_owner` todos for each of `owner_ids`; also used by the todo seeding endpoint.
+        """
+        priorities = [value for value, _ in PRIORITY_CHOICES]
+
+        def todos():
+            for owner_id in owner_ids:
+                for _ in range(per_owner):
+                    yield Todo(
+                        id=self.uuid(),
+                        owner_id=owner_id,
+                        title=self.source.pick("todo_titles")[:200],
+                        description="This is a sample todo",
+                        priority=self.rng.choice(priorities),
+                        completed=self.rng.random() < 0.3,
+                        due_date=self.now + timedelta(days=self.rng.randint(1, 30)),
+                    )
+
+        for batch in batched(todos(), self.batch_size):
+            self.save(Todo, batch)
+
+    # ----------------------------
+    # Catalog
+    # ----------------------------
+    def seed_catalog(self, categories, products, variants_per_product):
+        # Categories are shared across seeds, matched by name
+        names = self.source.sample("categories", categories)
+        category_ids = dict(Category.objects.filter(name__in=names).values_list("name", "id"))
+        new_categories = []
+        for name in names:
+            if name in category_ids:
+                continue
+            category_id = self.uuid()
+            category_ids[name] = category_id
+            new_categories.append(Category(
+                id=category_id,
+                name=name,
+                slug=f"{slugify(name)[:40]}-{category_id.hex[:6]}",
+                path=f"/{category_id.hex}/",
+                depth=0,
+            ))
+        self.save(Category, new_categories)
+        category_ids = list(category_ids.values())
+        if not category_ids:
+            return
+
+        combos = [(color, size) for color, _ in COLOR_CHOICES for size, _ in SIZE_CHOICES]
+        for batch in batched(range(products), self.batch_size):
+            product_rows, variant_rows = [], []
+            for n in batch:
+                product_id = self.uuid()
+                self.product_ids.append(product_id)
+                base = self.source.pick("products")
+                name = f"{base['brand']} {base['title']} {n}"
+                product_rows.append(Product(
+                    id=product_id,
+                    category_id=self.rng.choice(category_ids),
+                    seller_id=self.pick_user(),
+                    name=name[:255],
+                    slug=f"{slugify(name)[:40]}-{product_id.hex[:8]}",
+                    description=base["description"],
+                    short_description=base["description"][:300],
+                    is_featured=self.rng.random() < 0.1,
+                ))
+                for color, size in self.rng.sample(combos, min(variants_per_product, len(combos))):
+                    variant_id = self.uuid()
+                    price = Decimal(self.rng.randint(99, 9999))
+                    self.variants.append((variant_id, price))
+                    variant_rows.append(ProductVariant(
+                        id=variant_id,
+                        product_id=product_id,
+                        sku=f"SKU-{variant_id.hex[:16].upper()}",
+                        color=color,
+                        size=size,
+                        price=price,
+                        stock=self.rng.randint(0, 500),
+                    ))
+            self.save(Product, product_rows)
+            self.save(ProductVariant, variant_rows)
+
+    # ----------------------------
+    # Carts & orders
+    # ----------------------------
+    def seed_carts(self, carts, items_per_cart):
+        if not self.variants:
+            return
+        owners = self.distinct_users(min(carts, len(self.user_ids)))
+        for batch in batched(owners, self.batch_size):
+            cart_rows, item_rows = [], []
+            for user_id in batch:
+                cart_id = self.uuid()
+                cart_rows.append(Cart(id=cart_id, user_id=user_id))
+                for variant_id, _ in self.rng.sample(self.variants, min(items_per_cart, len(self.variants))):
+                    item_rows.append(CartItem(
+                        id=self.uuid(), cart_id=cart_id, variant_id=variant_id, quantity=self.rng.randint(1, 3),
+                    ))
+            self.save(Cart, cart_rows)
+            self.save(CartItem, item_rows)
+
+    def seed_orders(self, per_user, items_per_order):
+        if not self.variants or per_user < 1:
+            return
+        statuses = [value for value, _ in ORDER_STATUS]
+        methods = [value for value, _ in PAYMENT_METHODS]
+        sequence = 0
+        for batch in batched(self.user_ids, max(1, self.batch_size // max(1, per_user))):
+            addresses, orders, items, payments = [], [], [], []
+            for user_id in batch:
+                address_id = self.uuid()
+                addresses.append(Address(
+                    id=address_id,
+                    user_id=user_id,
+                    full_name=f"{self.source.pick('first_names')} {self.source.pick('last_names')}"[:255],
+                    phone=f"9{self.rng.randint(0, 999999999):09d}",
+                    address_line1=f"{self.rng.randint(1, 999)} Main Street",
+                    city=self.source.pick("cities")[:100],
+                    state="State",
+                    postal_code=f"{self.rng.randint(10000, 99999)}",
+                    country=self.source.pick("countries")[:100],
+                    is_default=True,
+                ))
+                for _ in range(per_user):
+                    order_id = self.uuid()
+                    subtotal = Decimal("0")
+                    for variant_id, price in self.rng.sample(self.variants, min(items_per_order, len(self.variants))):
+                        quantity = self.rng.randint(1, 3)
+                        subtotal += price * quantity
+                        items.append(OrderItem(
+                            id=self.uuid(), order_id=order_id, variant_id=variant_id, quantity=quantity, price=price,
+                        ))
+                    tax = (subtotal * TAX_RATE).quantize(Decimal("0.01"))
+                    total = subtotal + tax + SHIPPING_COST
+                    status = self.rng.choice(statuses)
+                    sequence += 1
+                    orders.append(Order(
+                        id=order_id,
+                        user_id=user_id,
+                        address_id=address_id,
+                        order_number=self.order_number(sequence),
+                        status=status,
+                        subtotal=subtotal,
+                        tax_amount=tax,
+                        shipping_cost=SHIPPING_COST,
+                        total_amount=total,
+                    ))
+                    if status != "PENDING":
+                        payments.append(Payment(
+                            id=self.uuid(),
+                            user_id=user_id,
+                            order_id=order_id,
+                            method=self.rng.choice(methods),
+                            transaction_id=f"seed_{order_id.hex[:20]}",
+                            amount=total,
+                            status="SUCCESS",
+                            paid_at=self.now,
+                        ))
+            self.save(Address, addresses)
+            self.save(Order, orders)
+            self.save(OrderItem, items)
+            self.save(Payment, payments)
+
+    # ----------------------------
+    # Chats
+    # ----------------------------
+    def seed_chats(self, chats, messages_per_chat):
+        if len(self.user_ids) < 2:
+            return
+        direct_keys = set()
+        for batch in batched(range(chats), max(1, self.batch_size // max(1, messages_per_chat))):
+            chat_rows, participants, messages = [], [], []
+            for n in batch:
+                chat_id = self.uuid()
+                if n % 2 == 0:
+                    members = self.distinct_users(2)
+                    key = Chat.direct_key_for(*members)
+                    if key in direct_keys:
+                        continue
+                    direct_keys.add(key)
+                    chat_rows.append(Chat(id=chat_id, chat_type="private", direct_key=key))
+                    roles = ["member", "member"]
+                else:
+                    members = self.distinct_users(self.rng.randint(3, 8))
+                    chat_rows.append(Chat(id=chat_id, chat_type="group", name=f"Group {n}", owner_id=members[0]))
+                    roles = ["admin"] + ["member"] * (len(members) - 1)
+                for user_id, role in zip(members, roles):
+                    participants.append(ChatParticipant(id=self.uuid(), chat_id=chat_id, user_id=user_id, role=role))
+                for _ in range(messages_per_chat):
+                    messages.append(Message(
+                        id=self.uuid(),
+                        chat_id=chat_id,
+                        sender_id=self.rng.choice(members),
+                        content=self.source.pick("comment_texts"),
+                    ))
+            self.save(Chat, chat_rows)
+            self.save(ChatParticipant, participants)
+            self.save(Message, messages)
+
+    # ----------------------------
+    # Denormalized columns
+    # ----------------------------
+    def refresh_denormalized(self):
+        """
+        Recomputes counters and Chat.last_message for this seed's rows, one UPDATE per table.
+        """
+        def count_of(model, field, outer="pk"):
+            rows = (
+                model.objects.filter(**{field: OuterRef(outer)}).order_by().values(field)
+                .annotate(total=Count("pk")).values("total")[:1]
+            )
+            return Coalesce(Subquery(rows), Value(0), output_field=IntegerField())
+
+        seeded = f"{self.prefix}_"
+        Post.objects.filter(author__username__startswith=seeded).update(
+            likes_count=count_of(Like, "post"),
+            comments_count=count_of(Comment, "post"),
+        )
+        Profile.objects.filter(owner__username__startswith=seeded).update(
+            followers_count=count_of(Follow, "followee", outer="owner_id"),
+            following_count=count_of(Follow, "follower", outer="owner_id"),
+        )
+        latest = Message.objects.filter(chat_id=OuterRef("pk")).order_by("-created_at", "-id").values("id")[:1]
+        Chat.objects.filter(participants__user__username__startswith=seeded).update(last_message=Subquery(latest))
@@ -0,0 +1,55 @@
+import time
+from django.core.management.base import BaseCommand, CommandError
+from core.jobs import enqueue
+from seed.engine import DEFAULT_BATCH_SIZE, DEFAULT_VOLUMES, SeedEngine, SeedError
+
+
+class Command(BaseCommand):
+    help = (
+        "Bulk-generate users, social graph, todos, catalog, carts, orders and chats. "
+        "Deterministic per --seed, e.g. `seed_data --seed 1 --users 100000 --posts-per-user 10`."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--seed", type=int, default=0, help="RNG seed; each seed can be applied once per database.")
+        parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Rows per bulk_create batch.")
+        parser.add_argument("--use-datasets", action="store_true", help="Draw names and texts from the data/*.json datasets.")
+        parser.add_argument("--search-index", action="store_true", help="Index the seeded products for search.")
+        parser.add_argument("--queue", action="store_true", help="Enqueue the run as a background job instead.")
+        for name, default in DEFAULT_VOLUMES.items():
+            parser.add_argument(f"--{name.replace('_', '-')}", dest=name, type=int, default=default)
+
+    def handle(self, *args, **options):
+        volumes = {name: options[name] for name in DEFAULT_VOLUMES}
+        if options["queue"]:
+            job = enqueue(
+                "seed.run",
+                max_attempts=1,
+                seed=options["seed"],
+                volumes=volumes,
+                batch_size=options["batch_size"],
+                use_datasets=options["use_datasets"],
+                search_index=options["search_index"],
+            )
+            self.stdout.write(self.style.SUCCESS(f"Queued {job}"))
+            return
+
+        engine = SeedEngine(
+            seed=options["seed"],
+            batch_size=options["batch_size"],
+            use_datasets=options["use_datasets"],
+            log=self.stdout.write,
+        )
+        started = time.perf_counter()
+        try:
+            counts = engine.run(volumes, search_index=options["search_index"])
+        except SeedError as exc:
+            raise CommandError(str(exc))
+        elapsed = time.perf_counter() - started
+
+        for model, count in counts.items():
+            self.stdout.write(f"{model:<16} {count:>12}")
+        total = sum(counts.values())
+        self.stdout.write(self.style.SUCCESS(
+            f"Seeded {total} rows in {elapsed:.1f}s ({total / elapsed if elapsed else 0:,.0f} rows/s)"
+        ))
@@ -0,0 +1,34 @@
+from rest_framework import serializers
+from seed.engine import DEFAULT_BATCH_SIZE, DEFAULT_VOLUMES
+
+MAX_USERS = 5_000_000
+
+
+class SeedRequestSerializer(serializers.Serializer):
+    seed = serializers.IntegerField(min_value=0, default=0)
+    batch_size = serializers.IntegerField(min_value=1, max_value=50_000, default=DEFAULT_BATCH_SIZE)
+    use_datasets = serializers.BooleanField(default=False)
+    search_index = serializers.BooleanField(default=False)
+
+    users = serializers.IntegerField(min_value=1, max_value=MAX_USERS, default=DEFAULT_VOLUMES["users"])
+    follows_per_user = serializers.IntegerField(min_value=0, default=DEFAULT_VOLUMES["follows_per_user"])
+    posts_per_user = serializers.IntegerField(min_value=0, default=DEFAULT_VOLUMES["posts_per_user"])
+    comments_per_post = serializers.IntegerField(min_value=0, default=DEFAULT_VOLUMES["comments_per_post"])
+    likes_per_post = serializers.IntegerField(min_value=0, default=DEFAULT_VOLUMES["likes_per_post"])
+    todos_per_user = serializers.IntegerField(min_value=0, default=DEFAULT_VOLUMES["todos_per_user"])
+    categories = serializers.IntegerField(min_value=0, default=DEFAULT_VOLUMES["categories"])
+    products = serializers.IntegerField(min_value=0, default=DEFAULT_VOLUMES["products"])
+    variants_per_product = serializers.IntegerField(min_value=0, default=DEFAULT_VOLUMES["variants_per_product"])
+    carts = serializers.IntegerField(min_value=0, default=DEFAULT_VOLUMES["carts"])
+    items_per_cart = serializers.IntegerField(min_value=0, default=DEFAULT_VOLUMES["items_per_cart"])
+    orders_per_user = serializers.IntegerField(min_value=0, default=DEFAULT_VOLUMES["orders_per_user"])
+    items_per_order = serializers.IntegerField(min_value=1, default=DEFAULT_VOLUMES["items_per_order"])
+    chats = serializers.IntegerField(min_value=0, default=DEFAULT_VOLUMES["chats"])
+    messages_per_chat = serializers.IntegerField(min_value=0, default=DEFAULT_VOLUMES["messages_per_chat"])
+
+    def volumes(self):
+        return {name: self.validated_data[name] for name in DEFAULT_VOLUMES}
+
+
+class SeedTodosSerializer(serializers.Serializer):
+    count = serializers.IntegerField(min_value=1, max_value=1000, default=10)
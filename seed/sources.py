@@ -0,0 +1,80 @@
+from public.datasets import read_records
+
+# Built-in material, used when the data/ datasets aren't requested
+FALLBACK_MATERIAL = {
+    "first_names": ["Aarav", "Maya", "Liam", "Sofia", "Noah", "Zara", "Ethan", "Anika", "Lucas", "Emma"],
+    "last_names": ["Sharma", "Smith", "Garcia", "Khan", "Brown", "Patel", "Jones", "Silva", "Kim", "Lee"],
+    "cities": ["Delhi", "Mumbai", "London", "Berlin", "Toronto", "Sydney", "Austin", "Lisbon", "Seoul", "Nairobi"],
+    "countries": ["India", "United Kingdom", "Germany", "Canada", "Australia", "United States", "Portugal", "Kenya"],
+    "post_texts": [
+        "Shipping a new side project this weekend.",
+        "Hot take: tests are documentation that never goes stale.",
+        "Finally moved our queue off cron jobs.",
+        "Reading about database indexes again.",
+        "Coffee first, migrations second.",
+    ],
+    "comment_texts": ["Nice!", "Totally agree.", "Great post, thanks for sharing.", "Interesting take.", "+1"],
+    "tags": ["python", "django", "api", "webdev", "database", "devops", "career", "opensource"],
+    "todo_titles": [
+        "Buy groceries", "Walk the dog", "Finish project", "Read a book",
+        "Exercise", "Call friend", "Clean room", "Write blog post", "Cook dinner",
+    ],
+    "categories": ["Electronics", "Books", "Fashion", "Home", "Sports", "Toys", "Beauty", "Grocery"],
+    "products": [
+        {"title": "Wireless Earbuds", "description": "Bluetooth earbuds with charging case", "brand": "Sonic"},
+        {"title": "Running Shoes", "description": "Lightweight shoes for daily runs", "brand": "Stride"},
+        {"title": "Desk Lamp", "description": "LED lamp with adjustable brightness", "brand": "Lumo"},
+        {"title": "Backpack", "description": "Water resistant 25L backpack", "brand": "Trail"},
+        {"title": "Coffee Mug", "description": "Ceramic mug, 350ml", "brand": "Brew"},
+    ],
+}
+
+
+def dataset_material():
+    """
+    Source material drawn from the data/*.json datasets (see public.datasets).
+    """
+    users = read_records("users")
+    products = read_records("products")
+    quotes = read_records("quotes")
+    jokes = read_records("jokes")
+    comment_threads = read_records("youtube-comments")
+    meals = read_records("meals")
+
+    comments = [
+        item["snippet"]["topLevelComment"]["snippet"]["textOriginal"]
+        for thread in comment_threads
+        for item in thread.get("items", [])
+    ]
+    return {
+        "first_names": sorted({user["name"]["first"] for user in users}),
+        "last_names": sorted({user["name"]["last"] for user in users}),
+        "cities": sorted({user["location"]["city"] for user in users}),
+        "countries": sorted({user["location"]["country"] for user in users}),
+        "post_texts": [quote["content"] for quote in quotes] + [joke["content"] for joke in jokes],
+        "comment_texts": [text for text in comments if text.strip()],
+        "tags": sorted({tag.lower().replace(" ", "-") for quote in quotes for tag in quote["tags"]}) or FALLBACK_MATERIAL["tags"],
+        "todo_titles": [f"Cook {meal['strMeal']}" for meal in meals] + FALLBACK_MATERIAL["todo_titles"],
+        "categories": sorted({product["category"].replace("-", " ").title() for product in products}),
+        "products": [
+            {"title": product["title"], "description": product["description"], "brand": product["brand"]}
+            for product in products
+        ],
+    }
+
+
+class SourceMaterial:
+    """
+    Text pools the seed engine draws from, all picks going through the engine's seeded RNG.
+    """
+
+    def __init__(self, rng, use_datasets=False):
+        self.rng = rng
+        self.pools = dataset_material() if use_datasets else FALLBACK_MATERIAL
+
+    def pick(self, pool):
+        return self.rng.choice(self.pools[pool])
+
+    def sample(self, pool, count):
+        values = self.pools[pool]
+        return self.rng.sample(values, min(count, len(values)))
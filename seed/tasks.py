@@ -0,0 +1,7 @@
+from core.jobs import task
+from seed.engine import SeedEngine
+
+
+@task("seed.run")
+def seed_run_task(seed, volumes, batch_size, use_datasets=False, search_index=False):
+    SeedEngine(seed=seed, batch_size=batch_size, use_datasets=use_datasets).run(volumes, search_index=search_index)
@@ -1,8 +1,9 @@
 from django.urls import path
-from .views import SeedTodosView
+from .views import SeedView, SeedTodosView
 
 app_name = "seed"
 
 urlpatterns = [
+    path("", SeedView.as_view(), name="seed"),
     path("todos/", SeedTodosView.as_view(), name="seed-todos"),
-]
\ No newline at end of file
+]
@@ -1,45 +1,65 @@
-import random
+import secrets
+from rest_framework import status
 from rest_framework.views import APIView
-from rest_framework import status, permissions
-from todos.models import Todo
+from drf_spectacular.utils import extend_schema
+from core.jobs import enqueue
+from core.permissions import IsSuperAdmin, IsAdminOrSuperAdmin
 from core.utils import api_response
-from django.utils import timezone
-from datetime import timedelta
+from seed.engine import SeedEngine
+from seed.serializers import SeedRequestSerializer, SeedTodosSerializer
 
 
-class SeedTodosView(APIView):
-    permission_classes = [permissions.AllowAny]
+# ----------------------------
+# Full Seed (background job)
+# ----------------------------
+class SeedView(APIView):
     """
-    Create sample todos for testing or demo purposes.
+    Queues a seed.run job; large volumes take minutes, so this never seeds inline.
     """
+    permission_classes = [IsSuperAdmin]
 
+    @extend_schema(request=SeedRequestSerializer)
     def post(self, request):
-        count = int(request.data.get("count", 10)) 
+        serializer = SeedRequestSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        job = enqueue(
+            "seed.run",
+            max_attempts=1,
+            seed=data["seed"],
+            volumes=serializer.volumes(),
+            batch_size=data["batch_size"],
+            use_datasets=data["use_datasets"],
+            search_index=data["search_index"],
+        )
+        return api_response(
+            True,
+            "Seeding queued",
+            {"job_id": job.id, "seed": data["seed"], "volumes": serializer.volumes()},
+            status.HTTP_202_ACCEPTED,
+        )
 
-        sample_titles = [
-            "Buy groceries", "Walk the dog", "Finish project", "Read a book",
-            "Exercise", "Call friend", "Clean room", "Write blog post", "Cook dinner"
-        ]
-        priorities = ["Low", "Medium", "High"]
 
-        todos_created = []
-        for _ in range(count):
-            todo = Todo.objects.create(
-                title=random.choice(sample_titles),
-                description="This is a sample todo",
-                priority=random.choice(priorities),
-                due_date=timezone.now() + timedelta(days=random.randint(1, 10))  
-            )
-            todos_created.append({
-                "id": str(todo.id),
-                "title": todo.title,
-                "priority": todo.priority,
-                "completed": todo.completed,
-            })
+# ----------------------------
+# Sample Todos (for the caller)
+# ----------------------------
+class SeedTodosView(APIView):
+    """
+    Create sample todos for the current user, for testing or demo purposes.
+    """
+    permission_classes = [IsAdminOrSuperAdmin]
+
+    @extend_schema(request=SeedTodosSerializer)
+    def post(self, request):
+        serializer = SeedTodosSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        count = serializer.validated_data["count"]
 
+        # A fresh seed per request: a repeated seed would regenerate the same primary keys
+        SeedEngine(seed=secrets.randbits(64)).seed_todos([request.user.id], count)
         return api_response(
             True,
             f"{count} todos inserted successfully",
-            todos_created,
-            status.HTTP_201_CREATED
+            {"count": count},
+            status.HTTP_201_CREATED,
         )
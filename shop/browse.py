@@ -0,0 +1,144 @@
+import uuid
+from decimal import Decimal, InvalidOperation
+from django.core.exceptions import ValidationError
+from django.db.models import Count, Q
+from core.constants import COLOR_CHOICES, SIZE_CHOICES, PRICE_BUCKETS
+from shop.models import Product, ProductVariant
+
+ACTIVE_PRODUCT = Q(product__is_active=True, product__deleted_at__isnull=True)
+IN_STOCK = Q(track_inventory=False) | Q(stock__gt=0)
+
+
+# ===============================
+# FILTER PARSING
+# ===============================
+def parse_choices(params, name, choices):
+    allowed = {value for value, _ in choices}
+    values = []
+    for raw in params.getlist(name):
+        values.extend(value.strip().upper() for value in raw.split(",") if value.strip())
+    invalid = [value for value in values if value not in allowed]
+    if invalid:
+        raise ValidationError({name: f"Invalid value(s): {', '.join(invalid)}"})
+    return values
+
+
+def parse_price(params, name):
+    raw = params.get(name)
+    if raw in (None, ""):
+        return None
+    try:
+        return Decimal(raw)
+    except InvalidOperation:
+        raise ValidationError({name: "Must be a number."})
+
+
+def parse_category(params):
+    raw = params.get("category")
+    if not raw:
+        return None
+    try:
+        return str(uuid.UUID(raw))
+    except ValueError:
+        raise ValidationError({"category": "Must be a valid category id."})
+
+
+def parse_browse_filters(params):
+    """
+    Reads ?color=&size=&min_price=&max_price=&in_stock=&category= from the query string.
+    color and size accept repeated or comma-separated values.
+    """
+    return {
+        "colors": parse_choices(params, "color", COLOR_CHOICES),
+        "sizes": parse_choices(params, "size", SIZE_CHOICES),
+        "min_price": parse_price(params, "min_price"),
+        "max_price": parse_price(params, "max_price"),
+        "in_stock": params.get("in_stock", "").lower() in ("1", "true", "yes"),
+        "category": parse_category(params),
+    }
+
+
+def parse_search_filters(params):
+    """
+    Reads ?category=&color=&size= for product search, validated like parse_browse_filters().
+    """
+    return {
+        "category": parse_category(params),
+        "colors": parse_choices(params, "color", COLOR_CHOICES),
+        "sizes": parse_choices(params, "size", SIZE_CHOICES),
+    }
+
+
+# ===============================
+# VARIANT CONDITIONS
+# ===============================
+def variant_conditions(filters, skip=None):
+    """
+    Q over ProductVariant for every active filter except `skip` ("color", "size" or "price"),
+    so each facet is counted against the other selections only.
+    """
+    condition = ACTIVE_PRODUCT
+    if filters["category"]:
+        condition &= Q(product__category_id=filters["category"])
+    if filters["colors"] and skip != "color":
+        condition &= Q(color__in=filters["colors"])
+    if filters["sizes"] and skip != "size":
+        condition &= Q(size__in=filters["sizes"])
+    if skip != "price":
+        if filters["min_price"] is not None:
+            condition &= Q(price__gte=filters["min_price"])
+        if filters["max_price"] is not None:
+            condition &= Q(price__lte=filters["max_price"])
+    if filters["in_stock"]:
+        condition &= IN_STOCK
+    return condition
+
+
+# ===============================
+# BROWSE
+# ===============================
+def browse_products(filters):
+    """
+    Products with at least one active variant matching every filter, plus facet counts.
+    Costs four queries whatever the catalog size: the product page and one grouped
+    aggregate each for colors, sizes and price buckets.
+    """
+    matching_variants = ProductVariant.objects.filter(variant_conditions(filters))
+    products = Product.objects.filter(id__in=matching_variants.values("product_id"))
+    return products, facet_counts(filters)
+
+
+def facet_counts(filters):
+    colors = dict(
+        ProductVariant.objects.filter(variant_conditions(filters, skip="color"))
+        .values("color")
+        .annotate(count=Count("product", distinct=True))
+        .values_list("color", "count")
+    )
+    sizes = dict(
+        ProductVariant.objects.filter(variant_conditions(filters, skip="size"))
+        .values("size")
+        .annotate(count=Count("product", distinct=True))
+        .values_list("size", "count")
+    )
+
+    buckets = {}
+    for label, low, high in PRICE_BUCKETS:
+        price_range = Q(price__gte=low) if high is None else Q(price__gte=low, price__lt=high)
+        buckets[label] = Count("product", distinct=True, filter=price_range)
+    price_counts = ProductVariant.objects.filter(variant_conditions(filters, skip="price")).aggregate(**buckets)
+
+    return {
+        "colors": [
+            {"value": value, "label": label, "count": colors.get(value, 0)}
+            for value, label in COLOR_CHOICES
+        ],
+        "sizes": [
+            {"value": value, "label": label, "count": sizes.get(value, 0)}
+            for value, label in SIZE_CHOICES
+        ],
+        "price": [
+            {"label": label, "min": low, "max": high, "count": price_counts[label]}
+            for label, low, high in PRICE_BUCKETS
+        ],
+    }
@@ -0,0 +1,71 @@
+import logging
+from core.cache import get_cache_backend, model_tag, response_cache_setting, tag_versions
+from shop.models import Category
+
+logger = logging.getLogger(__name__)
+
+TREE_TIMEOUT = 60 * 60
+
+
+def category_node(category):
+    return {
+        "id": str(category.id),
+        "name": category.name,
+        "slug": category.slug,
+        "description": category.description,
+        "parent": str(category.parent_id) if category.parent_id else None,
+        "image": category.image,
+        "children": [],
+    }
+
+
+def build_tree(categories):
+    """
+    Nests a flat list of categories into root nodes, in a single pass.
+
+    `categories` must be ordered by depth so every parent is seen before
+    its children; nodes whose parent isn't in the list (e.g. soft-deleted)
+    are dropped together with their subtree.
+    """
+    nodes = {}
+    roots = []
+    for category in categories:
+        node = category_node(category)
+        if category.parent_id is None:
+            roots.append(node)
+        elif category.parent_id in nodes:
+            nodes[category.parent_id]["children"].append(node)
+        else:
+            continue
+        nodes[category.id] = node
+    return roots
+
+
+def load_tree():
+    return build_tree(Category.objects.order_by("depth", "name"))
+
+
+# ===============================
+# TAGGED CACHE
+# ===============================
+def get_category_tree():
+    """
+    The whole active category tree, cached in the response cache backend under
+    the Category tag: any category write (BaseModel.save / delete) rotates the
+    tag version, so every worker rebuilds it on its next read.
+    """
+    try:
+        backend = get_cache_backend()
+        key = f"{response_cache_setting('KEY_PREFIX')}:category_tree:{tag_versions([model_tag(Category)])[0]}"
+        tree = backend.get(key)
+    except Exception:
+        logger.exception("Category tree cache lookup failed")
+        return load_tree()
+
+    if tree is None:
+        tree = load_tree()
+        try:
+            backend.set(key, tree, TREE_TIMEOUT)
+        except Exception:
+            logger.exception("Category tree cache store failed")
+    return tree
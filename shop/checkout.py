@@ -0,0 +1,139 @@
+from decimal import Decimal
+from django.db import transaction
+from django.db.models import Case, F, Q, When
+from django.utils import timezone
+from core.cache import invalidate_model
+from shop.models import CartItem, Order, OrderItem, ProductVariant
+
+TAX_RATE = Decimal('0.18')
+SHIPPING_COST = Decimal('50')
+
+
+class InsufficientStock(Exception):
+    """
+    Raised when one or more cart lines ask for more units than are in stock.
+    `shortfalls` lists every offending line, not just the first one.
+    """
+
+    def __init__(self, shortfalls):
+        self.shortfalls = shortfalls
+        names = ", ".join(f"{line['product']} ({line['sku']})" for line in shortfalls)
+        super().__init__(f"Insufficient stock for {names}")
+
+
+# ===============================
+# CART LINES
+# ===============================
+def load_cart_lines(cart):
+    """
+    Active cart items with their variant and product, in one query.
+    """
+    return list(
+        CartItem.objects.filter(cart=cart)
+        .select_related('variant__product')
+        .order_by('created_at')
+    )
+
+
+def find_shortfalls(lines, stock_by_variant=None):
+    """
+    Every tracked line whose quantity exceeds the available stock.
+    `stock_by_variant` overrides the stock loaded with the lines.
+    """
+    shortfalls = []
+    for item in lines:
+        variant = item.variant
+        if not variant.track_inventory:
+            continue
+        available = variant.stock if stock_by_variant is None else stock_by_variant.get(variant.id, 0)
+        if item.quantity > available:
+            shortfalls.append({
+                "variant_id": str(variant.id),
+                "sku": variant.sku,
+                "product": variant.product.name,
+                "requested": item.quantity,
+                "available": available,
+            })
+    return shortfalls
+
+
+# ===============================
+# STOCK
+# ===============================
+def reserve_stock(lines):
+    """
+    Decrements stock for every tracked line with a single conditional UPDATE:
+
+        UPDATE ... SET stock = CASE id WHEN v1 THEN stock - n1 ... END
+        WHERE (id = v1 AND stock >= n1) OR (id = v2 AND stock >= n2) ...
+
+    If any row fails its guard (stock changed since the cart was loaded), the
+    current stock is re-read and InsufficientStock reports every short line.
+    Must run inside the checkout transaction so a partial update is rolled back.
+    """
+    quantities = {}
+    for item in lines:
+        if item.variant.track_inventory:
+            quantities[item.variant_id] = quantities.get(item.variant_id, 0) + item.quantity
+    if not quantities:
+        return
+
+    guard = Q()
+    for variant_id, quantity in quantities.items():
+        guard |= Q(id=variant_id, stock__gte=quantity)
+    updated = ProductVariant.all_objects.filter(guard).update(
+        stock=Case(
+            *[When(id=variant_id, then=F('stock') - quantity) for variant_id, quantity in quantities.items()],
+            default=F('stock'),
+        ),
+        updated_at=timezone.now(),
+    )
+    if updated != len(quantities):
+        stock = dict(ProductVariant.all_objects.filter(id__in=quantities).values_list('id', 'stock'))
+        raise InsufficientStock(find_shortfalls(lines, stock))
+    transaction.on_commit(lambda: invalidate_model(ProductVariant))
+
+
+# ===============================
+# CHECKOUT
+# ===============================
+@transaction.atomic
+def place_order(user, cart, address, coupon=None, lines=None):
+    """
+    Turns the cart into an order in a constant number of queries, whatever
+    the cart size: load lines, decrement stock, insert the order, bulk insert
+    its items and clear the cart.
+
+    Raises InsufficientStock (and writes nothing) if any line can't be filled.
+    """
+    if lines is None:
+        lines = load_cart_lines(cart)
+
+    shortfalls = find_shortfalls(lines)
+    if shortfalls:
+        raise InsufficientStock(shortfalls)
+
+    subtotal = sum((item.total_price for item in lines), Decimal('0'))
+    discount_amount = Decimal(coupon.calculate_discount(subtotal)) if coupon else Decimal('0')
+    tax_amount = subtotal * TAX_RATE
+    total_amount = subtotal - discount_amount + tax_amount + SHIPPING_COST
+
+    reserve_stock(lines)
+
+    order = Order.objects.create(
+        user=user,
+        address=address,
+        coupon=coupon,
+        subtotal=subtotal,
+        discount_amount=discount_amount,
+        tax_amount=tax_amount,
+        shipping_cost=SHIPPING_COST,
+        total_amount=total_amount
+    )
+    OrderItem.objects.bulk_create([
+        OrderItem(order=order, variant=item.variant, quantity=item.quantity, price=item.variant.price)
+        for item in lines
+    ])
+
+    cart.items.all().delete()
+    return order
@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+from shop.models import Product
+from shop.search import index_products
+
+
+class Command(BaseCommand):
+    help = "Rebuild the product search index from the current catalog."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Number of products indexed per transaction.",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        product_ids = Product.all_objects.order_by("id").values_list("id", flat=True)
+
+        batch = []
+        indexed = 0
+        for product_id in product_ids.iterator(chunk_size=batch_size):
+            batch.append(product_id)
+            if len(batch) >= batch_size:
+                index_products(batch)
+                indexed += len(batch)
+                batch = []
+        if batch:
+            index_products(batch)
+            indexed += len(batch)
+
+        self.stdout.write(self.style.SUCCESS(f"Indexed {indexed} product(s)"))
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.7 on 2025-10-27 09:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('shop', '0003_alter_payment_method'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['user', 'created_at'], name='shop_order_user_id_042042_idx'),
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.7 on 2025-10-28 10:20
+
+from django.db import migrations, models
+
+
+def backfill_category_paths(apps, schema_editor):
+    Category = apps.get_model('shop', 'Category')
+    parents = dict(Category.objects.values_list('id', 'parent_id'))
+    paths = {}
+
+    def path_for(category_id, seen=()):
+        if category_id in paths:
+            return paths[category_id]
+        parent_id = parents.get(category_id)
+        if parent_id is None or parent_id in seen:
+            prefix = "/"
+        else:
+            prefix = path_for(parent_id, seen + (category_id,))
+        paths[category_id] = f"{prefix}{category_id.hex}/"
+        return paths[category_id]
+
+    for category_id in parents:
+        path = path_for(category_id)
+        Category.objects.filter(id=category_id).update(path=path, depth=path.count("/") - 2)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('shop', '0004_order_user_created_at_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='category',
+            name='path',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=1000),
+        ),
+        migrations.AddField(
+            model_name='category',
+            name='depth',
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_category_paths, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 5.2.7 on 2025-10-28 11:40
+
+import django.contrib.postgres.search
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def create_vector_index(apps, schema_editor):
+    # GIN only exists on PostgreSQL; other databases use the ProductSearchTerm table
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(
+        'CREATE INDEX IF NOT EXISTS shop_product_search_vector_gin '
+        'ON shop_product_search_documents USING GIN (vector)'
+    )
+
+
+def drop_vector_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('DROP INDEX IF EXISTS shop_product_search_vector_gin')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('shop', '0005_category_path_depth'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProductSearchDocument',
+            fields=[
+                ('product', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='search_document', serialize=False, to='shop.product')),
+                ('document', models.TextField(blank=True)),
+                ('vector', django.contrib.postgres.search.SearchVectorField(null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'shop_product_search_documents',
+            },
+        ),
+        migrations.CreateModel(
+            name='ProductSearchTerm',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(max_length=64)),
+                ('weight', models.FloatField(default=1)),
+                ('product', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_terms', to='shop.product')),
+            ],
+            options={
+                'db_table': 'shop_product_search_terms',
+                'constraints': [models.UniqueConstraint(fields=('term', 'product'), name='unique_product_search_term')],
+            },
+        ),
+        migrations.RunPython(create_vector_index, drop_vector_index),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.7 on 2025-10-28 12:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('shop', '0006_product_search_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='productvariant',
+            index=models.Index(fields=['product', 'price'], name='shop_produc_product_638606_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='productvariant',
+            index=models.Index(fields=['color', 'size'], name='shop_produc_color_a9713c_idx'),
+        ),
+    ]
@@ -1,11 +1,13 @@
 import uuid
-from django.db import models
-from django.db.models import Min, Max
+from django.db import models, transaction
+from django.db.models import Avg, Case, Exists, F, FloatField, Max, Min, OuterRef, Q, Subquery, Value, When
+from django.db.models.functions import Concat, Substr
+from django.contrib.postgres.search import SearchVectorField
 from django.utils import timezone
 from django.utils.text import slugify
 from django.core.exceptions import ValidationError
-from core.models import BaseModel
-from core.cloudinary import upload_to_cloudinary
+from core.models import BaseModel, SoftDeleteManager
+from core.media import pending_media_fields, queue_upload
 from core.constants import (
     COLOR_CHOICES, SIZE_CHOICES,
     ADDRESS_TYPES, DISCOUNT_TYPE_CHOICES,
@@ -24,6 +26,9 @@ class Category(BaseModel):
         'self', on_delete=models.CASCADE, null=True, blank=True, related_name='children'
     )
     image = models.URLField(max_length=500, blank=True, null=True)
+    # Materialized path of ancestor ids ("/<root>/.../<self>/"), maintained in save()
+    path = models.CharField(max_length=1000, blank=True, editable=False, db_index=True)
+    depth = models.PositiveSmallIntegerField(default=0, editable=False)
     _image_file = None
 
     class Meta:
@@ -33,6 +38,15 @@ class Category(BaseModel):
     def clean(self):
         if Category.objects.filter(name=self.name, is_active=True).exclude(id=self.id).exists():
             raise ValidationError({"name": "Category with this name already exists."})
+        if self.parent_id and self.path and self.parent.path.startswith(self.path):
+            raise ValidationError({"parent": "A category can't be moved under itself or its descendants."})
+
+    def build_path(self):
+        prefix = self.parent.path if self.parent_id else "/"
+        return f"{prefix}{self.id.hex}/"
+
+    def get_descendants(self):
+        return Category.objects.filter(path__startswith=self.path).exclude(id=self.id)
 
     def save(self, *args, **kwargs):
         if not self.slug:
@@ -41,16 +55,77 @@ class Category(BaseModel):
             self.slug = f"{base_slug}-{unique_id}"
 
         if self._image_file:
-            self.image = upload_to_cloudinary(self._image_file, folder="categories")
+            self.image = queue_upload(self, "image", self._image_file, folder="categories")
             self._image_file = None
 
-        self.full_clean()
-        super().save(*args, **kwargs)
+        self.full_clean(exclude=pending_media_fields(self, "image"))
+
+        old_path, old_depth = self.path, self.depth
+        self.path = self.build_path()
+        self.depth = self.path.count("/") - 2
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = {*update_fields, 'path', 'depth'}
+
+        from shop.search import schedule_reindex
+
+        with transaction.atomic():
+            # Also rotates the Category cache tag, which drops the cached tree (shop.category_tree)
+            super().save(*args, **kwargs)
+            if update_fields is None or 'name' in update_fields:
+                schedule_reindex(Product.all_objects.filter(category=self).values_list('id', flat=True))
+            if old_path and old_path != self.path:
+                # Moved: rewrite every descendant's path prefix in one UPDATE
+                Category.all_objects.filter(path__startswith=old_path).exclude(id=self.id).update(
+                    path=Concat(Value(self.path), Substr('path', len(old_path) + 1)),
+                    depth=F('depth') + (self.depth - old_depth),
+                    updated_at=timezone.now(),
+                )
 
     def __str__(self):
         return self.name
 
 
+# ===============================
+# PRODUCT QUERYSET
+# ===============================
+class ProductQuerySet(models.QuerySet):
+    def with_catalog_stats(self):
+        """
+        Annotates price range, stock, best discount and average rating so
+        catalog pages don't run one aggregate per product.
+        Only active variants and reviews are counted, as in the Product properties.
+        """
+        active_variant = Q(variants__is_active=True, variants__deleted_at__isnull=True)
+        ratings = (
+            ProductReview.objects.filter(product=OuterRef('pk'))
+            .values('product')
+            .annotate(average=Avg('rating'))
+            .values('average')
+        )
+        return self.annotate(
+            catalog_min_price=Min('variants__price', filter=active_variant),
+            catalog_max_price=Max('variants__price', filter=active_variant),
+            catalog_max_discount=Max(
+                Case(
+                    When(
+                        variants__compare_price__gt=F('variants__price'),
+                        then=(F('variants__compare_price') - F('variants__price')) * 100 / F('variants__compare_price'),
+                    ),
+                    default=0,
+                    output_field=FloatField(),
+                ),
+                filter=active_variant,
+            ),
+            catalog_in_stock=Exists(ProductVariant.objects.filter(product=OuterRef('pk'), stock__gt=0)),
+            catalog_rating=Subquery(ratings, output_field=FloatField()),
+        )
+
+
+class ProductManager(SoftDeleteManager.from_queryset(ProductQuerySet)):
+    pass
+
+
 # ===============================
 # PRODUCT MODEL
 # ===============================
@@ -65,6 +140,8 @@ class Product(BaseModel):
     main_image = models.URLField(max_length=500, blank=True, null=True)
     _image_file = None
 
+    objects = ProductManager()
+
     class Meta:
         ordering = ['-created_at']
 
@@ -74,32 +151,49 @@ class Product(BaseModel):
             unique_id = uuid.uuid4().hex[:6]
             self.slug = f"{base_slug}-{unique_id}"
         if self._image_file:
-            self.main_image = upload_to_cloudinary(self._image_file, folder="products/main")
+            self.main_image = queue_upload(self, "main_image", self._image_file, folder="products/main")
             self._image_file = None
         super().save(*args, **kwargs)
 
+        from shop.search import schedule_reindex
+        schedule_reindex([self.id])
+
     def __str__(self):
         return self.name
 
+    # The properties below read the with_catalog_stats() annotations when present
     @property
     def min_price(self):
+        if hasattr(self, 'catalog_min_price'):
+            return self.catalog_min_price or 0
         return self.variants.aggregate(min_price=Min('price'))['min_price'] or 0
 
     @property
     def max_price(self):
+        if hasattr(self, 'catalog_max_price'):
+            return self.catalog_max_price or 0
         return self.variants.aggregate(max_price=Max('price'))['max_price'] or 0
 
     @property
     def is_in_stock(self):
+        if hasattr(self, 'catalog_in_stock'):
+            return self.catalog_in_stock
         return self.variants.filter(stock__gt=0).exists()
 
     @property
     def discount_percentage(self):
+        if hasattr(self, 'catalog_max_discount'):
+            return int(self.catalog_max_discount or 0)
         discounts = [v.discount_percentage for v in self.variants.all()]
         return max(discounts) if discounts else 0
-    
+
+    @property
+    def average_rating(self):
+        if hasattr(self, 'catalog_rating'):
+            return self.catalog_rating or 0
+        return self.update_average_rating()
+
     def update_average_rating(self):
-        from django.db.models import Avg
         result = self.reviews.filter(is_active=True).aggregate(Avg('rating'))
         return result['rating__avg'] or 0
 
@@ -118,12 +212,25 @@ class ProductVariant(BaseModel):
 
     class Meta:
         unique_together = ['product', 'color', 'size']
+        indexes = [
+            models.Index(fields=['product', 'price']),
+            models.Index(fields=['color', 'size']),
+        ]
 
     def save(self, *args, **kwargs):
         if not self.sku:
             self.sku = f"SKU-{uuid.uuid4().hex[:12].upper()}"
         super().save(*args, **kwargs)
 
+        from shop.search import schedule_reindex
+        schedule_reindex([self.product_id])
+
+    def delete(self, hard=False, *args, **kwargs):
+        super().delete(hard, *args, **kwargs)
+        if hard:
+            from shop.search import schedule_reindex
+            schedule_reindex([self.product_id])
+
     @property
     def discount_percentage(self):
         if self.compare_price and self.compare_price > self.price:
@@ -151,7 +258,7 @@ class ProductImage(BaseModel):
 
     def save(self, *args, **kwargs):
         if self._image_file:
-            self.image = upload_to_cloudinary(self._image_file, folder="products/images")
+            self.image = queue_upload(self, "image", self._image_file, folder="products/images")
             self._image_file = None
         super().save(*args, **kwargs)
 
@@ -163,7 +270,7 @@ class Cart(BaseModel):
     user = models.OneToOneField(User, related_name="cart", on_delete=models.CASCADE)
 
     def subtotal(self):
-        return sum(item.total_price for item in self.items.filter(is_active=True))
+        return sum(item.total_price for item in self.items.all())
 
     def total_price(self):
         return self.subtotal()
@@ -218,7 +325,9 @@ class Address(BaseModel):
 
     def save(self, *args, **kwargs):
         if self.is_default:
-            Address.objects.filter(user=self.user, is_default=True).exclude(id=self.id).update(is_default=False)
+            Address.objects.filter(user=self.user, is_default=True).exclude(id=self.id).update(
+                is_default=False, updated_at=timezone.now()
+            )
         super().save(*args, **kwargs)
 
     def __str__(self):
@@ -271,6 +380,11 @@ class Order(BaseModel):
     shipping_cost = models.DecimalField(max_digits=10, decimal_places=2, default=0)
     total_amount = models.DecimalField(max_digits=10, decimal_places=2, default=0)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'created_at']),
+        ]
+
     def save(self, *args, **kwargs):
         if not self.order_number:
             self.order_number = f"ORD-{uuid.uuid4().hex[:10].upper()}"
@@ -339,3 +453,35 @@ class ProductReview(BaseModel):
 
     def __str__(self):
         return f"{self.product.name} - {self.user.username} - {self.rating}"
+
+
+# ===============================
+# PRODUCT SEARCH INDEX
+# ===============================
+class ProductSearchDocument(models.Model):
+    """
+    Flattened searchable text of a product, rebuilt by shop.search on every product,
+    variant or category write. `vector` is only filled on PostgreSQL.
+    """
+    product = models.OneToOneField(Product, primary_key=True, related_name="search_document", on_delete=models.CASCADE)
+    document = models.TextField(blank=True)
+    vector = SearchVectorField(null=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'shop_product_search_documents'
+
+
+class ProductSearchTerm(models.Model):
+    """
+    Inverted index row (term -> product, weight) used where tsvector isn't available.
+    """
+    product = models.ForeignKey(Product, related_name="search_terms", on_delete=models.CASCADE)
+    term = models.CharField(max_length=64)
+    weight = models.FloatField(default=1)
+
+    class Meta:
+        db_table = 'shop_product_search_terms'
+        constraints = [
+            models.UniqueConstraint(fields=['term', 'product'], name='unique_product_search_term'),
+        ]
@@ -0,0 +1,212 @@
+import re
+from collections import Counter
+from django.db import connection, transaction
+from django.db.models import Case, Count, F, IntegerField, Q, Sum, Value, When
+from shop.models import Product, ProductSearchDocument, ProductSearchTerm, ProductVariant
+
+TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+MAX_TERM_LENGTH = 64
+MAX_RESULTS = 1000
+
+# Relative weight of a term by the field it came from (PostgreSQL weight class in brackets)
+FIELD_WEIGHTS = {
+    "name": (4.0, "A"),
+    "category": (2.0, "B"),
+    "short_description": (1.5, "C"),
+    "description": (1.0, "D"),
+    "variants": (1.0, "D"),
+}
+
+
+def tokenize(text):
+    return [token[:MAX_TERM_LENGTH] for token in TOKEN_RE.findall((text or "").lower())]
+
+
+def product_fields(product):
+    variants = ProductVariant.objects.filter(product=product).values_list("color", "size", "sku")
+    return {
+        "name": product.name,
+        "category": product.category.name if product.category_id else "",
+        "short_description": product.short_description,
+        "description": product.description,
+        "variants": " ".join(value for variant in variants for value in variant if value),
+    }
+
+
+# =============================================================
+# BACKENDS
+# =============================================================
+class InvertedIndexBackend:
+    """
+    Portable inverted index in `ProductSearchTerm`: one (term, product, weight) row per
+    distinct term. Every query term is matched as a prefix with a range scan on the
+    term index; products must match all terms and are ranked by summed weight,
+    with exact term matches counting double.
+    """
+
+    def index(self, product, fields):
+        weights = Counter()
+        for field, text in fields.items():
+            for term in tokenize(text):
+                weights[term] += FIELD_WEIGHTS[field][0]
+        ProductSearchTerm.objects.filter(product=product).delete()
+        ProductSearchTerm.objects.bulk_create([
+            ProductSearchTerm(product=product, term=term, weight=weight)
+            for term, weight in weights.items()
+        ])
+
+    def search(self, terms, limit):
+        matches = Q()
+        token_index = []
+        exact = []
+        for position, term in enumerate(terms):
+            prefix = Q(term__gte=term, term__lt=term + "\uffff")
+            matches |= prefix
+            token_index.append(When(prefix, then=Value(position)))
+            exact.append(When(term=term, then=F("weight") * 2))
+        rows = (
+            ProductSearchTerm.objects.filter(matches)
+            .annotate(token=Case(*token_index, output_field=IntegerField()))
+            .values("product_id")
+            .annotate(
+                matched=Count("token", distinct=True),
+                score=Sum(Case(*exact, default=F("weight"))),
+            )
+            .filter(matched=len(terms))
+            .order_by("-score")[:limit]
+        )
+        return [(row["product_id"], row["score"]) for row in rows]
+
+
+class PostgresSearchBackend:
+    """
+    Weighted tsvector stored on `ProductSearchDocument.vector`, backed by a GIN index.
+    Query terms are AND-ed prefix lexemes ("red:* & shi:*") and ranked with ts_rank.
+    """
+    config = "simple"
+
+    def index(self, product, fields):
+        from django.contrib.postgres.search import SearchVector
+
+        vector = None
+        for field, text in fields.items():
+            part = SearchVector(Value(text or ""), weight=FIELD_WEIGHTS[field][1], config=self.config)
+            vector = part if vector is None else vector + part
+        ProductSearchDocument.objects.filter(product=product).update(vector=vector)
+
+    def search(self, terms, limit):
+        from django.contrib.postgres.search import SearchQuery, SearchRank
+
+        query = SearchQuery(" & ".join(f"{term}:*" for term in terms), search_type="raw", config=self.config)
+        rows = (
+            ProductSearchDocument.objects.filter(vector=query)
+            .annotate(score=SearchRank(F("vector"), query))
+            .order_by("-score")
+            .values_list("product_id", "score")[:limit]
+        )
+        return list(rows)
+
+
+def get_search_backend():
+    if connection.vendor == "postgresql":
+        return PostgresSearchBackend()
+    return InvertedIndexBackend()
+
+
+# =============================================================
+# INDEXING
+# =============================================================
+def index_products(product_ids):
+    """
+    (Re)builds the search entries of the given products; inactive products are dropped.
+    """
+    backend = get_search_backend()
+    products = Product.all_objects.filter(id__in=product_ids).select_related("category")
+    with transaction.atomic():
+        for product in products:
+            if not product.is_active:
+                ProductSearchDocument.objects.filter(product=product).delete()
+                ProductSearchTerm.objects.filter(product=product).delete()
+                continue
+            fields = product_fields(product)
+            ProductSearchDocument.objects.update_or_create(
+                product=product,
+                defaults={"document": "\n".join(text for text in fields.values() if text)},
+            )
+            backend.index(product, fields)
+
+
+def schedule_reindex(product_ids):
+    """
+    Reindexes once the surrounding transaction commits, so the index never sees rolled-back writes.
+    """
+    product_ids = list(product_ids)
+    if product_ids:
+        transaction.on_commit(lambda: index_products(product_ids))
+
+
+# =============================================================
+# QUERYING
+# =============================================================
+def search_products(query, category=None, colors=(), sizes=()):
+    """
+    Ranked products matching every term of `query` as a prefix, optionally narrowed by
+    category / variant colors / variant sizes. Returns (queryset in rank order, facets).
+    """
+    terms = list(dict.fromkeys(tokenize(query)))
+    if not terms:
+        return Product.objects.none(), empty_facets()
+
+    ranked = get_search_backend().search(terms, MAX_RESULTS)
+    ranked_ids = [product_id for product_id, _ in ranked]
+
+    matches = Product.objects.filter(id__in=ranked_ids)
+    if category:
+        matches = matches.filter(category_id=category)
+    if colors or sizes:
+        variant_filter = ProductVariant.objects.all()
+        if colors:
+            variant_filter = variant_filter.filter(color__in=colors)
+        if sizes:
+            variant_filter = variant_filter.filter(size__in=sizes)
+        matches = matches.filter(id__in=variant_filter.values("product_id"))
+
+    rank = Case(
+        *[When(id=product_id, then=Value(position)) for position, product_id in enumerate(ranked_ids)],
+        output_field=IntegerField(),
+    )
+    return matches.order_by(rank), facet_counts(matches)
+
+
+def empty_facets():
+    return {"categories": [], "colors": [], "sizes": []}
+
+
+def facet_counts(products):
+    """
+    Category / color / size counts over `products`, one grouped query each.
+    """
+    product_ids = products.order_by().values("id")
+    categories = (
+        Product.objects.filter(id__in=product_ids)
+        .values("category_id", "category__name")
+        .annotate(count=Count("id"))
+        .order_by("-count")
+    )
+    variants = ProductVariant.objects.filter(product_id__in=product_ids)
+    colors = (
+        variants.exclude(color__isnull=True).exclude(color="")
+        .values("color").annotate(count=Count("product_id", distinct=True)).order_by("-count")
+    )
+    sizes = (
+        variants.exclude(size__isnull=True).exclude(size="")
+        .values("size").annotate(count=Count("product_id", distinct=True)).order_by("-count")
+    )
+    return {
+        "categories": [
+            {"id": str(row["category_id"]), "name": row["category__name"], "count": row["count"]}
+            for row in categories
+        ],
+        "colors": [{"value": row["color"], "count": row["count"]} for row in colors],
+        "sizes": [{"value": row["size"], "count": row["count"]} for row in sizes],
+    }
@@ -1,6 +1,7 @@
 import uuid
 from decimal import Decimal
 from rest_framework import serializers
+from core.media import MediaStatusField
 from shop.models import (
     Category, Product, ProductVariant, ProductImage,
     Cart, CartItem, Address, Coupon, Order, OrderItem,
@@ -12,13 +13,20 @@ from shop.models import (
 # ===============================
 class CategorySerializer(serializers.ModelSerializer):
     children = serializers.SerializerMethodField()
+    image_status = MediaStatusField(source='image')
     
     class Meta:
         model = Category
-        fields = ['id', 'name', 'slug', 'description', 'parent', 'image', 'children']
+        fields = ['id', 'name', 'slug', 'description', 'parent', 'image', 'image_status', 'children']
 
     def get_children(self, obj):
-        return CategorySerializer(obj.children.filter(is_active=True), many=True).data
+        # CategoryViewSet passes every active category grouped by parent, so no per-node query
+        children_by_parent = self.context.get('children_by_parent')
+        if children_by_parent is not None:
+            children = children_by_parent.get(obj.id, [])
+        else:
+            children = obj.children.filter(is_active=True)
+        return CategorySerializer(children, many=True, context=self.context).data
 
 
 # ===============================
@@ -32,9 +40,11 @@ class CategoryImageUploadSerializer(serializers.Serializer):
 # PRODUCT IMAGE SERIALIZER
 # ===============================
 class ProductImageSerializer(serializers.ModelSerializer):
+    image_status = MediaStatusField(source='image')
+
     class Meta:
         model = ProductImage
-        fields = ['id', 'image', 'alt_text', 'is_primary', 'display_order']
+        fields = ['id', 'image', 'image_status', 'alt_text', 'is_primary', 'display_order']
 
 
 # ===============================
@@ -58,13 +68,37 @@ class ProductVariantSerializer(serializers.ModelSerializer):
 class ProductSerializer(serializers.ModelSerializer):
     variants = ProductVariantSerializer(many=True, read_only=True)
     main_image = serializers.URLField(required=False)
+    main_image_status = MediaStatusField(source='main_image')
     slug = serializers.ReadOnlyField()
 
     class Meta:
         model = Product
         fields = [
             'id', 'name', 'slug', 'short_description', 'description',
-            'is_featured', 'main_image', 'category', 'seller', 'variants'
+            'is_featured', 'main_image', 'main_image_status', 'category', 'seller', 'variants'
+        ]
+
+
+# ===============================
+# PRODUCT LIST SERIALIZER
+# ===============================
+class ProductListSerializer(serializers.ModelSerializer):
+    """
+    Catalog listing without nested variants; expects Product.objects.with_catalog_stats().
+    """
+    min_price = serializers.DecimalField(max_digits=10, decimal_places=2, read_only=True)
+    max_price = serializers.DecimalField(max_digits=10, decimal_places=2, read_only=True)
+    is_in_stock = serializers.BooleanField(read_only=True)
+    discount_percentage = serializers.IntegerField(read_only=True)
+    average_rating = serializers.FloatField(read_only=True)
+    main_image_status = MediaStatusField(source='main_image')
+
+    class Meta:
+        model = Product
+        fields = [
+            'id', 'name', 'slug', 'short_description', 'is_featured',
+            'main_image', 'main_image_status', 'category', 'seller', 'min_price', 'max_price',
+            'is_in_stock', 'discount_percentage', 'average_rating'
         ]
 
 
@@ -108,8 +142,8 @@ class CartItemSerializer(serializers.ModelSerializer):
             "description": product.description,
             "is_featured": product.is_featured,
             "main_image": product.main_image,
-            "category": product.category.id,
-            "seller": product.seller.id,
+            "category": product.category_id,
+            "seller": product.seller_id,
             "variant": ProductVariantInCartSerializer(obj.variant).data
         }
 
@@ -127,10 +161,11 @@ class CartSerializer(serializers.ModelSerializer):
         fields = ['id', 'user', 'items', 'subtotal', 'total_price']
 
     def get_subtotal(self, obj):
-        return sum(item.total_price for item in obj.items.filter(is_active=True))
+        # items.all() is served from with_cart_items' prefetch when present
+        return obj.subtotal()
 
     def get_total_price(self, obj):
-        return self.get_subtotal(obj)
+        return obj.total_price()
 
 
 # ===============================
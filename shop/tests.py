@@ -1,3 +1,134 @@
-from django.test import TestCase
+import shutil
+import tempfile
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from accounts.models import User
+from core.constants import COLOR_CHOICES, ROLE_ADMIN
+from core.media import MEDIA_PENDING
+from core.models import MediaUpload
+from shop.models import Cart, CartItem, Category, Product, ProductVariant
 
-# Create your tests here.
+CART_URL = "/api/v1/shop/cart/"
+CATEGORIES_URL = "/api/v1/shop/categories/"
+
+# 1x1 transparent GIF
+GIF_BYTES = (
+    b"GIF89a\x01\x00\x01\x00\x80\x00\x00\x00\x00\x00\xff\xff\xff!\xf9\x04\x01\x00\x00\x00\x00"
+    b",\x00\x00\x00\x00\x01\x00\x01\x00\x00\x02\x02D\x01\x00;"
+)
+
+
+# ===============================
+# CART QUERY COUNTS
+# ===============================
+class CartQueryCountTests(TestCase):
+    """
+    Cart reads and writes serialize the cart from one prefetch (with_cart_items),
+    so their query count must not grow with the number of items.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email="buyer@example.com", username="buyer", password="pass12345")
+        seller = User.objects.create_user(email="seller@example.com", username="seller", password="pass12345")
+        category = Category.objects.create(name="Apparel")
+        product = Product.objects.create(category=category, seller=seller, name="T-Shirt")
+        cls.variants = [
+            ProductVariant.objects.create(product=product, color=color, size="M", price=100 + n, stock=50)
+            for n, (color, _) in enumerate(COLOR_CHOICES[:8])
+        ]
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.cart, _ = Cart.objects.get_or_create(user=self.user)
+
+    def fill_cart(self, count):
+        for variant in self.variants[:count]:
+            CartItem.all_objects.get_or_create(cart=self.cart, variant=variant, defaults={"quantity": 1})
+
+    def count_queries(self, method, path, data=None):
+        with CaptureQueriesContext(connection) as queries:
+            response = getattr(self.client, method)(CART_URL + path, data, format="json")
+        self.assertEqual(response.status_code, 200, response.content)
+        return len(queries)
+
+    def test_get_cart_query_count_is_constant(self):
+        self.fill_cart(1)
+        baseline = self.count_queries("get", "")
+
+        self.fill_cart(6)
+        with self.assertNumQueries(baseline):
+            response = self.client.get(CART_URL)
+        self.assertEqual(len(response.data["data"]["items"]), 6)
+
+    def test_add_item_query_count_is_constant(self):
+        self.fill_cart(1)
+        baseline = self.count_queries("post", "add/", {"variant_id": str(self.variants[6].id)})
+
+        self.fill_cart(5)
+        with self.assertNumQueries(baseline):
+            response = self.client.post(CART_URL + "add/", {"variant_id": str(self.variants[7].id)}, format="json")
+        self.assertEqual(len(response.data["data"]["items"]), 7)
+
+    def test_update_item_query_count_is_constant(self):
+        self.fill_cart(1)
+        baseline = self.count_queries("post", "update/", {"variant_id": str(self.variants[0].id), "quantity": 2})
+
+        self.fill_cart(6)
+        with self.assertNumQueries(baseline):
+            response = self.client.post(
+                CART_URL + "update/", {"variant_id": str(self.variants[0].id), "quantity": 3}, format="json"
+            )
+        self.assertEqual(len(response.data["data"]["items"]), 6)
+
+    def test_remove_item_query_count_is_constant(self):
+        self.fill_cart(2)
+        baseline = self.count_queries("post", "remove/", {"variant_id": str(self.variants[0].id)})
+
+        self.fill_cart(7)
+        with self.assertNumQueries(baseline):
+            response = self.client.post(CART_URL + "remove/", {"variant_id": str(self.variants[6].id)}, format="json")
+        # variants[0] stays soft-deleted from the baseline request
+        self.assertEqual(len(response.data["data"]["items"]), 5)
+
+
+# ===============================
+# CATEGORY IMAGE UPLOAD
+# ===============================
+class CategoryImageUploadTests(TestCase):
+    """
+    A new image is staged locally and uploaded by a job; until then the
+    category keeps the staged (relative) URL and the endpoint answers 202.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(
+            email="admin@example.com", username="admin", password="pass12345", role=ROLE_ADMIN
+        )
+        cls.category = Category.objects.create(name="Shoes")
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def test_upload_new_image_is_accepted(self):
+        image = SimpleUploadedFile("shoes.gif", GIF_BYTES, content_type="image/gif")
+        response = self.client.post(f"{CATEGORIES_URL}{self.category.id}/image/", {"file": image}, format="multipart")
+
+        self.assertEqual(response.status_code, 202, response.content)
+        self.assertEqual(response.data["data"]["image_status"], MEDIA_PENDING)
+        self.category.refresh_from_db()
+        self.assertEqual(self.category.image, response.data["data"]["image"])
+        self.assertTrue(
+            MediaUpload.objects.filter(target_id=str(self.category.id), status=MediaUpload.PENDING).exists()
+        )
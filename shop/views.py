@@ -2,13 +2,25 @@ import razorpay
 import stripe
 from rest_framework import viewsets, status, permissions, filters
 from rest_framework.decorators import action
+from rest_framework.renderers import JSONRenderer
+from rest_framework.settings import api_settings
 from django.conf import settings
 from django.db import transaction
+from django.db.models import Avg, Count, Max, Prefetch, prefetch_related_objects
 from django.utils import timezone
 from django.core.exceptions import ValidationError
 from django.shortcuts import get_object_or_404
 from core.utils import api_response
 from core.permissions import IsAdminOrSuperAdmin, IsOwnerOrAdmin, IsSuperAdmin, IsAuthenticatedUser
+from core.pagination import KeysetPagination
+from core.cache import cache_response
+from core.mixins import ConditionalGetMixin
+from core.exports import ExportRenderer, export_response
+from core.media import MEDIA_READY, media_status
+from shop.checkout import InsufficientStock, load_cart_lines, place_order
+from shop.category_tree import get_category_tree
+from shop.search import search_products
+from shop.browse import browse_products, parse_browse_filters, parse_search_filters
 from shop.models import (
     Category, Product, ProductVariant, 
     ProductImage, Cart, CartItem,
@@ -17,14 +29,54 @@ from shop.models import (
 )
 from shop.serializers import (
     CategorySerializer, CategoryImageUploadSerializer,
-    ProductSerializer, ProductImageUploadSerializer,
+    ProductSerializer, ProductListSerializer, ProductImageUploadSerializer,
     ProductVariantSerializer, ProductImageSerializer,
     CartSerializer, CartItemSerializer, AddressSerializer,
     CouponSerializer, CheckoutSerializer, OrderSerializer,
     OrderItemSerializer, PaymentSerializer, ProductReviewSerializer,
     WishlistSerializer
 )
-from decimal import Decimal
+
+# (column, lookup) pairs for the streamed exports
+ORDER_EXPORT_FIELDS = [
+    ("id", "id"),
+    ("order_number", "order_number"),
+    ("user_id", "user_id"),
+    ("user_email", "user__email"),
+    ("status", "status"),
+    ("coupon", "coupon__code"),
+    ("subtotal", "subtotal"),
+    ("discount_amount", "discount_amount"),
+    ("tax_amount", "tax_amount"),
+    ("shipping_cost", "shipping_cost"),
+    ("total_amount", "total_amount"),
+    ("created_at", "created_at"),
+    ("updated_at", "updated_at"),
+]
+ORDER_ITEM_EXPORT_FIELDS = [
+    ("id", "id"),
+    ("order_id", "order_id"),
+    ("order_number", "order__order_number"),
+    ("variant_id", "variant_id"),
+    ("sku", "variant__sku"),
+    ("product", "variant__product__name"),
+    ("quantity", "quantity"),
+    ("price", "price"),
+    ("created_at", "created_at"),
+]
+PAYMENT_EXPORT_FIELDS = [
+    ("id", "id"),
+    ("order_id", "order_id"),
+    ("order_number", "order__order_number"),
+    ("method", "method"),
+    ("transaction_id", "transaction_id"),
+    ("amount", "amount"),
+    ("status", "status"),
+    ("paid_at", "paid_at"),
+    ("refund_amount", "refund_amount"),
+    ("refunded_at", "refunded_at"),
+    ("created_at", "created_at"),
+]
 
 # =============================================================
 # CATEGORY VIEWSET
@@ -37,6 +89,24 @@ class CategoryViewSet(viewsets.ModelViewSet):
     search_fields = ['name']
     ordering_fields = ['created_at', 'updated_at']
 
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        if self.action in ('list', 'retrieve'):
+            children_by_parent = {}
+            for category in Category.objects.filter(parent__isnull=False):
+                children_by_parent.setdefault(category.parent_id, []).append(category)
+            context['children_by_parent'] = children_by_parent
+        return context
+
+    @cache_response(models=(Category,))
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+    @action(detail=False, methods=['GET'], url_path='tree')
+    @cache_response(models=(Category,))
+    def tree(self, request):
+        return api_response(True, "Category tree retrieved successfully.", get_category_tree())
+
     @transaction.atomic
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
@@ -47,6 +117,7 @@ class CategoryViewSet(viewsets.ModelViewSet):
             serializer.data, status_code=status.HTTP_201_CREATED
         )
 
+    @cache_response(models=(Category,))
     def retrieve(self, request, *args, **kwargs):
         instance = self.get_object()
         serializer = self.get_serializer(instance)
@@ -89,19 +160,34 @@ class CategoryViewSet(viewsets.ModelViewSet):
         serializer.is_valid(raise_exception=True)
         category._image_file = serializer.validated_data['file']
         category.save()
-        return api_response(True, "Category image uploaded successfully.", {"image": category.image})
+        data = {"image": category.image, "image_status": media_status(category.image)}
+        if data["image_status"] == MEDIA_READY:
+            return api_response(True, "Category image uploaded successfully.", data)
+        return api_response(True, "Category image upload in progress.", data, status_code=status.HTTP_202_ACCEPTED)
 
 # =============================================================
 # PRODUCT VIEWSET
 # =============================================================
-class ProductViewSet(viewsets.ModelViewSet):
+class ProductViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     queryset = Product.objects.all()
     serializer_class = ProductSerializer
     permission_classes = [IsAdminOrSuperAdmin]
+    conditional_actions = ("retrieve",)
+    conditional_related = ("variants",)
 
     search_fields = ['name', 'description', 'category__name']
     ordering_fields = ['price', 'created_at', 'updated_at']
 
+    def get_queryset(self):
+        if self.action == 'list':
+            return Product.objects.with_catalog_stats()
+        return Product.objects.prefetch_related('variants')
+
+    def get_serializer_class(self):
+        if self.action == 'list':
+            return ProductListSerializer
+        return ProductSerializer
+
     @transaction.atomic
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
@@ -109,6 +195,7 @@ class ProductViewSet(viewsets.ModelViewSet):
         product = serializer.save()
         return api_response(True, "Product created successfully.", serializer.data, status_code=status.HTTP_201_CREATED)
 
+    @cache_response(models=(Product, ProductVariant))
     def retrieve(self, request, *args, **kwargs):
         instance = self.get_object()
         serializer = self.get_serializer(instance)
@@ -132,6 +219,31 @@ class ProductViewSet(viewsets.ModelViewSet):
         instance.delete()
         return api_response(True, "Product deleted successfully.", None, status_code=status.HTTP_204_NO_CONTENT)
 
+    @action(detail=False, methods=['GET'], url_path='browse')
+    def browse(self, request):
+        return self.filtered_products(lambda: browse_products(parse_browse_filters(request.query_params)))
+
+    @action(detail=False, methods=['GET'], url_path='search')
+    def search(self, request):
+        return self.filtered_products(
+            lambda: search_products(request.query_params.get('q', ''), **parse_search_filters(request.query_params))
+        )
+
+    def filtered_products(self, load):
+        """
+        Paginates the (products, facets) returned by `load`; invalid filters become a 400.
+        """
+        try:
+            products, facets = load()
+            page = self.paginate_queryset(products.with_catalog_stats())
+        except ValidationError as e:
+            errors = e.message_dict if hasattr(e, 'error_dict') else {api_settings.NON_FIELD_ERRORS_KEY: e.messages}
+            return api_response(False, "Invalid filters.", errors, status_code=status.HTTP_400_BAD_REQUEST)
+        serializer = ProductListSerializer(page, many=True)
+        response = self.get_paginated_response(serializer.data)
+        response.data['facets'] = facets
+        return response
+
     @action(detail=True, methods=['POST'], url_path='restore')
     def restore_product(self, request, pk=None):
         product = Product.all_objects.get(pk=pk)
@@ -442,15 +554,39 @@ class CouponViewSet(viewsets.ModelViewSet):
 # =============================================================
 # CART VIEWSET
 # =============================================================
-class CartViewSet(viewsets.ViewSet):
+def with_cart_items(cart):
+    """
+    Loads the cart's active items with their variants and products in one query,
+    so CartSerializer renders the whole cart without further lookups.
+    """
+    prefetch_related_objects([cart], Prefetch(
+        'items',
+        queryset=CartItem.objects.select_related('variant__product').order_by('created_at')
+    ))
+    return cart
+
+
+class CartViewSet(ConditionalGetMixin, viewsets.ViewSet):
     permission_classes = [IsAuthenticatedUser]
 
+    def get_conditional_validators(self, request):
+        # The cart body also reflects its items' variants and products (prices, names)
+        values = CartItem.objects.filter(cart__user=request.user).aggregate(
+            items=Max('updated_at'),
+            variants=Max('variant__updated_at'),
+            products=Max('variant__product__updated_at'),
+            count=Count('pk'),
+            cart=Max('cart__updated_at'),
+        )
+        # Includes a count, so ETag only (see ConditionalGetMixin)
+        return self.make_etag("shop.cart", *values.values()), None
+
     # =============================================================
     # GET CART
     # =============================================================
     def list(self, request):
         cart, _ = Cart.objects.get_or_create(user=request.user)
-        serializer = CartSerializer(cart)
+        serializer = CartSerializer(with_cart_items(cart))
         return api_response(True, "Cart retrieved successfully.", serializer.data)
 
     # =============================================================
@@ -487,7 +623,7 @@ class CartViewSet(viewsets.ViewSet):
                 cart_item.quantity += quantity
             cart_item.save(update_fields=['quantity', 'is_active', 'deleted_at'])
 
-        serializer = CartSerializer(cart)
+        serializer = CartSerializer(with_cart_items(cart))
         return api_response(True, "Item added to cart successfully.", serializer.data)
 
     # =============================================================
@@ -516,7 +652,7 @@ class CartViewSet(viewsets.ViewSet):
                 cart_item.restore()
             cart_item.save(update_fields=['quantity', 'is_active', 'deleted_at'])
 
-        serializer = CartSerializer(cart)
+        serializer = CartSerializer(with_cart_items(cart))
         return api_response(True, "Cart updated successfully.", serializer.data)
 
     # =============================================================
@@ -533,7 +669,7 @@ class CartViewSet(viewsets.ViewSet):
         cart_item = get_object_or_404(CartItem.all_objects, cart=cart, variant_id=variant_id)
         cart_item.delete()
 
-        serializer = CartSerializer(cart)
+        serializer = CartSerializer(with_cart_items(cart))
         return api_response(True, "Item removed from cart successfully.", serializer.data)
 
     # =============================================================
@@ -543,10 +679,10 @@ class CartViewSet(viewsets.ViewSet):
     @transaction.atomic
     def clear_cart(self, request):
         cart = get_object_or_404(Cart, user=request.user)
-        for item in cart.items.all():
-            item.delete()
+        now = timezone.now()
+        cart.items.all().update(is_active=False, deleted_at=now, updated_at=now)
 
-        serializer = CartSerializer(cart)
+        serializer = CartSerializer(with_cart_items(cart))
         return api_response(True, "Cart cleared successfully.", serializer.data)
 
     # =============================================================
@@ -559,67 +695,26 @@ class CartViewSet(viewsets.ViewSet):
         serializer.is_valid(raise_exception=True)
 
         cart = get_object_or_404(Cart, user=request.user)
-        if not cart.items.filter(is_active=True).exists():
+        lines = load_cart_lines(cart)
+        if not lines:
             return api_response(False, "Cart is empty.", None, status.HTTP_400_BAD_REQUEST)
 
         address = get_object_or_404(Address, id=serializer.validated_data['address_id'], user=request.user)
         coupon_code = serializer.validated_data.get('coupon_code')
 
-        subtotal = cart.subtotal()
-        discount_amount = Decimal('0')
         coupon = None
-
         if coupon_code:
             try:
                 coupon = Coupon.objects.get(code=coupon_code, is_active=True)
-                discount_amount = Decimal(coupon.calculate_discount(subtotal))
             except Coupon.DoesNotExist:
                 return api_response(False, "Invalid coupon code.", None, status.HTTP_400_BAD_REQUEST)
 
-        TAX_RATE = Decimal('0.18')
-        SHIPPING_COST = Decimal('50')
-        tax_amount = subtotal * TAX_RATE
-        total_amount = subtotal - discount_amount + tax_amount + SHIPPING_COST
-
-        variant_ids = [item.variant.id for item in cart.items.filter(is_active=True)]
-        variants = ProductVariant.objects.select_for_update().filter(id__in=variant_ids)
-        variant_map = {v.id: v for v in variants}
-
-        for item in cart.items.filter(is_active=True):
-            variant = variant_map[item.variant.id]
-            if variant.track_inventory and item.quantity > variant.stock:
-                return api_response(
-                    False,
-                    f"Insufficient stock for {variant.product.name} ({variant.sku})",
-                    None,
-                    status.HTTP_400_BAD_REQUEST
-                )
-
-        order = Order.objects.create(
-            user=request.user,
-            address=address,
-            coupon=coupon,
-            subtotal=subtotal,
-            discount_amount=discount_amount,
-            tax_amount=tax_amount,
-            shipping_cost=SHIPPING_COST,
-            total_amount=total_amount
-        )
-
-        for item in cart.items.filter(is_active=True):
-            variant = variant_map[item.variant.id]
-            OrderItem.objects.create(
-                order=order,
-                variant=variant,
-                quantity=item.quantity,
-                price=variant.price
-            )
-            if variant.track_inventory:
-                variant.stock -= item.quantity
-                variant.save(update_fields=['stock'])
-
-        cart.items.all().delete()
+        try:
+            order = place_order(request.user, cart, address, coupon=coupon, lines=lines)
+        except InsufficientStock as e:
+            return api_response(False, str(e), {"insufficient_stock": e.shortfalls}, status.HTTP_400_BAD_REQUEST)
 
+        order = Order.objects.prefetch_related('items__variant').get(pk=order.pk)
         serializer = OrderSerializer(order)
         return api_response(True, "Checkout successful.", serializer.data)
 
@@ -636,6 +731,14 @@ class PaymentViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         return Payment.objects.filter(user=self.request.user)
 
+    # =============================================================
+    # EXPORT PAYMENTS (streamed, ?file_format=ndjson|json|csv)
+    # =============================================================
+    @action(detail=False, methods=["GET"], url_path="export", renderer_classes=[JSONRenderer, ExportRenderer])
+    def export_payments(self, request):
+        queryset = self.get_queryset().order_by("created_at", "id")
+        return export_response(request, queryset, PAYMENT_EXPORT_FIELDS, "payments")
+
     # =============================================================
     # CREATE ORDER: RAZORPAY
     # =============================================================
@@ -786,6 +889,7 @@ class PaymentViewSet(viewsets.ModelViewSet):
 class OrderViewSet(viewsets.ModelViewSet):
     serializer_class = OrderSerializer
     permission_classes = [IsAuthenticatedUser]
+    pagination_class = KeysetPagination
 
     # =============================================================
     # GET QUERYSET
@@ -852,14 +956,34 @@ class OrderViewSet(viewsets.ModelViewSet):
     # =============================================================
     # FILTER ORDERS BY STATUS 
     # =============================================================
-    @action(detail=False, methods=['GET'], url_path='filter')
-    def filter_orders(self, request):
-        status_filter = request.query_params.get('status')
-        queryset = self.get_queryset()
+    def filter_by_status(self, queryset):
+        status_filter = self.request.query_params.get('status')
         if status_filter:
             queryset = queryset.filter(status=status_filter.upper())
-        serializer = self.get_serializer(queryset, many=True)
-        return api_response(True, "Filtered orders fetched successfully.", serializer.data)
+        return queryset
+
+    @action(detail=False, methods=['GET'], url_path='filter')
+    def filter_orders(self, request):
+        queryset = self.filter_by_status(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        serializer = self.get_serializer(page, many=True)
+        # Same envelope as before pagination; the keyset page goes inside `data`
+        page_data = self.get_paginated_response(serializer.data).data
+        return api_response(True, "Filtered orders fetched successfully.", page_data)
+
+    # =============================================================
+    # EXPORT ORDERS / ORDER ITEMS (streamed, ?file_format=ndjson|json|csv)
+    # =============================================================
+    @action(detail=False, methods=['GET'], url_path='export', renderer_classes=[JSONRenderer, ExportRenderer])
+    def export_orders(self, request):
+        queryset = self.filter_by_status(self.get_queryset()).order_by('created_at', 'id')
+        return export_response(request, queryset, ORDER_EXPORT_FIELDS, "orders")
+
+    @action(detail=False, methods=['GET'], url_path='export-items', renderer_classes=[JSONRenderer, ExportRenderer])
+    def export_order_items(self, request):
+        orders = self.filter_by_status(self.get_queryset())
+        queryset = OrderItem.objects.filter(order__in=orders.values('id')).order_by('order_id', 'created_at')
+        return export_response(request, queryset, ORDER_ITEM_EXPORT_FIELDS, "order-items")
     
     # =============================================================
     # SHIP ORDERS 
@@ -1047,12 +1171,13 @@ class ProductReviewViewSet(viewsets.ModelViewSet):
     # GET AVERAGE RATING FOR PRODUCT
     # =============================================================
     @action(detail=False, methods=['GET'], url_path='product-rating')
+    @cache_response(models=(Product, ProductReview))
     def product_rating(self, request):
         product_id = request.query_params.get('product_id')
         if not product_id:
             return api_response(False, "Product ID is required.", None, status.HTTP_400_BAD_REQUEST)
 
         product = get_object_or_404(Product, pk=product_id)
-        avg_rating = ProductReview.objects.filter(product=product, is_active=True).aggregate(models.Avg('rating'))['rating__avg'] or 0
+        avg_rating = ProductReview.objects.filter(product=product, is_active=True).aggregate(Avg('rating'))['rating__avg'] or 0
         return api_response(True, "Average rating fetched successfully.", {"product_id": product.id, "average_rating": avg_rating})
 
@@ -31,7 +31,7 @@ class PostAdmin(admin.ModelAdmin):
 
     def get_queryset(self, request):
         qs = super().get_queryset(request)
-        return qs.select_related('author').prefetch_related('likes', 'comments', 'bookmarks')
+        return qs.select_related('author')
 
 
 # =============================================================
@@ -46,7 +46,7 @@ class CommentAdmin(admin.ModelAdmin):
 
     def get_queryset(self, request):
         qs = super().get_queryset(request)
-        return qs.select_related('author', 'post', 'parent').prefetch_related('likes', 'replies')
+        return qs.select_related('author', 'post', 'parent')
 
 
 # =============================================================
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+from social.models import Follow
+from social.timeline import rebuild_timelines
+
+
+class Command(BaseCommand):
+    help = "Rebuild materialized home timelines from the current follow graph."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--user",
+            dest="user_id",
+            help="Only rebuild the timeline of this user id.",
+        )
+
+    def handle(self, *args, **options):
+        follows = Follow.objects.all()
+        if options["user_id"]:
+            follows = follows.filter(follower_id=options["user_id"])
+
+        rebuilt = rebuild_timelines(follows)
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt timeline entries for {rebuilt} follow(s)"))
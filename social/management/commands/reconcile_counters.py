@@ -0,0 +1,65 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from social.models import Post, Comment, Like, Bookmark, Follow, Profile
+
+
+def _count_subquery(queryset, fk):
+    """
+    Correlated COUNT(*) over `queryset` grouped by `fk`, matched against the outer row's pk.
+    """
+    return Coalesce(
+        Subquery(
+            queryset.filter(**{fk: OuterRef("pk")})
+            .order_by()
+            .values(fk)
+            .annotate(total=Count("pk"))
+            .values("total")[:1]
+        ),
+        0,
+    )
+
+
+# (model, counter field, source queryset, foreign key on the source)
+COUNTERS = [
+    (Post, "likes_count", Like.objects.all(), "post"),
+    (Post, "comments_count", Comment.objects.all(), "post"),
+    (Post, "bookmarks_count", Bookmark.objects.all(), "post"),
+    (Comment, "likes_count", Like.objects.all(), "comment"),
+    (Comment, "replies_count", Comment.objects.all(), "parent"),
+    (Profile, "followers_count", Follow.objects.all(), "followee__social_profile"),
+    (Profile, "following_count", Follow.objects.all(), "follower__social_profile"),
+]
+
+
+class Command(BaseCommand):
+    help = "Recompute denormalized like/comment/bookmark/reply/follow counters that have drifted."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report how many rows have drifted, without updating them.",
+        )
+
+    def handle(self, *args, **options):
+        dry_run = options["dry_run"]
+
+        for model, field, source, fk in COUNTERS:
+            actual = _count_subquery(source, fk)
+            drifted = (
+                model.all_objects.annotate(actual=actual)
+                .exclude(**{field: F("actual")})
+                .values("pk")
+            )
+
+            if dry_run:
+                total = drifted.count()
+            else:
+                with transaction.atomic():
+                    total = model.all_objects.filter(pk__in=drifted).update(**{field: actual})
+
+            label = f"{model.__name__}.{field}"
+            verb = "drifted" if dry_run else "reconciled"
+            self.stdout.write(self.style.SUCCESS(f"{label}: {total} row(s) {verb}"))
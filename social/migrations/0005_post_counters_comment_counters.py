@@ -0,0 +1,65 @@
+# Generated by Django 5.2.7 on 2025-10-26 10:12
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_counters(apps, schema_editor):
+    Post = apps.get_model('social', 'Post')
+    Comment = apps.get_model('social', 'Comment')
+    Like = apps.get_model('social', 'Like')
+    Bookmark = apps.get_model('social', 'Bookmark')
+
+    def count_of(model, fk):
+        rows = model.objects.filter(is_active=True, deleted_at__isnull=True, **{fk: OuterRef('pk')})
+        return Coalesce(
+            Subquery(rows.order_by().values(fk).annotate(total=Count('pk')).values('total')[:1]),
+            0,
+        )
+
+    Post.objects.update(
+        likes_count=count_of(Like, 'post'),
+        comments_count=count_of(Comment, 'post'),
+        bookmarks_count=count_of(Bookmark, 'post'),
+    )
+    Comment.objects.update(
+        likes_count=count_of(Like, 'comment'),
+        replies_count=count_of(Comment, 'parent'),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('social', '0004_delete_notification'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='likes_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='comments_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='bookmarks_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='comment',
+            name='likes_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='comment',
+            name='replies_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,59 @@
+# Generated by Django 5.2.7 on 2025-10-26 12:40
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_follow_counters(apps, schema_editor):
+    Profile = apps.get_model('social', 'Profile')
+    Follow = apps.get_model('social', 'Follow')
+
+    def count_of(fk):
+        rows = Follow.objects.filter(is_active=True, deleted_at__isnull=True, **{fk: OuterRef('owner_id')})
+        return Coalesce(
+            Subquery(rows.order_by().values(fk).annotate(total=Count('pk')).values('total')[:1]),
+            0,
+        )
+
+    Profile.objects.update(
+        followers_count=count_of('followee'),
+        following_count=count_of('follower'),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('social', '0005_post_counters_comment_counters'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='profile',
+            name='followers_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='profile',
+            name='following_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_follow_counters, migrations.RunPython.noop),
+        migrations.CreateModel(
+            name='TimelineEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('posted_at', models.DateTimeField()),
+                ('owner', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='timeline_entries', to=settings.AUTH_USER_MODEL)),
+                ('post', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='timeline_entries', to='social.post')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['owner', '-posted_at'], name='social_time_owner_i_eaaafa_idx')],
+                'constraints': [models.UniqueConstraint(fields=('owner', 'post'), name='unique_timeline_entry')],
+            },
+        ),
+    ]
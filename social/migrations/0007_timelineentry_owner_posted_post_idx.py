@@ -0,0 +1,21 @@
+# Generated by Django 5.2.7 on 2025-10-28 10:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('social', '0006_profile_follow_counters_timelineentry'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='timelineentry',
+            name='social_time_owner_i_eaaafa_idx',
+        ),
+        migrations.AddIndex(
+            model_name='timelineentry',
+            index=models.Index(fields=['owner', '-posted_at', '-post'], name='social_time_owner_i_37cccf_idx'),
+        ),
+    ]
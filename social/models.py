@@ -4,7 +4,7 @@ from django.utils.functional import cached_property
 from django.core.exceptions import ValidationError
 from accounts.models import User
 from core.models import BaseModel
-from core.cloudinary import upload_to_cloudinary
+from core.media import queue_upload
 from core.constants import NOTIFICATION_TYPES
 
 PLACEHOLDER_COVER_URL = "https://dummyimage.com/800x450/000/fff&text={name}+Cover"
@@ -24,6 +24,11 @@ class Post(BaseModel):
     tags = models.JSONField(default=list, blank=True)  
     is_public = models.BooleanField(default=True)
 
+    # Denormalized counters, kept in sync with F() updates in social.views
+    likes_count = models.PositiveIntegerField(default=0)
+    comments_count = models.PositiveIntegerField(default=0)
+    bookmarks_count = models.PositiveIntegerField(default=0)
+
     class Meta:
         indexes = [
             models.Index(fields=['author', 'created_at']),
@@ -35,21 +40,6 @@ class Post(BaseModel):
     def __str__(self):
         return self.title or f"Post by {self.author}"
 
-    # =============================================================
-    # Cached properties for counts
-    # =============================================================
-    @cached_property
-    def likes_count(self):
-        return self.likes.count()
-
-    @cached_property
-    def comments_count(self):
-        return self.comments.filter(deleted_at__isnull=True).count()
-
-    @cached_property
-    def bookmarks_count(self):
-        return self.bookmarks.count()
-
 
 # =============================================================
 # POST IMAGE MODEL
@@ -60,15 +50,15 @@ class PostImage(BaseModel):
     """
     post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name="images")
     image = models.URLField(max_length=500, blank=True, null=True)
-    _image_file = None  # temporary storage before uploading to cloudinary
+    _image_file = None  # staged by core.media and uploaded to cloudinary in the background
 
     def __str__(self):
         return f"Image for {self.post}"
 
     def save(self, *args, **kwargs):
-        # Upload image to Cloudinary if _image_file is provided
+        # Queue the Cloudinary upload if _image_file is provided; the URL is swapped in when done
         if self._image_file:
-            self.image = upload_to_cloudinary(self._image_file, folder="social/posts/images")
+            self.image = queue_upload(self, "image", self._image_file, folder="social/posts/images")
             self._image_file = None
         super().save(*args, **kwargs)
 
@@ -87,6 +77,10 @@ class Comment(BaseModel):
         'self', null=True, blank=True, on_delete=models.CASCADE, related_name="replies"
     )
 
+    # Denormalized counters, kept in sync with F() updates in social.views
+    likes_count = models.PositiveIntegerField(default=0)
+    replies_count = models.PositiveIntegerField(default=0)
+
     class Meta:
         ordering = ['created_at']
         indexes = [
@@ -106,15 +100,6 @@ class Comment(BaseModel):
         self.full_clean()
         super().save(*args, **kwargs)
 
-    # Cached counts
-    @cached_property
-    def likes_count(self):
-        return self.likes.count()
-
-    @cached_property
-    def replies_count(self):
-        return self.replies.filter(deleted_at__isnull=True).count()
-
 
 # =============================================================
 # LIKE MODEL
@@ -191,6 +176,31 @@ class Follow(BaseModel):
         self.full_clean()
         super().save(*args, **kwargs)
 
+# =============================================================
+# TIMELINE ENTRY MODEL
+# =============================================================
+class TimelineEntry(models.Model):
+    """
+    Materialized home-feed row: `post` was fanned out to `owner`'s timeline.
+
+    Deliberately lean (no BaseModel soft-delete columns): rows are written in
+    bulk on post creation / follow and hard-deleted on unfollow or post removal.
+    """
+    owner = models.ForeignKey(User, on_delete=models.CASCADE, related_name="timeline_entries")
+    post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name="timeline_entries")
+    posted_at = models.DateTimeField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['owner', 'post'], name='unique_timeline_entry')
+        ]
+        indexes = [
+            models.Index(fields=['owner', '-posted_at', '-post']),
+        ]
+
+    def __str__(self):
+        return f"{self.post} in {self.owner}'s timeline"
+
 # =============================================================
 # PROFILE MODEL
 # =============================================================
@@ -212,6 +222,10 @@ class Profile(BaseModel):
     is_verified = models.BooleanField(default=False)
     is_private = models.BooleanField(default=False)
 
+    # Denormalized counters, kept in sync with F() updates in social.views
+    followers_count = models.PositiveIntegerField(default=0)
+    following_count = models.PositiveIntegerField(default=0)
+
     _avatar_file = None
     _cover_file = None
 
@@ -234,14 +248,6 @@ class Profile(BaseModel):
     def posts_count(self) -> int:
         return self.owner.posts.filter(deleted_at__isnull=True).count()
 
-    @cached_property
-    def followers_count(self) -> int:
-        return self.owner.followers.count()
-
-    @cached_property
-    def following_count(self) -> int:
-        return self.owner.following.count()
-
     @cached_property
     def cover_image_url(self) -> str:
         if self.cover_image:
@@ -257,13 +263,13 @@ class Profile(BaseModel):
         return PLACEHOLDER_AVATAR_URL.format(name=name)
 
     # =============================================================
-    # Save method for uploading files to cloudinary
+    # Save method queueing background uploads to cloudinary
     # =============================================================
     def save(self, *args, **kwargs):
         if self._avatar_file:
-            self.avatar = upload_to_cloudinary(self._avatar_file, folder="social/profile/avatars")
+            self.avatar = queue_upload(self, "avatar", self._avatar_file, folder="social/profile/avatars")
             self._avatar_file = None
         if self._cover_file:
-            self.cover_image = upload_to_cloudinary(self._cover_file, folder="social/profile/covers")
+            self.cover_image = queue_upload(self, "cover_image", self._cover_file, folder="social/profile/covers")
             self._cover_file = None
         super().save(*args, **kwargs)
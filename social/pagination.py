@@ -0,0 +1,35 @@
+from core.pagination import KeysetPagination
+from social import timeline
+
+
+class TimelinePagination(KeysetPagination):
+    """
+    Keyset pagination of the home feed, read straight from the timeline backend.
+
+    Each page is one range of the user's timeline (merged with followed
+    high-fanout authors' posts) past the cursor; only those posts are then
+    loaded through the view's queryset. Entries the queryset hides, such as
+    posts of deactivated authors, are skipped by reading the next range.
+    Cursors are the same (created_at, id) tokens KeysetPagination issues.
+    """
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.fallback = None
+        self.count = None
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        cursor = self.decode_cursor(request, queryset.model)
+        descending = self.descending != bool(cursor and cursor["reverse"])
+        after = tuple(cursor["position"]) if cursor else None
+
+        rows = []
+        while len(rows) <= self.page_size:
+            entries = timeline.feed_entries(request.user, self.page_size + 1, after, descending)
+            posts = {str(post.id): post for post in queryset.filter(id__in=[post_id for post_id, _ in entries])}
+            rows.extend(posts[str(post_id)] for post_id, _ in entries if str(post_id) in posts)
+            if len(entries) <= self.page_size:
+                break
+            post_id, posted_at = entries[-1]
+            after = (posted_at, post_id)
+
+        return self.build_page(rows, cursor)
@@ -1,10 +1,10 @@
 from rest_framework import serializers
-from drf_spectacular.utils import extend_schema_field
 from social.models import (
     Post, PostImage, Comment, Like, 
     Bookmark, Follow, Profile
 )
 from accounts.models import User
+from core.media import MediaStatusField
 
 # =============================================================
 # POST FILTER
@@ -41,6 +41,8 @@ class ProfileFilter(filters.FilterSet):
 class ProfileSerializer(serializers.ModelSerializer):
     avatar_url = serializers.ReadOnlyField()
     cover_image_url = serializers.ReadOnlyField()
+    avatar_status = MediaStatusField(source="avatar")
+    cover_image_status = MediaStatusField(source="cover_image")
     full_name = serializers.ReadOnlyField()
     posts_count = serializers.ReadOnlyField()
     followers_count = serializers.ReadOnlyField()
@@ -52,7 +54,7 @@ class ProfileSerializer(serializers.ModelSerializer):
             "owner", "first_name", "last_name", "bio", "dob", "location",
             "country_code", "phone_number", "avatar", "cover_image",
             "website", "is_verified", "is_private",
-            "avatar_url", "cover_image_url",
+            "avatar_url", "cover_image_url", "avatar_status", "cover_image_status",
             "full_name", "posts_count", "followers_count", "following_count"
         ]
         read_only_fields = [
@@ -65,9 +67,11 @@ class ProfileSerializer(serializers.ModelSerializer):
 # POST IMAGE SERIALIZER
 # =============================================================
 class PostImageSerializer(serializers.ModelSerializer):
+    image_status = MediaStatusField(source="image")
+
     class Meta:
         model = PostImage
-        fields = ["id", "post", "image"]
+        fields = ["id", "post", "image", "image_status"]
         ref_name = "SocialPostImage"
 
 # =============================================================
@@ -77,21 +81,9 @@ class PostSerializer(serializers.ModelSerializer):
     author = serializers.StringRelatedField(read_only=True)
     images = PostImageSerializer(many=True, read_only=True)
 
-    likes_count = serializers.SerializerMethodField()
-    comments_count = serializers.SerializerMethodField()
-    bookmarks_count = serializers.SerializerMethodField()
-
-    @extend_schema_field(serializers.IntegerField())
-    def get_likes_count(self, obj):
-        return obj.likes_count
-
-    @extend_schema_field(serializers.IntegerField())
-    def get_comments_count(self, obj):
-        return obj.comments_count
-
-    @extend_schema_field(serializers.IntegerField())
-    def get_bookmarks_count(self, obj):
-        return obj.bookmarks_count
+    likes_count = serializers.IntegerField(read_only=True)
+    comments_count = serializers.IntegerField(read_only=True)
+    bookmarks_count = serializers.IntegerField(read_only=True)
 
     class Meta:
         model = Post
@@ -107,19 +99,11 @@ class PostSerializer(serializers.ModelSerializer):
 # =============================================================
 class CommentSerializer(serializers.ModelSerializer):
     author = serializers.StringRelatedField(read_only=True)
-    replies_count = serializers.SerializerMethodField()
-    likes_count = serializers.SerializerMethodField()
+    replies_count = serializers.IntegerField(read_only=True)
+    likes_count = serializers.IntegerField(read_only=True)
     
     post = serializers.PrimaryKeyRelatedField(read_only=True)
 
-    @extend_schema_field(serializers.IntegerField())
-    def get_replies_count(self, obj):
-        return obj.replies_count
-
-    @extend_schema_field(serializers.IntegerField())
-    def get_likes_count(self, obj):
-        return obj.likes_count
-
     class Meta:
         model = Comment
         fields = [
@@ -0,0 +1,16 @@
+from core.jobs import task
+from social import timeline
+from social.models import Post
+
+
+@task("social.fan_out_post")
+def fan_out_post_task(post_id):
+    post = Post.objects.filter(id=post_id).first()
+    # Deleted (or made private, see fan_out_post) before the job ran
+    if post is not None:
+        timeline.fan_out_post(post)
+
+
+@task("social.retract_post")
+def retract_post_task(post_id, author_id):
+    timeline.retract_post(post_id, author_id)
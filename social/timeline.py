@@ -0,0 +1,295 @@
+import threading
+from datetime import datetime, timezone
+from functools import lru_cache
+from itertools import groupby, islice
+from django.conf import settings
+from django.db.models import Q
+from django.utils.module_loading import import_string
+from social.models import Post, Follow, Profile, TimelineEntry
+
+DEFAULT_TIMELINE_SETTINGS = {
+    "BACKEND": "social.timeline.DatabaseTimelineBackend",
+    "FANOUT_FOLLOWER_LIMIT": 5000,
+    "MAX_LENGTH": 800,
+    "REDIS_URL": "redis://localhost:6379/1",
+}
+
+
+def timeline_setting(name):
+    return getattr(settings, "SOCIAL_TIMELINE", {}).get(name, DEFAULT_TIMELINE_SETTINGS[name])
+
+
+def keyset_filter(time_field, id_field, after, descending):
+    """
+    Rows strictly past the keyset position `after` = (time, id) in the given direction.
+    """
+    posted_at, post_id = after
+    lookup = "lt" if descending else "gt"
+    return Q(**{f"{time_field}__{lookup}": posted_at}) | Q(**{time_field: posted_at, f"{id_field}__{lookup}": post_id})
+
+
+def is_past(entry, after, descending):
+    """
+    Whether the (post_id, posted_at) `entry` lies strictly past `after` = (posted_at, post_id).
+    """
+    key, bound = (entry[1], str(entry[0])), (after[0], str(after[1]))
+    return key < bound if descending else key > bound
+
+
+# =============================================================
+# BACKENDS
+# =============================================================
+class BaseTimelineBackend:
+    """
+    Stores per-user home timelines as (post_id, posted_at) pairs, newest first.
+    """
+
+    def add(self, owner_ids, entries):
+        """Add `entries` [(post_id, posted_at), ...] to every owner's timeline."""
+        raise NotImplementedError
+
+    def remove(self, owner_ids, post_ids):
+        """Remove `post_ids` from every owner's timeline."""
+        raise NotImplementedError
+
+    def remove_author(self, owner_id, author_id):
+        """Remove every post written by `author_id` from `owner_id`'s timeline."""
+        self.remove_author_posts([owner_id], author_id)
+
+    def remove_author_posts(self, owner_ids, author_id):
+        """Remove every post written by `author_id` from every owner's timeline."""
+        post_ids = list(Post.all_objects.filter(author_id=author_id).values_list("id", flat=True))
+        self.remove(owner_ids, post_ids)
+
+    def entries(self, owner_id, limit, after=None, descending=True):
+        """
+        Return up to `limit` (post_id, posted_at) pairs from `owner_id`'s timeline,
+        ordered by (posted_at, post_id) (newest first when `descending`) and
+        starting strictly past the keyset position `after` = (posted_at, post_id).
+        """
+        raise NotImplementedError
+
+
+class DatabaseTimelineBackend(BaseTimelineBackend):
+    """
+    Timeline rows in the `TimelineEntry` table; each page is one range scan over (owner, -posted_at, -post).
+    """
+    batch_size = 1000
+
+    def add(self, owner_ids, entries):
+        rows = [
+            TimelineEntry(owner_id=owner_id, post_id=post_id, posted_at=posted_at)
+            for owner_id in owner_ids
+            for post_id, posted_at in entries
+        ]
+        TimelineEntry.objects.bulk_create(rows, batch_size=self.batch_size, ignore_conflicts=True)
+
+    def remove(self, owner_ids, post_ids):
+        TimelineEntry.objects.filter(owner_id__in=owner_ids, post_id__in=post_ids).delete()
+
+    def remove_author_posts(self, owner_ids, author_id):
+        TimelineEntry.objects.filter(owner_id__in=owner_ids, post__author_id=author_id).delete()
+
+    def entries(self, owner_id, limit, after=None, descending=True):
+        queryset = TimelineEntry.objects.filter(owner_id=owner_id)
+        if after is not None:
+            queryset = queryset.filter(keyset_filter("posted_at", "post_id", after, descending))
+        prefix = "-" if descending else ""
+        return list(
+            queryset.order_by(f"{prefix}posted_at", f"{prefix}post_id").values_list("post_id", "posted_at")[:limit]
+        )
+
+
+class RedisTimelineBackend(BaseTimelineBackend):
+    """
+    One sorted set per user (score = post timestamp), trimmed to MAX_LENGTH entries.
+    """
+
+    def __init__(self):
+        import redis
+
+        self.client = redis.Redis.from_url(timeline_setting("REDIS_URL"))
+        self.max_length = timeline_setting("MAX_LENGTH")
+
+    @staticmethod
+    def key(owner_id):
+        return f"timeline:{owner_id}"
+
+    def add(self, owner_ids, entries):
+        members = {str(post_id): posted_at.timestamp() for post_id, posted_at in entries}
+        if not members:
+            return
+        pipe = self.client.pipeline(transaction=False)
+        for owner_id in owner_ids:
+            pipe.zadd(self.key(owner_id), members)
+            pipe.zremrangebyrank(self.key(owner_id), 0, -self.max_length - 1)
+        pipe.execute()
+
+    def remove(self, owner_ids, post_ids):
+        members = [str(post_id) for post_id in post_ids]
+        if not members:
+            return
+        pipe = self.client.pipeline(transaction=False)
+        for owner_id in owner_ids:
+            pipe.zrem(self.key(owner_id), *members)
+        pipe.execute()
+
+    def entries(self, owner_id, limit, after=None, descending=True):
+        # Equal scores are returned in member (post id) order, which matches the keyset
+        key = self.key(owner_id)
+        low, high, ties = "-inf", "+inf", 0
+        if after is not None:
+            score, after_id = after[0].timestamp(), str(after[1])
+            low, high = ("-inf", score) if descending else (score, "+inf")
+            # Entries sharing the cursor's score are fetched too, then cut at its post id
+            ties = self.client.zcount(key, score, score)
+        if descending:
+            rows = self.client.zrevrangebyscore(key, high, low, start=0, num=limit + ties, withscores=True)
+        else:
+            rows = self.client.zrangebyscore(key, low, high, start=0, num=limit + ties, withscores=True)
+        entries = [(member.decode(), row_score) for member, row_score in rows]
+        if after is not None:
+            entries = [
+                (post_id, row_score) for post_id, row_score in entries
+                if row_score != score or (post_id < after_id if descending else post_id > after_id)
+            ]
+        entries = [(post_id, datetime.fromtimestamp(row_score, tz=timezone.utc)) for post_id, row_score in entries]
+        return entries[:limit]
+
+
+class InMemoryTimelineBackend(BaseTimelineBackend):
+    """
+    Process-local stand-in for tests and local development.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.timelines = {}
+
+    def add(self, owner_ids, entries):
+        with self.lock:
+            for owner_id in owner_ids:
+                timeline = self.timelines.setdefault(owner_id, {})
+                timeline.update(entries)
+
+    def remove(self, owner_ids, post_ids):
+        with self.lock:
+            for owner_id in owner_ids:
+                timeline = self.timelines.get(owner_id, {})
+                for post_id in post_ids:
+                    timeline.pop(post_id, None)
+
+    def entries(self, owner_id, limit, after=None, descending=True):
+        with self.lock:
+            entries = list(self.timelines.get(owner_id, {}).items())
+        if after is not None:
+            entries = [entry for entry in entries if is_past(entry, after, descending)]
+        entries.sort(key=lambda entry: (entry[1], str(entry[0])), reverse=descending)
+        return entries[:limit]
+
+
+@lru_cache(maxsize=None)
+def get_timeline_backend():
+    return import_string(timeline_setting("BACKEND"))()
+
+
+# =============================================================
+# FAN-OUT
+# =============================================================
+def is_high_fanout_author(author_id):
+    """
+    Authors with more followers than FANOUT_FOLLOWER_LIMIT are pulled at read time instead of pushed.
+    """
+    return Profile.all_objects.filter(
+        owner_id=author_id,
+        followers_count__gte=timeline_setting("FANOUT_FOLLOWER_LIMIT"),
+    ).exists()
+
+
+def fan_out_post(post):
+    """
+    Push a public post (new, or just made public) into its author's followers' timelines.
+    """
+    if not post.is_public or is_high_fanout_author(post.author_id):
+        return
+    follower_ids = Follow.objects.filter(followee_id=post.author_id).values_list("follower_id", flat=True)
+    get_timeline_backend().add(list(follower_ids), [(post.id, post.created_at)])
+
+
+def retract_post(post_id, author_id):
+    """
+    Remove a deleted (or no longer public) post from its author's followers' timelines.
+    """
+    follower_ids = Follow.objects.filter(followee_id=author_id).values_list("follower_id", flat=True)
+    get_timeline_backend().remove(list(follower_ids), [post_id])
+
+
+def backfill_follow(follower_id, followee_id):
+    """
+    Seed a new follower's timeline with the followee's most recent public posts.
+    """
+    if is_high_fanout_author(followee_id):
+        return
+    recent = Post.objects.filter(author_id=followee_id, is_public=True).order_by("-created_at")
+    entries = list(recent.values_list("id", "created_at")[:timeline_setting("MAX_LENGTH")])
+    get_timeline_backend().add([follower_id], entries)
+
+
+def rebuild_timelines(follows=None, chunk_size=1000):
+    """
+    Rebuild timeline entries from a Follow queryset (default: every follow).
+
+    Follows are grouped by followee, so each author's recent posts are read
+    once and written to their followers' timelines `chunk_size` followers at
+    a time; high-fanout authors are looked up once for the whole set.
+    Returns the number of follows rebuilt.
+    """
+    if follows is None:
+        follows = Follow.objects.all()
+    pairs = follows.order_by("followee_id", "follower_id").values_list("followee_id", "follower_id")
+    high_fanout = set(
+        Profile.all_objects.filter(
+            owner_id__in=follows.values("followee_id"),
+            followers_count__gte=timeline_setting("FANOUT_FOLLOWER_LIMIT"),
+        ).values_list("owner_id", flat=True)
+    )
+    backend = get_timeline_backend()
+    rebuilt = 0
+    for followee_id, group in groupby(pairs.iterator(chunk_size=2000), key=lambda pair: pair[0]):
+        entries = []
+        if followee_id not in high_fanout:
+            recent = Post.objects.filter(author_id=followee_id, is_public=True).order_by("-created_at")
+            entries = list(recent.values_list("id", "created_at")[:timeline_setting("MAX_LENGTH")])
+        while follower_ids := [follower_id for _, follower_id in islice(group, chunk_size)]:
+            backend.remove_author_posts(follower_ids, followee_id)
+            if entries:
+                backend.add(follower_ids, entries)
+            rebuilt += len(follower_ids)
+    return rebuilt
+
+
+def drop_follow(follower_id, followee_id):
+    get_timeline_backend().remove_author(follower_id, followee_id)
+
+
+def feed_entries(user, limit, after=None, descending=True):
+    """
+    One keyset range of `user`'s home feed as (post_id, posted_at) pairs: the
+    next `limit` entries of the materialized timeline past `after`, merged
+    with the posts of followed high-fanout authors over the same range.
+    """
+    entries = get_timeline_backend().entries(user.id, limit, after, descending)
+
+    high_fanout_followees = Follow.objects.filter(
+        follower=user,
+        followee__social_profile__followers_count__gte=timeline_setting("FANOUT_FOLLOWER_LIMIT"),
+    ).values("followee")
+    pulled = Post.objects.filter(author__in=high_fanout_followees, is_public=True)
+    if after is not None:
+        pulled = pulled.filter(keyset_filter("created_at", "id", after, descending))
+    prefix = "-" if descending else ""
+    pulled = pulled.order_by(f"{prefix}created_at", f"{prefix}id").values_list("id", "created_at")[:limit]
+
+    merged = {str(post_id): (post_id, posted_at) for post_id, posted_at in [*entries, *pulled]}
+    ordered = sorted(merged.values(), key=lambda entry: (entry[1], str(entry[0])), reverse=descending)
+    return ordered[:limit]
@@ -1,8 +1,9 @@
 from django.db import transaction
-from django.db.models import Q
+from django.db.models import Count, Max, Q
 from django.shortcuts import get_object_or_404
 from rest_framework import viewsets, status, permissions
 from rest_framework.decorators import action
+from rest_framework.renderers import JSONRenderer
 from social.models import (
     Post, PostImage, Like, Bookmark, 
     Profile, Comment, Follow
@@ -12,12 +13,34 @@ from social.serializers import (
     PostFilter, ProfileFilter, ProfileSerializer, 
     CommentSerializer, FollowSerializer
 )
-from core.utils import api_response
+from core.utils import api_response, adjust_counters
+from social import timeline
+from social.pagination import TimelinePagination
 from core.throttles import FreeAnonThrottle, FreeUserThrottle
 from core.permissions import IsOwnerOrAdmin
+from core.pagination import KeysetPagination
+from core.jobs import enqueue
+from core.cache import cache_response
+from core.mixins import ConditionalGetMixin
+from core.exports import ExportRenderer, export_response
 from core.constants import LIKE_POST, COMMENT, LIKE_COMMENT, FOLLOW
 from accounts.models import User
 
+POST_EXPORT_FIELDS = [
+    ("id", "id"),
+    ("author_id", "author_id"),
+    ("author", "author__username"),
+    ("title", "title"),
+    ("content", "content"),
+    ("tags", "tags"),
+    ("is_public", "is_public"),
+    ("likes_count", "likes_count"),
+    ("comments_count", "comments_count"),
+    ("bookmarks_count", "bookmarks_count"),
+    ("created_at", "created_at"),
+    ("updated_at", "updated_at"),
+]
+
 # =============================================================
 # POST VIEWSET
 # =============================================================
@@ -26,6 +49,7 @@ class PostViewSet(viewsets.ModelViewSet):
     serializer_class = PostSerializer
     permission_classes = [permissions.IsAuthenticated, IsOwnerOrAdmin]
     throttle_classes = [FreeUserThrottle, FreeAnonThrottle]
+    pagination_class = KeysetPagination
 
     filterset_class = PostFilter
     search_fields = ['title', 'content']
@@ -34,14 +58,25 @@ class PostViewSet(viewsets.ModelViewSet):
 
     def perform_create(self, serializer):
         with transaction.atomic():
-            serializer.save(author=self.request.user)
+            post = serializer.save(author=self.request.user)
+            # Fan-out touches every follower's timeline, so it runs on the job queue
+            enqueue("social.fan_out_post", post_id=str(post.id))
 
     def get_queryset(self):
         user = self.request.user
         queryset = super().get_queryset()
         if not user.is_staff:
             queryset = queryset.filter(Q(is_public=True) | Q(author=user))
-        return queryset.select_related('author').prefetch_related('images', 'likes', 'comments')
+        return queryset.select_related('author').prefetch_related('images')
+
+    # Visible posts depend on the requester, so these are cached per user
+    @cache_response(models=(Post, PostImage), scope="user")
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+    @cache_response(models=(Post, PostImage), scope="user")
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
 
     # -----------------------------
     # My posts
@@ -52,15 +87,29 @@ class PostViewSet(viewsets.ModelViewSet):
         serializer = self.get_serializer(posts, many=True)
         return api_response(True, "My posts fetched successfully", serializer.data)
 
+    # -----------------------------
+    # Export visible posts (streamed, ?file_format=ndjson|json|csv)
+    # -----------------------------
+    @action(detail=False, methods=["get"], url_path="export", renderer_classes=[JSONRenderer, ExportRenderer])
+    def export(self, request):
+        queryset = self.filter_queryset(self.get_queryset())
+        return export_response(request, queryset, POST_EXPORT_FIELDS, "posts")
+
     # -----------------------------
     # Update post
     # -----------------------------
     @transaction.atomic
     def update(self, request, *args, **kwargs):
         post = self.get_object()
+        was_public = post.is_public
         serializer = self.get_serializer(post, data=request.data, partial=True)
         serializer.is_valid(raise_exception=True)
-        serializer.save()
+        post = serializer.save()
+        # Visibility changes move the post in or out of followers' timelines
+        if post.is_public and not was_public:
+            enqueue("social.fan_out_post", post_id=str(post.id))
+        elif was_public and not post.is_public:
+            enqueue("social.retract_post", post_id=str(post.id), author_id=str(post.author_id))
         return api_response(True, "Post updated successfully", serializer.data)
 
     # -----------------------------
@@ -70,6 +119,7 @@ class PostViewSet(viewsets.ModelViewSet):
     def destroy(self, request, *args, **kwargs):
         post = self.get_object()
         post.soft_delete()
+        enqueue("social.retract_post", post_id=str(post.id), author_id=str(post.author_id))
         return api_response(True, "Post deleted successfully")
 
     # -----------------------------
@@ -99,13 +149,11 @@ class PostViewSet(viewsets.ModelViewSet):
     # -----------------------------
     # Feed 
     # -----------------------------
-    @action(detail=False, methods=["get"])
+    @action(detail=False, methods=["get"], pagination_class=TimelinePagination)
     def feed(self, request):
-        user = request.user
-        followees = user.following.filter(followee__is_active=True).values('followee')
-        posts = self.get_queryset().filter(author__in=followees)
+        posts = self.get_queryset().filter(author__is_active=True)
         page = self.paginate_queryset(posts)
-        serializer = self.get_serializer(page or posts, many=True)
+        serializer = self.get_serializer(page if page is not None else posts, many=True)
         if page is not None:
             return self.get_paginated_response(serializer.data)
         return api_response(True, "Feed fetched successfully", serializer.data)
@@ -120,7 +168,8 @@ class PostViewSet(viewsets.ModelViewSet):
         if Like.objects.filter(post=post, liked_by=request.user, is_active=True).exists():
             return api_response(False, "Already liked", status.HTTP_400_BAD_REQUEST)
 
-        like = Like.objects.create(post=post, liked_by=request.user)
+        Like.objects.create(post=post, liked_by=request.user)
+        adjust_counters(Post, post.id, likes_count=1)
         return api_response(True, "Post liked successfully")
 
     # -----------------------------
@@ -134,6 +183,7 @@ class PostViewSet(viewsets.ModelViewSet):
         if not like:
             return api_response(False, "You haven't liked this post", status.HTTP_400_BAD_REQUEST)
         like.delete()
+        adjust_counters(Post, post.id, likes_count=-1)
         return api_response(True, "Post unliked successfully")
 
     # -----------------------------
@@ -152,13 +202,15 @@ class PostViewSet(viewsets.ModelViewSet):
             Bookmark.objects.create(post=post, bookmarked_by=request.user)
             message = "Post bookmarked successfully"
 
-        bookmarks_count = Bookmark.objects.filter(post=post, is_active=True).count()
+        bookmarked = bookmark.is_active if bookmark else True
+        adjust_counters(Post, post.id, bookmarks_count=1 if bookmarked else -1)
+        post.refresh_from_db(fields=["bookmarks_count"])
         return api_response(
             True,
             message,
             data={
-                "bookmarked": bookmark.is_active if bookmark else True,
-                "bookmarks_count": bookmarks_count,
+                "bookmarked": bookmarked,
+                "bookmarks_count": post.bookmarks_count,
             }
         )
 
@@ -173,16 +225,15 @@ class PostViewSet(viewsets.ModelViewSet):
             bookmarked_by=request.user,
             is_active=True
         ).exists()
-        bookmarks_count = Bookmark.objects.filter(post=post, is_active=True).count()
         return api_response(True, "Bookmark status fetched successfully", {
             "bookmarked": is_bookmarked,
-            "bookmarks_count": bookmarks_count
+            "bookmarks_count": post.bookmarks_count
         })
 
 # =============================================================
 # PROFILE VIEWSET
 # =============================================================
-class ProfileViewSet(viewsets.GenericViewSet):
+class ProfileViewSet(ConditionalGetMixin, viewsets.GenericViewSet):
     queryset = Profile.objects.filter(owner__is_active=True)  
     serializer_class = ProfileSerializer
     permission_classes = [permissions.IsAuthenticated, IsOwnerOrAdmin]
@@ -193,11 +244,22 @@ class ProfileViewSet(viewsets.GenericViewSet):
     ordering_fields = ['first_name', 'last_name', 'posts_count', 'followers_count', 'following_count', 'created_at']
     ordering = ['-created_at']
 
+    conditional_actions = ("retrieve",)
+
     def get_object(self, user_id=None):
         user = get_object_or_404(User, id=user_id, is_active=True) if user_id else self.request.user
         profile, _ = Profile.objects.get_or_create(owner=user)
         return profile
 
+    def get_conditional_validators(self, request):
+        # The body includes posts_count, so the owner's posts are part of the validator (ETag only)
+        profile = self.get_object(self.kwargs.get('pk'))
+        posts = Post.all_objects.filter(author_id=profile.owner_id).aggregate(
+            last_modified=Max('updated_at'),
+            count=Count('pk', filter=Q(deleted_at__isnull=True)),
+        )
+        return self.make_etag(profile._meta.label_lower, profile.pk, profile.updated_at, *posts.values()), None
+
     # -----------------------------
     # Retrieve profile
     # -----------------------------
@@ -280,7 +342,8 @@ class CommentViewSet(viewsets.GenericViewSet):
         post = get_object_or_404(Post, id=post_pk, is_active=True)
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        comment = serializer.save(author=request.user, post=post)
+        serializer.save(author=request.user, post=post)
+        adjust_counters(Post, post.id, comments_count=1)
         return api_response(True, "Comment created successfully", serializer.data)
     
     # -----------------------------
@@ -309,6 +372,9 @@ class CommentViewSet(viewsets.GenericViewSet):
     def destroy(self, request,  post_pk=None, pk=None):
         comment = get_object_or_404(Comment, id=pk, post_id=post_pk, is_active=True)
         comment.soft_delete()
+        adjust_counters(Post, comment.post_id, comments_count=-1)
+        if comment.parent_id:
+            adjust_counters(Comment, comment.parent_id, replies_count=-1)
         return api_response(True, "Comment deleted successfully")
 
     # -----------------------------
@@ -332,11 +398,13 @@ class CommentViewSet(viewsets.GenericViewSet):
         )
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        reply_comment = serializer.save(
+        serializer.save(
             author=request.user,
             post_id=post_pk,
             parent=parent_comment
         )
+        adjust_counters(Post, parent_comment.post_id, comments_count=1)
+        adjust_counters(Comment, parent_comment.id, replies_count=1)
         return api_response(True, "Reply added successfully", serializer.data)
 
     # -----------------------------
@@ -360,11 +428,21 @@ class CommentViewSet(viewsets.GenericViewSet):
             Like.objects.create(comment=comment, liked_by=request.user, is_active=True)
             message = "Comment liked successfully"
             liked = True
+        adjust_counters(Comment, comment.id, likes_count=1 if liked else -1)
         return api_response(True, message, {"liked": liked})
 
 # =============================================================
 # FOLLOW VIEWSET
 # =============================================================
+def _adjust_follow_counters(follower, followee, delta):
+    profile_ids = dict(
+        Profile.all_objects.filter(owner__in=[follower, followee]).values_list("owner_id", "id")
+    )
+    if follower.id in profile_ids:
+        adjust_counters(Profile, profile_ids[follower.id], following_count=delta)
+    if followee.id in profile_ids:
+        adjust_counters(Profile, profile_ids[followee.id], followers_count=delta)
+
 class FollowViewSet(viewsets.GenericViewSet):
     queryset = Follow.objects.all()
     serializer_class = FollowSerializer
@@ -381,7 +459,7 @@ class FollowViewSet(viewsets.GenericViewSet):
         if followee == request.user:
             return api_response(False, "You cannot follow yourself", status.HTTP_400_BAD_REQUEST)
 
-        follow, created = Follow.objects.get_or_create(
+        follow, created = Follow.all_objects.get_or_create(
             follower=request.user,
             followee=followee,
             defaults={"is_active": True}
@@ -389,9 +467,10 @@ class FollowViewSet(viewsets.GenericViewSet):
         if not created and follow.is_active:
             return api_response(False, "Already following", status.HTTP_400_BAD_REQUEST)
         elif not created:
-            follow.is_active = True
-            follow.save(update_fields=["is_active"])
-            
+            follow.restore()
+
+        _adjust_follow_counters(request.user, followee, 1)
+        transaction.on_commit(lambda: timeline.backfill_follow(request.user.id, followee.id))
         serializer = self.get_serializer(follow)
         return api_response(True, "User followed successfully", serializer.data)
 
@@ -406,6 +485,8 @@ class FollowViewSet(viewsets.GenericViewSet):
         if not follow:
             return api_response(False, "You are not following this user", status.HTTP_400_BAD_REQUEST)
         follow.soft_delete()
+        _adjust_follow_counters(request.user, followee, -1)
+        transaction.on_commit(lambda: timeline.drop_follow(request.user.id, followee.id))
         return api_response(True, "User unfollowed successfully")
 
     # -----------------------------
@@ -457,12 +538,17 @@ class BookmarkViewSet(viewsets.GenericViewSet):
     permission_classes = [permissions.IsAuthenticated]
     serializer_class = PostSerializer
     throttle_classes = [FreeUserThrottle, FreeAnonThrottle]
+    pagination_class = KeysetPagination
     queryset = Bookmark.objects.none()
 
     def get_queryset(self):
         return Bookmark.objects.filter(bookmarked_by=self.request.user, is_active=True).select_related('post')
 
     def list(self, request):
-        posts = Post.objects.filter(bookmarks__bookmarked_by=request.user, bookmarks__is_active=True).distinct()
-        serializer = self.get_serializer(posts, many=True)
+        bookmarked = Bookmark.objects.filter(bookmarked_by=request.user).values("post")
+        posts = Post.objects.filter(id__in=bookmarked).select_related("author").prefetch_related("images")
+        page = self.paginate_queryset(posts)
+        serializer = self.get_serializer(page if page is not None else posts, many=True)
+        if page is not None:
+            return self.get_paginated_response(serializer.data)
         return api_response(True, "Bookmarked posts fetched successfully", serializer.data)
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.7 on 2025-10-27 09:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('todo', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='todo',
+            index=models.Index(fields=['owner', 'created_at'], name='todo_todo_owner_i_c808f4_idx'),
+        ),
+    ]
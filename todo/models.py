@@ -61,4 +61,5 @@ class Todo(BaseModel):
             models.Index(fields=['due_date']),
             models.Index(fields=['priority']),
             models.Index(fields=['completed']),
+            models.Index(fields=['owner', 'created_at']),
         ]
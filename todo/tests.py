@@ -1,3 +1,57 @@
+import base64
+import json
 from django.test import TestCase
+from rest_framework.test import APIClient
+from accounts.models import User
+from todo.models import Todo
 
-# Create your tests here.
+TODO_URL = "/api/v1/todo/"
+
+
+def make_cursor(position, reverse=False):
+    payload = json.dumps({"p": position, "r": reverse})
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+# ===============================
+# KEYSET CURSORS
+# ===============================
+class KeysetCursorTests(TestCase):
+    """
+    Tampered cursors are rejected with 404 before they reach the query.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email="owner@example.com", username="owner", password="pass12345")
+        for n in range(3):
+            Todo.objects.create(owner=cls.user, title=f"Task {n}")
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_next_link_is_followed(self):
+        first = self.client.get(TODO_URL, {"page_size": 2})
+        self.assertEqual(first.status_code, 200, first.content)
+        second = self.client.get(first.data["next"])
+        self.assertEqual(second.status_code, 200, second.content)
+        self.assertEqual(len(second.data["results"]), 1)
+
+    def test_malformed_positions_are_not_found(self):
+        todo_id = str(Todo.objects.first().id)
+        for position in (
+            ["not-a-date", todo_id],
+            ["2024-01-01T00:00:00+00:00", "not-a-uuid"],
+            [None, todo_id],
+            [{"a": 1}, todo_id],
+            ["2024-01-01T00:00:00+00:00"],
+            "2024-01-01T00:00:00+00:00",
+        ):
+            with self.subTest(position=position):
+                response = self.client.get(TODO_URL, {"cursor": make_cursor(position)})
+                self.assertEqual(response.status_code, 404, response.content)
+
+    def test_undecodable_cursor_is_not_found(self):
+        response = self.client.get(TODO_URL, {"cursor": "%%%"})
+        self.assertEqual(response.status_code, 404)
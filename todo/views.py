@@ -3,20 +3,36 @@ from django.shortcuts import get_object_or_404
 from django.utils import timezone
 from rest_framework import viewsets, permissions, throttling, status
 from rest_framework.decorators import action
+from rest_framework.renderers import JSONRenderer
 from drf_spectacular.utils import extend_schema, OpenApiParameter
 from todo.models import Todo
 from todo.serializers import TodoSerializer, ToggleStatusResponseSerializer
 from core.utils import api_response
 from core.throttles import FreeAnonThrottle, FreeUserThrottle
 from core.permissions import IsSuperAdmin, IsAdminOrSuperAdmin, IsOwnerOrAdmin
+from core.pagination import KeysetPagination
+from core.mixins import ConditionalGetMixin
+from core.exports import ExportRenderer, export_response
+
+TODO_EXPORT_FIELDS = [
+    ("id", "id"),
+    ("title", "title"),
+    ("description", "description"),
+    ("completed", "completed"),
+    ("priority", "priority"),
+    ("due_date", "due_date"),
+    ("created_at", "created_at"),
+    ("updated_at", "updated_at"),
+]
 
 # ------------------------------
 # Todo ViewSet
 # ------------------------------
-class TodoViewSet(viewsets.ModelViewSet):
+class TodoViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     serializer_class = TodoSerializer
     permission_classes = [permissions.IsAuthenticated]
     throttle_classes = [FreeUserThrottle]
+    pagination_class = KeysetPagination
 
     filterset_fields = ['completed', 'priority']
     search_fields = ['title', 'description']
@@ -86,3 +102,11 @@ class TodoViewSet(viewsets.ModelViewSet):
             "completed": todo.completed
         })
         return api_response(True, "Todo status toggled", serializer.data, status.HTTP_200_OK)
+
+    # ----------------------
+    # Export (streamed, ?file_format=ndjson|json|csv)
+    # ----------------------
+    @action(detail=False, methods=["get"], url_path="export", renderer_classes=[JSONRenderer, ExportRenderer])
+    def export(self, request):
+        queryset = self.filter_queryset(self.get_queryset())
+        return export_response(request, queryset, TODO_EXPORT_FIELDS, "todos")